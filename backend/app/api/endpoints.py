@@ -1,11 +1,24 @@
 from fastapi import APIRouter, HTTPException
-from app.models.schemas import AnalyzeRequest, AnalyzeResponse, SuggestRequest, SuggestResponse, ExportRequest, ExportResponse
+from fastapi.responses import StreamingResponse
+from app.models.schemas import (AnalyzeRequest, AnalyzeResponse, SuggestRequest, SuggestResponse, ExportRequest, ExportResponse,
+                                IngestJobsRequest, IngestJobsResponse, SearchJobsRequest, SearchJobsResponse,
+                                RankCandidatesRequest, RegisterJDRequest, RegisterJDResponse,
+                                RescoreRequest, RescoreResponse, ReanalyzeRequest, ReanalyzeResponse)
 from app.services import (PDFParser, TextProcessor, SkillExtractor, EmbeddingService, 
                           VectorStore, MatchingEngine, EvidenceBuilder, ContradictionChecker,
                           LLMService, RewriteAgent, PIIService, ObservabilityService, PDFGenerator)
+from app.core.config import settings
+from app.services.job_search import JobSearchService
+from app.services.candidate_ranker import CandidateRanker
+from app.services.jd_registry import JDRegistry
+from app.services.analysis_store import AnalysisStore
+from app.services.section_chunker import sections_to_text
 from app.utils.logger import get_logger
+import asyncio
 import uuid
 import base64
+import json
+import time
 
 router = APIRouter()
 logger = get_logger(__name__)
@@ -19,10 +32,96 @@ matching_engine = MatchingEngine(skill_extractor, embedding_service)
 evidence_builder = EvidenceBuilder()
 contradiction_checker = ContradictionChecker()
 llm_service = LLMService()
-rewrite_agent = RewriteAgent(llm_service, contradiction_checker)
+rewrite_agent = RewriteAgent(llm_service, contradiction_checker, embedding_service=embedding_service)
 pii_service = PIIService()
 obs_service = ObservabilityService()
 pdf_generator = PDFGenerator()
+job_search_service = JobSearchService(text_processor, embedding_service, vector_store, matching_engine)
+candidate_ranker = CandidateRanker(text_processor, matching_engine, pdf_parser, rewrite_agent)
+jd_registry = JDRegistry(text_processor, matching_engine)
+analysis_store = AnalysisStore()
+
+def _resolve_jd(jd_text: str = None, jd_id: str = None) -> dict:
+    if jd_id:
+        entry = jd_registry.get(jd_id)
+        if entry is None:
+            raise HTTPException(status_code=404, detail=f"Unknown or expired jd_id: {jd_id}")
+        return entry
+    if jd_text:
+        return jd_registry.register(jd_text)
+    raise HTTPException(status_code=422, detail="Either jd_text or jd_id is required")
+
+def _score_resume(resume_data: dict, jd_entry: dict, previous_state: dict = None):
+    section_state, reuse = matching_engine.build_section_state(resume_data["sections"], previous_state)
+    match_results = matching_engine.compute_match_score(
+        resume_data,
+        jd_entry["jd_data"],
+        prepared_jd=jd_entry["prepared_jd"],
+        section_state=section_state
+    )
+    analysis_id = analysis_store.save(
+        match_results,
+        jd_id=jd_entry["jd_id"],
+        section_state=section_state,
+        model=matching_engine.section_state_key
+    )
+    return match_results, analysis_id, reuse
+
+def _parse_resume(resume_pdf_b64: str) -> dict:
+    resume_data = pdf_parser.parse_pdf_from_base64(resume_pdf_b64)
+    
+    pii_detected = pii_service.detect_pii(resume_data["raw_text"])
+    if pii_detected:
+        logger.info(f"PII detected: {len(pii_detected)} items")
+    return resume_data
+
+@router.post("/jds", response_model=RegisterJDResponse)
+async def register_jd(request: RegisterJDRequest):
+    try:
+        entry = await asyncio.to_thread(jd_registry.register, request.jd_text)
+        return RegisterJDResponse(
+            jd_id=entry["jd_id"],
+            requirements=entry["jd_data"]["requirements"],
+            skills=[skill["name"] for skill in entry["prepared_jd"]["skills"]["all"]],
+            seniority=entry["prepared_jd"]["seniority"]
+        )
+    except Exception as e:
+        logger.error(f"Error in register_jd: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def _analysis_response(resume_data: dict, jd_data: dict, match_results: dict, analysis_id: str) -> dict:
+    evidence_list = evidence_builder.build_evidence(resume_data, jd_data, match_results)
+    
+    suggestions = await rewrite_agent.agenerate_suggestions(resume_data, jd_data, match_results)
+    
+    evidence_response = [
+        {"source": "resume" if "resume" in str(e) else "jd", "quote": e.get("resume_quote", e.get("jd_quote", ""))}
+        for e in evidence_list[:10]
+    ]
+    
+    missing_skills = [skill["name"] for skill in match_results["skill_overlap"]["missing"]]
+    
+    suggestions_response = [
+        {
+            "before": s["before"],
+            "after": s["after"],
+            "grounded_by": s.get("grounded_by", []),
+            "reasoning": s.get("reasoning", ""),
+            "confidence": s.get("confidence", 0.5)
+        }
+        for s in suggestions
+    ]
+    
+    return {
+        "match_score": match_results["match_score"],
+        "scores": match_results["scores"],
+        "missing_skills": missing_skills,
+        "evidence": evidence_response,
+        "suggestions": suggestions_response,
+        "ats_preview_text": resume_data["raw_text"],
+        "layout_warnings": resume_data.get("layout_warnings", []),
+        "analysis_id": analysis_id
+    }
 
 @router.post("/analyze", response_model=AnalyzeResponse)
 async def analyze_resume(request: AnalyzeRequest):
@@ -31,62 +130,129 @@ async def analyze_resume(request: AnalyzeRequest):
     try:
         logger.info("Starting resume analysis")
         
-        resume_data = pdf_parser.parse_pdf_from_base64(request.resume_pdf_b64)
-        jd_data = text_processor.process_jd_text(request.jd_text)
+        jd_entry = await asyncio.to_thread(_resolve_jd, request.jd_text, request.jd_id)
+        resume_data = await asyncio.to_thread(_parse_resume, request.resume_pdf_b64)
         
-        pii_detected = pii_service.detect_pii(resume_data["raw_text"])
-        if pii_detected:
-            logger.info(f"PII detected: {len(pii_detected)} items")
+        match_results, analysis_id, _ = await asyncio.to_thread(_score_resume, resume_data, jd_entry)
         
-        match_results = matching_engine.compute_match_score(resume_data, jd_data)
+        response = await _analysis_response(resume_data, jd_entry["jd_data"], match_results, analysis_id)
         
-        evidence_list = evidence_builder.build_evidence(resume_data, jd_data, match_results)
+        logger.info(f"Analysis complete. Match score: {match_results['match_score']}")
         
-        suggestions = rewrite_agent.generate_suggestions(resume_data, jd_data, match_results)
+        obs_service.flush()
         
-        evidence_response = [
-            {"source": "resume" if "resume" in str(e) else "jd", "quote": e.get("resume_quote", e.get("jd_quote", ""))}
-            for e in evidence_list[:10]
-        ]
+        return AnalyzeResponse(**response)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in analyze_resume: {str(e)}")
+        obs_service.log_error(trace, e, {"endpoint": "/analyze"})
+        obs_service.flush()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/reanalyze", response_model=ReanalyzeResponse)
+async def reanalyze_resume(request: ReanalyzeRequest):
+    trace = obs_service.create_trace(name="reanalyze_resume", metadata={"endpoint": "/reanalyze"})
+    
+    try:
+        previous = await asyncio.to_thread(analysis_store.get, request.analysis_id)
+        if previous is None:
+            raise HTTPException(status_code=404, detail=f"Unknown analysis_id: {request.analysis_id}")
         
-        missing_skills = [skill["name"] for skill in match_results["skill_overlap"]["missing"]]
+        sections = request.resume_json.get("sections")
+        if not isinstance(sections, list):
+            raise HTTPException(status_code=422, detail="resume_json must contain a list of sections")
         
-        suggestions_response = [
-            {
-                "before": s["before"],
-                "after": s["after"],
-                "grounded_by": s.get("grounded_by", []),
-                "reasoning": s.get("reasoning", ""),
-                "confidence": s.get("confidence", 0.5)
-            }
-            for s in suggestions
-        ]
+        jd_entry = await asyncio.to_thread(_resolve_jd, jd_id=previous["jd_id"])
+        resume_data = {**request.resume_json, "raw_text": sections_to_text(sections)}
         
-        logger.info(f"Analysis complete. Match score: {match_results['match_score']}")
+        previous_state = await asyncio.to_thread(
+            analysis_store.section_state, request.analysis_id, matching_engine.section_state_key
+        )
+        match_results, analysis_id, reuse = await asyncio.to_thread(_score_resume, resume_data, jd_entry, previous_state)
+        
+        response = await _analysis_response(resume_data, jd_entry["jd_data"], match_results, analysis_id)
+        
+        logger.info(
+            f"Reanalysis complete. Match score: {match_results['match_score']} "
+            f"({reuse['reused']} sections reused, {reuse['recomputed']} recomputed)"
+        )
         
         obs_service.flush()
         
-        return AnalyzeResponse(
-            match_score=match_results["match_score"],
-            scores=match_results["scores"],
-            missing_skills=missing_skills,
-            evidence=evidence_response,
-            suggestions=suggestions_response,
-            ats_preview_text=resume_data["raw_text"],
-            layout_warnings=resume_data["layout_warnings"]
+        return ReanalyzeResponse(
+            **response,
+            previous_analysis_id=request.analysis_id,
+            sections_reused=reuse["reused"],
+            sections_recomputed=reuse["recomputed"]
         )
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error in analyze_resume: {str(e)}")
-        obs_service.log_error(trace, e, {"endpoint": "/analyze"})
+        logger.error(f"Error in reanalyze_resume: {str(e)}")
+        obs_service.log_error(trace, e, {"endpoint": "/reanalyze"})
         obs_service.flush()
         raise HTTPException(status_code=500, detail=str(e))
 
+def _rescore(request: RescoreRequest, requested: list, page_size: int) -> RescoreResponse:
+    next_offset = None
+    if request.all_analyses:
+        offset = max(request.offset, 0)
+        ids, features = analysis_store.all_features(jd_id=request.jd_id, limit=page_size, offset=offset)
+        unknown = []
+        if len(ids) == page_size:
+            next_offset = offset + page_size
+    else:
+        ids, features, unknown = analysis_store.features(requested)
+    
+    start = time.perf_counter()
+    scores = matching_engine.rescore(features, request.weights)
+    elapsed_us = (time.perf_counter() - start) * 1e6
+    
+    return RescoreResponse(
+        results=[
+            {"analysis_id": analysis_id, "match_scores": row.tolist()}
+            for analysis_id, row in zip(ids, scores)
+        ],
+        unknown_ids=unknown,
+        next_offset=next_offset,
+        elapsed_us=round(elapsed_us, 1)
+    )
+
+@router.post("/rescore", response_model=RescoreResponse)
+async def rescore(request: RescoreRequest):
+    if not request.weights:
+        raise HTTPException(status_code=422, detail="At least one weight vector is required")
+    
+    page_size = min(request.limit or settings.RESCORE_MAX_ANALYSES, settings.RESCORE_MAX_ANALYSES)
+    requested = request.analysis_ids or ([request.analysis_id] if request.analysis_id else [])
+    if not request.all_analyses and not requested:
+        raise HTTPException(status_code=422, detail="analysis_id, analysis_ids or all_analyses is required")
+    if len(requested) > settings.RESCORE_MAX_ANALYSES:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {settings.RESCORE_MAX_ANALYSES} analysis_ids per request; page with all_analyses and offset"
+        )
+    
+    try:
+        return await asyncio.to_thread(_rescore, request, requested, page_size)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in rescore: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/suggest", response_model=SuggestResponse)
 async def generate_suggestions(request: SuggestRequest):
     try:
-        suggestions = rewrite_agent.generate_suggestions(
+        if request.jd_json is not None:
+            jd_json = request.jd_json
+        else:
+            jd_json = (await asyncio.to_thread(_resolve_jd, jd_id=request.jd_id))["jd_data"]
+        
+        suggestions = await rewrite_agent.agenerate_suggestions(
             request.resume_json,
-            request.jd_json,
+            jd_json,
             request.match_data
         )
         
@@ -102,6 +268,8 @@ async def generate_suggestions(request: SuggestRequest):
         ]
         
         return SuggestResponse(suggestions=suggestions_response)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -141,4 +309,67 @@ async def export_resume(request: ExportRequest):
             
     except Exception as e:
         logger.error(f"Error in export_resume: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/jobs/ingest", response_model=IngestJobsResponse)
+async def ingest_jobs(request: IngestJobsRequest):
+    try:
+        result = await asyncio.to_thread(job_search_service.ingest, [job.model_dump() for job in request.jobs])
+        return IngestJobsResponse(**result)
+    except Exception as e:
+        logger.error(f"Error in ingest_jobs: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/search-jobs", response_model=SearchJobsResponse)
+async def search_jobs(request: SearchJobsRequest):
+    trace = obs_service.create_trace(name="search_jobs", metadata={"endpoint": "/search-jobs"})
+    
+    try:
+        resume_data = await asyncio.to_thread(pdf_parser.parse_pdf_from_base64, request.resume_pdf_b64)
+        results = await asyncio.to_thread(
+            job_search_service.search, resume_data, top_n=request.top_n, shortlist_size=request.shortlist_size
+        )
+        
+        obs_service.flush()
+        
+        return SearchJobsResponse(results=results)
+    except Exception as e:
+        logger.error(f"Error in search_jobs: {str(e)}")
+        obs_service.log_error(trace, e, {"endpoint": "/search-jobs"})
+        obs_service.flush()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/rank-candidates")
+async def rank_candidates(request: RankCandidatesRequest):
+    resumes = ((r.name, base64.b64decode(r.resume_pdf_b64)) for r in request.resumes)
+    events = candidate_ranker.rank(
+        request.jd_text,
+        resumes,
+        include_suggestions=request.include_suggestions,
+        suggestions_top_n=request.suggestions_top_n
+    )
+    
+    def stream():
+        try:
+            for event in events:
+                yield json.dumps(event) + "\n"
+        except Exception as e:
+            logger.error(f"Error in rank_candidates: {str(e)}")
+            yield json.dumps({"type": "error", "error": str(e)}) + "\n"
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@router.get("/stats")
+async def service_stats():
+    return {
+        "embedding_cache": embedding_service.cache_stats(),
+        "micro_batching": {
+            "embedding": embedding_service.batching_stats(),
+            "nli": contradiction_checker.batching_stats()
+        },
+        "jd_registry": jd_registry.stats(),
+        "analysis_store": analysis_store.stats(),
+        "llm_cache": llm_service.cache_stats(),
+        "suggestion_cache": rewrite_agent.semantic_cache_stats(),
+        "observability": {"cache_counters": obs_service.cache_counters()}
+    }
\ No newline at end of file
@@ -6,9 +6,28 @@ class Settings(BaseSettings):
     
     OLLAMA_BASE_URL: str = "http://localhost:11434"
     OLLAMA_MODEL: str = "llama3.2:3b"
+    OLLAMA_POOL_MAX_CONNECTIONS: int = 8
+    OLLAMA_POOL_MAX_KEEPALIVE: int = 8
+    OLLAMA_KEEPALIVE_EXPIRY_SECONDS: float = 60.0
+    OLLAMA_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    OLLAMA_READ_TIMEOUT_SECONDS: float = 120.0
+    OLLAMA_POOL_TIMEOUT_SECONDS: float = 30.0
     
     DEFAULT_LLM_PROVIDER: str = "ollama"
     FALLBACK_LLM_PROVIDER: str = "gemini"
+    LLM_MAX_CONCURRENCY: int = 4
+    SUGGESTION_DEADLINE_SECONDS: float = 20.0
+    SUGGESTION_MODE: str = "batched"
+    
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_SIZE: int = 1000
+    LLM_CACHE_DIR: Optional[str] = None
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    LLM_CACHE_MAX_DISK_ENTRIES: int = 50000
+    
+    SEMANTIC_CACHE_ENABLED: bool = True
+    SEMANTIC_CACHE_THRESHOLD: float = 0.92
+    SEMANTIC_CACHE_MAX_ENTRIES: int = 5000
     
     LANGFUSE_PUBLIC_KEY: Optional[str] = None
     LANGFUSE_SECRET_KEY: Optional[str] = None
@@ -21,8 +40,60 @@ class Settings(BaseSettings):
     LOG_LEVEL: str = "INFO"
     
     CHROMA_PERSIST_DIR: str = "./chroma_db"
+    VECTOR_UPSERT_BATCH_SIZE: int = 1000
+    VECTOR_BACKEND: str = "chroma"
+    FLAT_INDEX_DIR: str = "./flat_index"
+    FLAT_INDEX_DTYPE: str = "float32"
+    FLAT_INDEX_COMPACT_RATIO: float = 0.25
+    VECTOR_CODEC_PATH: Optional[str] = None
+    VECTOR_RESCORE_FACTOR: int = 10
     MAX_FILE_SIZE_MB: int = 10
     
+    JD_CORPUS_DIR: str = "./jd_corpus"
+    JD_INGEST_BATCH_SIZE: int = 256
+    JOB_SEARCH_HITS_PER_QUERY: int = 50
+    JOB_SEARCH_SHORTLIST_SIZE: int = 25
+    
+    JD_REGISTRY_DIR: str = "./jd_registry"
+    JD_REGISTRY_MAX_ENTRIES: int = 1000
+    JD_REGISTRY_TTL_SECONDS: int = 7 * 24 * 3600
+    JD_REGISTRY_MEMORY_ENTRIES: int = 64
+    JD_REGISTRY_TOUCH_INTERVAL_SECONDS: int = 3600
+    
+    ANALYSIS_STORE_DIR: str = "./analysis_store"
+    ANALYSIS_CACHE_SIZE: int = 100000
+    ANALYSIS_MAX_SECTION_STATES: int = 5000
+    ANALYSIS_MAX_ENTRIES: int = 1000000
+    RESCORE_MAX_ANALYSES: int = 10000
+    
+    RANKING_WORKERS: int = 2
+    RANKING_BATCH_SIZE: int = 16
+    
+    USE_TAXONOMY_ARTIFACT: bool = True
+    TAXONOMY_ARTIFACT_CACHE_DIR: Optional[str] = None
+    SPACY_BATCH_SIZE: int = 32
+    SPACY_N_PROCESS: int = 1
+    
+    EMBEDDING_CACHE_SIZE: int = 10000
+    EMBEDDING_CACHE_DIR: Optional[str] = None
+    EMBEDDING_DTYPE: str = "float32"
+    
+    SEMANTIC_RERANK_ENABLED: bool = False
+    SEMANTIC_RERANK_TOP_K: int = 3
+    SEMANTIC_RERANK_BATCH_SIZE: int = 32
+    
+    CHUNK_MAX_TOKENS: int = 128
+    MAX_CHUNKS_PER_DOCUMENT: int = 96
+    
+    INFERENCE_BACKEND: str = "torch"
+    ONNX_MODEL_DIR: str = "./onnx_models"
+    ONNX_QUANTIZED: bool = True
+    ONNX_NUM_THREADS: int = 0
+    
+    MICRO_BATCHING_ENABLED: bool = True
+    MICRO_BATCH_MAX_SIZE: int = 64
+    MICRO_BATCH_MAX_WAIT_MS: float = 5.0
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -1,16 +1,28 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api import router
+from app.api.endpoints import llm_service, candidate_ranker, embedding_service, contradiction_checker
+import asyncio
 import logging
 
 logging.basicConfig(level=settings.LOG_LEVEL)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await llm_service.aclose()
+    await asyncio.to_thread(candidate_ranker.close)
+    await asyncio.to_thread(embedding_service.close)
+    await asyncio.to_thread(contradiction_checker.close)
+
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -3,7 +3,8 @@ from typing import Optional, List, Dict
 
 class AnalyzeRequest(BaseModel):
     resume_pdf_b64: str
-    jd_text: str
+    jd_text: Optional[str] = None
+    jd_id: Optional[str] = None
     options: Optional[Dict] = Field(default_factory=dict)
 
 class Evidence(BaseModel):
@@ -32,10 +33,21 @@ class AnalyzeResponse(BaseModel):
     suggestions: List[Suggestion]
     ats_preview_text: str
     layout_warnings: List[str]
+    analysis_id: Optional[str] = None
+
+class ReanalyzeRequest(BaseModel):
+    analysis_id: str
+    resume_json: Dict
+
+class ReanalyzeResponse(AnalyzeResponse):
+    previous_analysis_id: str
+    sections_reused: int
+    sections_recomputed: int
 
 class SuggestRequest(BaseModel):
     resume_json: Dict
-    jd_json: Dict
+    jd_json: Optional[Dict] = None
+    jd_id: Optional[str] = None
     match_data: Dict
 
 class SuggestResponse(BaseModel):
@@ -48,4 +60,71 @@ class ExportRequest(BaseModel):
 
 class ExportResponse(BaseModel):
     file_b64: str
-    filename: str
\ No newline at end of file
+    filename: str
+
+class JobDescriptionInput(BaseModel):
+    text: str
+    title: Optional[str] = None
+    source_id: Optional[str] = None
+
+class IngestJobsRequest(BaseModel):
+    jobs: List[JobDescriptionInput]
+
+class IngestJobsResponse(BaseModel):
+    ingested: List[str]
+    duplicates: List[str]
+
+class SearchJobsRequest(BaseModel):
+    resume_pdf_b64: str
+    top_n: int = 10
+    shortlist_size: Optional[int] = None
+
+class JobMatch(BaseModel):
+    jd_id: str
+    title: str
+    retrieval_score: float
+    requirements_hit: int
+    match_score: float
+    scores: ScoreBreakdown
+    missing_skills: List[str]
+
+class SearchJobsResponse(BaseModel):
+    results: List[JobMatch]
+
+class CandidateResume(BaseModel):
+    name: str
+    resume_pdf_b64: str
+
+class RankCandidatesRequest(BaseModel):
+    jd_text: str
+    resumes: List[CandidateResume]
+    include_suggestions: bool = False
+    suggestions_top_n: int = 3
+
+class RegisterJDRequest(BaseModel):
+    jd_text: str
+
+class RegisterJDResponse(BaseModel):
+    jd_id: str
+    requirements: List[str]
+    skills: List[str]
+    seniority: str
+
+class RescoreRequest(BaseModel):
+    analysis_id: Optional[str] = None
+    analysis_ids: Optional[List[str]] = None
+    all_analyses: bool = False
+    jd_id: Optional[str] = None
+    limit: Optional[int] = None
+    offset: int = 0
+    weights: List[Dict[str, float]]
+
+class RescoreResult(BaseModel):
+    analysis_id: str
+    match_scores: List[float]
+
+class RescoreResponse(BaseModel):
+    results: List[RescoreResult]
+    unknown_ids: List[str]
+    next_offset: Optional[int] = None
+    elapsed_us: float
\ No newline at end of file
@@ -0,0 +1,222 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from app.core.config import settings
+import json
+import sqlite3
+import threading
+import time
+import uuid
+import numpy as np
+
+FEATURE_COLUMNS = ["skills_exact", "semantic_fit", "seniority_fit", "recency"]
+
+class AnalysisStore:
+    def __init__(self, storage_dir: Optional[str] = None, cache_size: Optional[int] = None,
+                 max_section_states: Optional[int] = None, max_entries: Optional[int] = None):
+        path = Path(storage_dir or settings.ANALYSIS_STORE_DIR)
+        path.mkdir(parents=True, exist_ok=True)
+        self.cache_size = cache_size or settings.ANALYSIS_CACHE_SIZE
+        self.max_section_states = max_section_states or settings.ANALYSIS_MAX_SECTION_STATES
+        self.max_entries = max_entries or settings.ANALYSIS_MAX_ENTRIES
+        self._features = OrderedDict()
+        self._lock = threading.Lock()
+        
+        self._db = sqlite3.connect(str(path / "analyses.sqlite3"), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS analyses ("
+            "id TEXT PRIMARY KEY, created_at REAL, jd_id TEXT, "
+            "skills_exact REAL, semantic_fit REAL, seniority_fit REAL, recency REAL, skill_overlap TEXT)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS section_states ("
+            "analysis_id TEXT PRIMARY KEY, created_at REAL, model TEXT, sections TEXT, dim INTEGER, embeddings BLOB)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS analyses_created ON analyses (created_at)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS analyses_jd_created ON analyses (jd_id, created_at)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS section_states_created ON section_states (created_at)")
+        self._analysis_count = self._db.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+        self._section_state_count = self._db.execute("SELECT COUNT(*) FROM section_states").fetchone()[0]
+        self._prune_analyses()
+        self._prune_section_states()
+        self._db.commit()
+    
+    def save(self, match_results: Dict, jd_id: Optional[str] = None, analysis_id: Optional[str] = None,
+             section_state: Optional[Dict] = None, model: Optional[str] = None) -> str:
+        analysis_id = analysis_id or uuid.uuid4().hex
+        features = match_results["features"]
+        overlap = match_results["skill_overlap"]
+        skill_overlap = {
+            "matched": [skill["name"] for skill in overlap["matched"]],
+            "missing": [skill["name"] for skill in overlap["missing"]],
+            "matched_count": overlap.get("matched_count", len(overlap["matched"])),
+            "total_required": overlap.get("total_required", len(overlap["matched"]) + len(overlap["missing"]))
+        }
+        vector = np.array([features[name] for name in FEATURE_COLUMNS], dtype=np.float64)
+        
+        with self._lock:
+            exists = self._db.execute("SELECT 1 FROM analyses WHERE id = ?", (analysis_id,)).fetchone() is not None
+            self._db.execute(
+                "INSERT OR REPLACE INTO analyses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (analysis_id, time.time(), jd_id, *vector.tolist(), json.dumps(skill_overlap))
+            )
+            if not exists:
+                self._analysis_count += 1
+            if section_state is not None:
+                self._save_section_state(analysis_id, section_state, model)
+            self._remember(analysis_id, vector)
+            self._prune_analyses()
+            self._db.commit()
+        
+        return analysis_id
+    
+    def _save_section_state(self, analysis_id: str, section_state: Dict, model: Optional[str]):
+        sections = {
+            fingerprint: {"skills": state["skills"], "chunks": state["chunks"]}
+            for fingerprint, state in section_state.items()
+        }
+        blocks = [np.asarray(state["embeddings"], dtype=np.float32) for state in section_state.values() if len(state["chunks"])]
+        embeddings = np.concatenate(blocks) if blocks else np.zeros((0, 0), dtype=np.float32)
+        
+        exists = self._db.execute(
+            "SELECT 1 FROM section_states WHERE analysis_id = ?", (analysis_id,)
+        ).fetchone() is not None
+        self._db.execute(
+            "INSERT OR REPLACE INTO section_states VALUES (?, ?, ?, ?, ?, ?)",
+            (analysis_id, time.time(), model, json.dumps(sections), embeddings.shape[1], embeddings.tobytes())
+        )
+        if not exists:
+            self._section_state_count += 1
+        self._prune_section_states()
+    
+    def _prune_analyses(self):
+        excess = self._analysis_count - self.max_entries
+        if excess <= 0:
+            return
+        victims = [row[0] for row in self._db.execute(
+            "SELECT id FROM analyses ORDER BY created_at LIMIT ?", (excess,)
+        ).fetchall()]
+        for start in range(0, len(victims), 500):
+            chunk = victims[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            self._analysis_count -= self._db.execute(
+                f"DELETE FROM analyses WHERE id IN ({placeholders})", chunk
+            ).rowcount
+            self._section_state_count -= self._db.execute(
+                f"DELETE FROM section_states WHERE analysis_id IN ({placeholders})", chunk
+            ).rowcount
+            for analysis_id in chunk:
+                self._features.pop(analysis_id, None)
+    
+    def _prune_section_states(self):
+        excess = self._section_state_count - self.max_section_states
+        if excess > 0:
+            self._section_state_count -= self._db.execute(
+                "DELETE FROM section_states WHERE analysis_id IN "
+                "(SELECT analysis_id FROM section_states ORDER BY created_at LIMIT ?)",
+                (excess,)
+            ).rowcount
+    
+    def section_state(self, analysis_id: str, model: Optional[str] = None) -> Optional[Dict]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT model, sections, dim, embeddings FROM section_states WHERE analysis_id = ?",
+                (analysis_id,)
+            ).fetchone()
+        if row is None or row[0] != model:
+            return None
+        
+        sections = json.loads(row[1])
+        embeddings = np.frombuffer(row[3], dtype=np.float32).reshape(-1, row[2]) if row[2] else None
+        state = {}
+        offset = 0
+        for fingerprint, section in sections.items():
+            count = len(section["chunks"])
+            state[fingerprint] = {
+                "skills": section["skills"],
+                "chunks": section["chunks"],
+                "embeddings": embeddings[offset:offset + count] if count else np.zeros((0, row[2]), dtype=np.float32)
+            }
+            offset += count
+        return state
+    
+    def _remember(self, analysis_id: str, vector: np.ndarray):
+        self._features[analysis_id] = vector
+        self._features.move_to_end(analysis_id)
+        while len(self._features) > self.cache_size:
+            self._features.popitem(last=False)
+    
+    def features(self, analysis_ids: List[str]) -> Tuple[List[str], np.ndarray, List[str]]:
+        found = {}
+        with self._lock:
+            missing = []
+            for analysis_id in analysis_ids:
+                vector = self._features.get(analysis_id)
+                if vector is None:
+                    missing.append(analysis_id)
+                else:
+                    self._features.move_to_end(analysis_id)
+                    found[analysis_id] = vector
+            
+            columns = ", ".join(FEATURE_COLUMNS)
+            for start in range(0, len(missing), 500):
+                chunk = missing[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._db.execute(
+                    f"SELECT id, {columns} FROM analyses WHERE id IN ({placeholders})", chunk
+                ).fetchall()
+                for row in rows:
+                    vector = np.array(row[1:], dtype=np.float64)
+                    found[row[0]] = vector
+                    self._remember(row[0], vector)
+        
+        ids = [analysis_id for analysis_id in dict.fromkeys(analysis_ids) if analysis_id in found]
+        unknown = [analysis_id for analysis_id in dict.fromkeys(analysis_ids) if analysis_id not in found]
+        matrix = np.stack([found[analysis_id] for analysis_id in ids]) if ids else np.zeros((0, len(FEATURE_COLUMNS)))
+        return ids, matrix, unknown
+    
+    def all_features(self, jd_id: Optional[str] = None, limit: Optional[int] = None,
+                     offset: int = 0) -> Tuple[List[str], np.ndarray]:
+        query = f"SELECT id, {', '.join(FEATURE_COLUMNS)} FROM analyses"
+        params = []
+        if jd_id:
+            query += " WHERE jd_id = ?"
+            params.append(jd_id)
+        query += " ORDER BY created_at DESC"
+        if limit:
+            query += " LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
+        
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        ids = [row[0] for row in rows]
+        matrix = np.array([row[1:] for row in rows], dtype=np.float64).reshape(len(rows), len(FEATURE_COLUMNS))
+        return ids, matrix
+    
+    def get(self, analysis_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT id, created_at, jd_id, {', '.join(FEATURE_COLUMNS)}, skill_overlap FROM analyses WHERE id = ?",
+                (analysis_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "analysis_id": row[0],
+            "created_at": row[1],
+            "jd_id": row[2],
+            "features": dict(zip(FEATURE_COLUMNS, row[3:7])),
+            "skill_overlap": json.loads(row[7])
+        }
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            stored = self._analysis_count
+            section_states = self._section_state_count
+            return {
+                "stored": stored,
+                "max_entries": self.max_entries,
+                "section_states": section_states,
+                "cached": len(self._features),
+                "cache_size": self.cache_size
+            }
\ No newline at end of file
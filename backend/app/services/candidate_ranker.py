@@ -0,0 +1,198 @@
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from app.services.pdf_parser import PDFParser
+from app.services.text_processor import TextProcessor
+from app.services.skill_extractor import SkillExtractor
+from app.services.embedding_service import EmbeddingService
+from app.services.matching_engine import MatchingEngine
+from app.core.config import settings
+from app.utils.logger import get_logger
+import multiprocessing
+import threading
+
+logger = get_logger(__name__)
+
+_worker = {}
+
+def _init_worker():
+    settings.MICRO_BATCHING_ENABLED = False
+    settings.SEMANTIC_RERANK_ENABLED = False
+    embedding_service = EmbeddingService(load_reranker=False)
+    _worker["pdf_parser"] = PDFParser()
+    _worker["skill_extractor"] = SkillExtractor()
+    _worker["embedding_service"] = embedding_service
+    _worker["matching_engine"] = MatchingEngine(_worker["skill_extractor"], embedding_service)
+
+def _worker_score_batch(batch: List[Tuple[str, bytes]], jd_data: Dict, prepared_jd: Dict,
+                        keep_resume: bool) -> List[Dict]:
+    return score_batch(
+        batch,
+        jd_data,
+        prepared_jd,
+        _worker["pdf_parser"],
+        _worker["skill_extractor"],
+        _worker["embedding_service"],
+        _worker["matching_engine"],
+        keep_resume
+    )
+
+def score_batch(batch: List[Tuple[str, bytes]], jd_data: Dict, prepared_jd: Dict, pdf_parser: PDFParser,
+                skill_extractor: SkillExtractor, embedding_service: EmbeddingService,
+                matching_engine: MatchingEngine, keep_resume: bool = False) -> List[Dict]:
+    results = []
+    parsed = []
+    for name, pdf_bytes in batch:
+        try:
+            parsed.append((name, pdf_parser.parse_pdf_from_bytes(pdf_bytes)))
+        except Exception as e:
+            results.append({"name": name, "error": f"Could not parse PDF: {e}"})
+    
+    if not parsed:
+        return results
+    
+    all_skills = skill_extractor.extract_skills_many([resume["raw_text"] for _, resume in parsed])
+    
+    chunk_texts = [
+        chunk["text"]
+        for _, resume in parsed
+        for chunk in matching_engine.chunker.chunk_sections(resume["sections"])
+    ]
+    embedding_service.embed_texts(chunk_texts)
+    
+    for (name, resume_data), resume_skills in zip(parsed, all_skills):
+        try:
+            match_results = matching_engine.compute_match_score(
+                resume_data,
+                jd_data,
+                prepared_jd=prepared_jd,
+                resume_skills=resume_skills
+            )
+        except Exception as e:
+            results.append({"name": name, "error": str(e)})
+            continue
+        
+        result = {
+            "name": name,
+            "match_score": match_results["match_score"],
+            "scores": match_results["scores"],
+            "matched_skills": [skill["name"] for skill in match_results["skill_overlap"]["matched"]],
+            "missing_skills": [skill["name"] for skill in match_results["skill_overlap"]["missing"]]
+        }
+        if keep_resume:
+            result["resume_data"] = resume_data
+            result["match_results"] = match_results
+        results.append(result)
+    
+    return results
+
+class CandidateRanker:
+    def __init__(self, text_processor: TextProcessor, matching_engine: MatchingEngine,
+                 pdf_parser: Optional[PDFParser] = None, rewrite_agent=None,
+                 workers: Optional[int] = None, batch_size: Optional[int] = None):
+        self.text_processor = text_processor
+        self.matching_engine = matching_engine
+        self.pdf_parser = pdf_parser or PDFParser()
+        self.rewrite_agent = rewrite_agent
+        self.workers = settings.RANKING_WORKERS if workers is None else workers
+        self.batch_size = batch_size or settings.RANKING_BATCH_SIZE
+        self._executor = None
+        self._executor_lock = threading.Lock()
+    
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker
+                )
+            return self._executor
+    
+    def _discard_pool(self, executor: ProcessPoolExecutor):
+        with self._executor_lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    def close(self):
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    def _batches(self, resumes: Iterable[Tuple[str, bytes]]) -> Iterator[List[Tuple[str, bytes]]]:
+        batch = []
+        for item in resumes:
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    
+    def _score_all(self, jd_data: Dict, prepared_jd: Dict, resumes: Iterable[Tuple[str, bytes]],
+                   keep_resume: bool) -> Iterator[Dict]:
+        if self.workers <= 0:
+            for batch in self._batches(resumes):
+                yield from score_batch(
+                    batch,
+                    jd_data,
+                    prepared_jd,
+                    self.pdf_parser,
+                    self.matching_engine.skill_extractor,
+                    self.matching_engine.embedding_service,
+                    self.matching_engine,
+                    keep_resume
+                )
+            return
+        
+        executor = self._pool()
+        pending = set()
+        try:
+            for batch in self._batches(resumes):
+                pending.add(executor.submit(_worker_score_batch, batch, jd_data, prepared_jd, keep_resume))
+                if len(pending) >= self.workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from future.result()
+            for future in as_completed(pending):
+                yield from future.result()
+        except BrokenProcessPool:
+            self._discard_pool(executor)
+            raise
+        finally:
+            for future in pending:
+                future.cancel()
+    
+    def rank(self, jd_text: str, resumes: Iterable[Tuple[str, bytes]], include_suggestions: bool = False,
+             suggestions_top_n: int = 3) -> Iterator[Dict]:
+        jd_data = self.text_processor.process_jd_text(jd_text)
+        prepared_jd = self.matching_engine.prepare_jd(jd_data)
+        keep_resume = include_suggestions and self.rewrite_agent is not None
+        
+        scored = []
+        failed = []
+        for result in self._score_all(jd_data, prepared_jd, resumes, keep_resume):
+            if "error" in result:
+                failed.append(result)
+                yield {"type": "error", **result}
+                continue
+            scored.append(result)
+            yield {"type": "scored", **{k: v for k, v in result.items() if k not in ("resume_data", "match_results")}}
+        
+        scored.sort(key=lambda r: r["match_score"], reverse=True)
+        logger.info(f"Ranked {len(scored)} candidates ({len(failed)} failed)")
+        
+        ranking = []
+        for rank, result in enumerate(scored, start=1):
+            entry = {"rank": rank, **{k: v for k, v in result.items() if k not in ("resume_data", "match_results")}}
+            if keep_resume and rank <= suggestions_top_n:
+                entry["suggestions"] = self.rewrite_agent.generate_suggestions(
+                    result["resume_data"],
+                    jd_data,
+                    result["match_results"]
+                )
+            ranking.append(entry)
+        
+        yield {"type": "ranking", "ranking": ranking, "failed": [r["name"] for r in failed]}
\ No newline at end of file
@@ -1,13 +1,37 @@
 from transformers import pipeline
-from typing import List, Dict
+from typing import List, Dict, Tuple
+from app.core.config import settings
+from app.services.micro_batcher import MicroBatcher
 
 class ContradictionChecker:
     def __init__(self):
-        self.nli_model = pipeline("text-classification", model="cross-encoder/nli-deberta-v3-small")
-    
-    def check_contradiction(self, premise: str, hypothesis: str) -> Dict:
-        result = self.nli_model(f"{premise} [SEP] {hypothesis}")[0]
+        self.model_name = "cross-encoder/nli-deberta-v3-small"
+        self.backend = settings.INFERENCE_BACKEND
         
+        if self.backend == "onnx":
+            from app.services.onnx_backend import OnnxTextClassifier
+            self.nli_model = OnnxTextClassifier.from_pretrained(self.model_name, quantized=settings.ONNX_QUANTIZED)
+        else:
+            self.nli_model = pipeline("text-classification", model=self.model_name)
+        
+        self.classify_batcher = None
+        if settings.MICRO_BATCHING_ENABLED:
+            self.classify_batcher = MicroBatcher(
+                "nli",
+                self._run_model,
+                max_batch_size=settings.MICRO_BATCH_MAX_SIZE,
+                max_wait_ms=settings.MICRO_BATCH_MAX_WAIT_MS
+            )
+    
+    def _run_model(self, inputs: List[str]) -> List[Dict]:
+        return self.nli_model(inputs, batch_size=settings.MICRO_BATCH_MAX_SIZE)
+    
+    def _classify(self, inputs: List[str]) -> List[Dict]:
+        if self.classify_batcher is None:
+            return self._run_model(inputs)
+        return self.classify_batcher.map(inputs)
+    
+    def _to_result(self, result: Dict) -> Dict:
         label = result["label"].lower()
         score = result["score"]
         
@@ -19,27 +43,52 @@ class ContradictionChecker:
             "confidence": score
         }
     
+    def check_contradiction(self, premise: str, hypothesis: str) -> Dict:
+        return self._to_result(self._classify([f"{premise} [SEP] {hypothesis}"])[0])
+    
+    def check_contradictions_batch(self, pairs: List[Tuple[str, str]]) -> List[Dict]:
+        if not pairs:
+            return []
+        results = self._classify([f"{premise} [SEP] {hypothesis}" for premise, hypothesis in pairs])
+        return [self._to_result(result) for result in results]
+    
+    def batching_stats(self) -> Dict:
+        return self.classify_batcher.stats() if self.classify_batcher else {}
+    
+    def close(self):
+        if self.classify_batcher is not None:
+            self.classify_batcher.close()
+    
     def check_suggestion_against_resume(self, resume_facts: List[str], suggestion: str) -> Dict:
-        contradictions = []
+        return self.check_suggestions_against_resume(resume_facts, [suggestion])[0]
+    
+    def check_suggestions_against_resume(self, resume_facts: List[str], suggestions: List[str]) -> List[Dict]:
+        check_results = self.check_contradictions_batch([
+            (fact, suggestion) for suggestion in suggestions for fact in resume_facts
+        ])
         
-        for fact in resume_facts:
-            check_result = self.check_contradiction(fact, suggestion)
+        results = []
+        for index, suggestion in enumerate(suggestions):
+            contradictions = []
+            offset = index * len(resume_facts)
+            for fact, check_result in zip(resume_facts, check_results[offset:offset + len(resume_facts)]):
+                if check_result["is_contradiction"] and check_result["confidence"] > 0.7:
+                    contradictions.append({
+                        "resume_fact": fact,
+                        "suggestion": suggestion,
+                        "confidence": check_result["confidence"]
+                    })
             
-            if check_result["is_contradiction"] and check_result["confidence"] > 0.7:
-                contradictions.append({
-                    "resume_fact": fact,
-                    "suggestion": suggestion,
-                    "confidence": check_result["confidence"]
-                })
-        
-        has_contradiction = len(contradictions) > 0
-        penalty = -0.05 * len(contradictions) if has_contradiction else 0.0
+            has_contradiction = len(contradictions) > 0
+            penalty = -0.05 * len(contradictions) if has_contradiction else 0.0
+            
+            results.append({
+                "has_contradiction": has_contradiction,
+                "contradictions": contradictions,
+                "penalty": penalty
+            })
         
-        return {
-            "has_contradiction": has_contradiction,
-            "contradictions": contradictions,
-            "penalty": penalty
-        }
+        return results
     
     def extract_facts(self, resume_text: str) -> List[str]:
         sentences = resume_text.split('.')
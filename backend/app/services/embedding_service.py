@@ -1,63 +1,166 @@
 from sentence_transformers import SentenceTransformer, CrossEncoder
-from typing import List, Dict
+from typing import List, Dict, Tuple, Union
+from app.core.config import settings
+from app.services.embedding_cache import EmbeddingCache
+from app.services.micro_batcher import MicroBatcher
 import numpy as np
 
 class EmbeddingService:
-    def __init__(self):
-        self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-        self.reranker = CrossEncoder('cross-encoder/ms-marco-MiniLM-L-6-v2')
+    def __init__(self, load_reranker: bool = True):
+        self.model_name = 'all-MiniLM-L6-v2'
+        self.reranker_name = 'cross-encoder/ms-marco-MiniLM-L-6-v2'
+        self.backend = settings.INFERENCE_BACKEND
         
-    def embed_texts(self, texts: List[str]) -> np.ndarray:
-        embeddings = self.embedding_model.encode(texts, convert_to_numpy=True)
-        return embeddings
+        if self.backend == "onnx":
+            from app.services.onnx_backend import OnnxSentenceEncoder, OnnxCrossEncoder
+            self.embedding_model = OnnxSentenceEncoder.from_pretrained(self.model_name, quantized=settings.ONNX_QUANTIZED)
+            self.reranker = None
+            if load_reranker:
+                self.reranker = OnnxCrossEncoder.from_pretrained(self.reranker_name, quantized=settings.ONNX_QUANTIZED)
+        else:
+            self.embedding_model = SentenceTransformer(self.model_name)
+            self.reranker = CrossEncoder(self.reranker_name) if load_reranker else None
+        
+        self.backend_tag = f"{self.backend}-int8" if self.backend == "onnx" and settings.ONNX_QUANTIZED else self.backend
+        self.dtype = np.float16 if settings.EMBEDDING_DTYPE == "float16" else np.float32
+        self.cache = EmbeddingCache(
+            f"{self.model_name}:{self.backend_tag}:l2",
+            max_entries=settings.EMBEDDING_CACHE_SIZE,
+            persist_dir=settings.EMBEDDING_CACHE_DIR
+        )
+        
+        self.encode_batcher = None
+        if settings.MICRO_BATCHING_ENABLED:
+            self.encode_batcher = MicroBatcher(
+                "embedding",
+                lambda texts: list(self.embedding_model.encode(texts, convert_to_numpy=True, batch_size=settings.MICRO_BATCH_MAX_SIZE)),
+                max_batch_size=settings.MICRO_BATCH_MAX_SIZE,
+                max_wait_ms=settings.MICRO_BATCH_MAX_WAIT_MS
+            )
+    
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        if self.encode_batcher is None:
+            embeddings = self.embedding_model.encode(texts, convert_to_numpy=True)
+        else:
+            embeddings = np.vstack(self.encode_batcher.map(texts))
+        return self.normalize(embeddings)
+    
+    @staticmethod
+    def normalize(embeddings: np.ndarray) -> np.ndarray:
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if embeddings.ndim == 1:
+            norm = np.linalg.norm(embeddings)
+            return embeddings / norm if norm > 0 else embeddings
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return embeddings / norms
+    
+    def embed_texts(self, texts: List[str], use_cache: bool = True) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.embedding_model.get_sentence_embedding_dimension()), dtype=self.dtype)
+        
+        if not use_cache:
+            return self._encode(texts).astype(self.dtype, copy=False)
+        
+        cached = self.cache.get_many(texts)
+        missing = list(dict.fromkeys(text for text, vector in zip(texts, cached) if vector is None))
+        
+        if missing:
+            computed = self._encode(missing)
+            self.cache.put_many(missing, computed)
+            by_text = dict(zip(missing, computed))
+            cached = [by_text[text] if vector is None else vector for text, vector in zip(texts, cached)]
+        
+        return np.vstack(cached).astype(self.dtype, copy=False)
     
     def embed_single(self, text: str) -> np.ndarray:
-        return self.embedding_model.encode([text], convert_to_numpy=True)[0]
+        return self.embed_texts([text])[0]
     
-    def compute_similarity(self, text1: str, text2: str) -> float:
-        emb1 = self.embed_single(text1)
-        emb2 = self.embed_single(text2)
+    def count_tokens(self, text: str) -> int:
+        tokenizer = getattr(self.embedding_model, "tokenizer", None)
+        if tokenizer is None:
+            return int(len(text.split()) * 1.3) + 1
+        return len(tokenizer.tokenize(text)) + 2
+    
+    def cache_stats(self) -> Dict:
+        return self.cache.stats()
+    
+    def batching_stats(self) -> Dict:
+        return self.encode_batcher.stats() if self.encode_batcher else {}
+    
+    def close(self):
+        if self.encode_batcher is not None:
+            self.encode_batcher.close()
+    
+    def _as_embeddings(self, items: Union[List[str], np.ndarray]) -> np.ndarray:
+        if isinstance(items, np.ndarray):
+            return items.astype(np.float32, copy=False)
+        return self.embed_texts(list(items)).astype(np.float32, copy=False)
+    
+    def similarity_matrix(self, queries: Union[List[str], np.ndarray], docs: Union[List[str], np.ndarray]) -> np.ndarray:
+        query_embs = self._as_embeddings(queries)
+        doc_embs = self._as_embeddings(docs)
+        if len(query_embs) == 0 or len(doc_embs) == 0:
+            return np.zeros((len(query_embs), len(doc_embs)), dtype=np.float32)
+        return query_embs @ doc_embs.T
+    
+    def top_k_similar(self, queries: Union[List[str], np.ndarray], docs: Union[List[str], np.ndarray],
+                      k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        return self.top_k_from_scores(self.similarity_matrix(queries, docs), k)
+    
+    @staticmethod
+    def top_k_from_scores(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        k = min(k, scores.shape[1])
+        if k <= 0:
+            empty = np.zeros((scores.shape[0], 0))
+            return empty.astype(np.int64), empty.astype(np.float32)
         
-        similarity = np.dot(emb1, emb2) / (np.linalg.norm(emb1) * np.linalg.norm(emb2))
-        return float(similarity)
+        if k < scores.shape[1]:
+            candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            candidates = np.tile(np.arange(scores.shape[1]), (scores.shape[0], 1))
+        candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+        order = np.argsort(-candidate_scores, axis=1, kind="stable")
+        return np.take_along_axis(candidates, order, axis=1), np.take_along_axis(candidate_scores, order, axis=1)
+    
+    def compute_similarity(self, text1: str, text2: str) -> float:
+        return float(self.similarity_matrix([text1], [text2])[0, 0])
     
     def compute_similarities_batch(self, query: str, documents: List[str]) -> List[float]:
-        query_emb = self.embed_single(query)
-        doc_embs = self.embed_texts(documents)
-        
-        similarities = []
-        for doc_emb in doc_embs:
-            sim = np.dot(query_emb, doc_emb) / (np.linalg.norm(query_emb) * np.linalg.norm(doc_emb))
-            similarities.append(float(sim))
-        
-        return similarities
+        return self.similarity_matrix([query], documents)[0].tolist()
     
     def rerank(self, query: str, documents: List[str], top_k: int = 5) -> List[Dict]:
-        pairs = [[query, doc] for doc in documents]
-        scores = self.reranker.predict(pairs)
+        if not documents:
+            return []
         
-        results = []
-        for idx, score in enumerate(scores):
-            results.append({
-                "text": documents[idx],
-                "score": float(score),
-                "index": idx
-            })
+        scores = self.rerank_pairs([[query, doc] for doc in documents])
+        indices, _ = self.top_k_from_scores(scores[None, :], top_k)
         
-        results.sort(key=lambda x: x["score"], reverse=True)
-        return results[:top_k]
+        return [
+            {
+                "text": documents[idx],
+                "score": float(scores[idx]),
+                "index": int(idx)
+            }
+            for idx in indices[0]
+        ]
+    
+    def rerank_pairs(self, pairs: List[List[str]], batch_size: int = 32) -> np.ndarray:
+        if not pairs:
+            return np.zeros((0,), dtype=np.float32)
+        return np.asarray(self.reranker.predict(pairs, batch_size=batch_size), dtype=np.float32)
     
     def find_most_similar(self, query: str, candidates: List[str], threshold: float = 0.5) -> List[Dict]:
-        similarities = self.compute_similarities_batch(query, candidates)
-        
-        results = []
-        for idx, sim in enumerate(similarities):
-            if sim >= threshold:
-                results.append({
-                    "text": candidates[idx],
-                    "similarity": sim,
-                    "index": idx
-                })
-        
-        results.sort(key=lambda x: x["similarity"], reverse=True)
-        return results
\ No newline at end of file
+        similarities = self.similarity_matrix([query], candidates)[0]
+        
+        indices = np.flatnonzero(similarities >= threshold)
+        indices = indices[np.argsort(-similarities[indices], kind="stable")]
+        
+        return [
+            {
+                "text": candidates[idx],
+                "similarity": float(similarities[idx]),
+                "index": int(idx)
+            }
+            for idx in indices
+        ]
\ No newline at end of file
@@ -0,0 +1,227 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+from app.services.text_processor import TextProcessor
+from app.services.matching_engine import MatchingEngine
+from app.core.config import settings
+from app.utils.logger import get_logger
+import hashlib
+import itertools
+import json
+import os
+import tempfile
+import threading
+import time
+import numpy as np
+
+logger = get_logger(__name__)
+
+class JDRegistry:
+    def __init__(self, text_processor: TextProcessor, matching_engine: MatchingEngine,
+                 storage_dir: Optional[str] = None, max_entries: Optional[int] = None,
+                 ttl_seconds: Optional[int] = None, memory_entries: Optional[int] = None):
+        self.text_processor = text_processor
+        self.matching_engine = matching_engine
+        self.storage_dir = Path(storage_dir or settings.JD_REGISTRY_DIR)
+        self.storage_dir.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries or settings.JD_REGISTRY_MAX_ENTRIES
+        self.ttl_seconds = ttl_seconds or settings.JD_REGISTRY_TTL_SECONDS
+        self.memory_entries = memory_entries or settings.JD_REGISTRY_MEMORY_ENTRIES
+        self.touch_interval = settings.JD_REGISTRY_TOUCH_INTERVAL_SECONDS
+        self.model_key = matching_engine.embedding_service.cache.model_name
+        
+        self._entries = OrderedDict()
+        self._index = OrderedDict()
+        self._lock = threading.Lock()
+        self._scan()
+    
+    def _scan(self):
+        now = time.time()
+        found = []
+        for meta_path in self.storage_dir.glob("*.json"):
+            jd_id = meta_path.stem
+            info = self._stat(jd_id)
+            if info is None or now - info["used"] > self.ttl_seconds:
+                self.delete(jd_id)
+                continue
+            found.append((info["used"], jd_id, info))
+        
+        for _, jd_id, info in sorted(found):
+            self._index[jd_id] = info
+        self._evict()
+    
+    @staticmethod
+    def jd_id_for(jd_text: str) -> str:
+        normalized = " ".join(jd_text.split())
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
+    
+    def _paths(self, jd_id: str):
+        return self.storage_dir / f"{jd_id}.json", self.storage_dir / f"{jd_id}.npy"
+    
+    def _stat(self, jd_id: str) -> Optional[Dict]:
+        meta_path, embeddings_path = self._paths(jd_id)
+        try:
+            meta_stat = meta_path.stat()
+            size = meta_stat.st_size + embeddings_path.stat().st_size
+        except OSError:
+            return None
+        return {"used": meta_stat.st_mtime, "touched": meta_stat.st_mtime, "size": size}
+    
+    def _track(self, jd_id: str, info: Dict) -> Dict:
+        with self._lock:
+            self._index[jd_id] = info
+            self._index.move_to_end(jd_id)
+        return info
+    
+    def _write_atomic(self, path: Path, write_fn, mode: str = "wb"):
+        fd, tmp_name = tempfile.mkstemp(dir=self.storage_dir, prefix=f"{path.name}.", suffix=".tmp")
+        try:
+            with open(fd, mode, encoding=None if "b" in mode else "utf-8") as f:
+                write_fn(f)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+    
+    def _write(self, jd_id: str, meta: Dict, embeddings: np.ndarray):
+        meta_path, embeddings_path = self._paths(jd_id)
+        self._write_atomic(embeddings_path, lambda f: np.save(f, np.asarray(embeddings)))
+        self._write_atomic(meta_path, lambda f: json.dump(meta, f), mode="w")
+    
+    def register(self, jd_text: str) -> Dict:
+        jd_id = self.jd_id_for(jd_text)
+        entry = self.get(jd_id)
+        if entry is not None:
+            return entry
+        
+        jd_data = self.text_processor.process_jd_text(jd_text)
+        prepared_jd = self.matching_engine.prepare_jd(jd_data)
+        entry = {"jd_id": jd_id, "jd_data": jd_data, "prepared_jd": prepared_jd}
+        
+        meta = {
+            "jd_id": jd_id,
+            "model": self.model_key,
+            "created_at": time.time(),
+            "jd_data": jd_data,
+            "skills": prepared_jd["skills"],
+            "seniority": prepared_jd["seniority"]
+        }
+        self._write(jd_id, meta, prepared_jd["requirement_embeddings"])
+        
+        self._remember(jd_id, entry)
+        info = self._stat(jd_id)
+        if info is not None:
+            self._track(jd_id, info)
+            self._evict()
+        logger.info(f"Registered JD {jd_id} ({len(jd_data['requirements'])} requirements)")
+        return entry
+    
+    def get(self, jd_id: str) -> Optional[Dict]:
+        with self._lock:
+            info = self._index.get(jd_id)
+        if info is None:
+            info = self._stat(jd_id)
+            if info is None:
+                with self._lock:
+                    self._entries.pop(jd_id, None)
+                return None
+            self._track(jd_id, info)
+        
+        now = time.time()
+        if now - info["used"] > self.ttl_seconds:
+            self.delete(jd_id)
+            return None
+        
+        with self._lock:
+            entry = self._entries.get(jd_id)
+            if entry is not None:
+                self._entries.move_to_end(jd_id)
+        
+        if entry is None:
+            entry = self._load(jd_id)
+            if entry is None:
+                return None
+            self._remember(jd_id, entry)
+        
+        with self._lock:
+            info["used"] = now
+            if jd_id in self._index:
+                self._index.move_to_end(jd_id)
+            touch = now - info["touched"] > self.touch_interval
+            if touch:
+                info["touched"] = now
+        if touch:
+            try:
+                os.utime(self._paths(jd_id)[0])
+            except OSError:
+                pass
+        return entry
+    
+    def _load(self, jd_id: str) -> Optional[Dict]:
+        meta_path, embeddings_path = self._paths(jd_id)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            embeddings = np.load(embeddings_path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Dropping unreadable JD registry entry {jd_id}: {e}")
+            self.delete(jd_id)
+            return None
+        
+        if meta.get("model") != self.model_key:
+            embeddings = self.matching_engine.embedding_service.embed_texts(meta["jd_data"]["requirements"])
+            meta["model"] = self.model_key
+            try:
+                self._write(jd_id, meta, embeddings)
+                info = self._stat(jd_id)
+                with self._lock:
+                    if info is not None and jd_id in self._index:
+                        self._index[jd_id]["size"] = info["size"]
+            except OSError as e:
+                logger.warning(f"Could not update embeddings for JD registry entry {jd_id}: {e}")
+        
+        return {
+            "jd_id": jd_id,
+            "jd_data": meta["jd_data"],
+            "prepared_jd": {
+                "skills": meta["skills"],
+                "requirement_embeddings": embeddings,
+                "seniority": meta["seniority"]
+            }
+        }
+    
+    def _remember(self, jd_id: str, entry: Dict):
+        with self._lock:
+            self._entries[jd_id] = entry
+            self._entries.move_to_end(jd_id)
+            while len(self._entries) > self.memory_entries:
+                self._entries.popitem(last=False)
+    
+    def _evict(self):
+        with self._lock:
+            excess = len(self._index) - self.max_entries
+            if excess <= 0:
+                return
+            victims = list(itertools.islice(self._index, excess))
+        for jd_id in victims:
+            self.delete(jd_id)
+    
+    def delete(self, jd_id: str):
+        with self._lock:
+            self._entries.pop(jd_id, None)
+            self._index.pop(jd_id, None)
+        for path in self._paths(jd_id):
+            path.unlink(missing_ok=True)
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            cached = len(self._entries)
+            stored = len(self._index)
+            stored_bytes = sum(info["size"] for info in self._index.values())
+        return {
+            "stored": stored,
+            "stored_bytes": stored_bytes,
+            "cached": cached,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds
+        }
\ No newline at end of file
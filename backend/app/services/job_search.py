@@ -0,0 +1,182 @@
+from pathlib import Path
+from typing import Dict, List, Optional
+from app.services.text_processor import TextProcessor
+from app.services.embedding_service import EmbeddingService
+from app.services.vector_store import VectorStore
+from app.services.matching_engine import MatchingEngine
+from app.core.config import settings
+from app.utils.logger import get_logger
+import hashlib
+import json
+import os
+
+logger = get_logger(__name__)
+
+class JobSearchService:
+    def __init__(self, text_processor: TextProcessor, embedding_service: EmbeddingService,
+                 vector_store: VectorStore, matching_engine: MatchingEngine, corpus_dir: Optional[str] = None):
+        self.text_processor = text_processor
+        self.embedding_service = embedding_service
+        self.vector_store = vector_store
+        self.matching_engine = matching_engine
+        self.corpus_dir = Path(corpus_dir or settings.JD_CORPUS_DIR)
+        self.corpus_dir.mkdir(parents=True, exist_ok=True)
+    
+    @staticmethod
+    def content_hash(text: str) -> str:
+        normalized = " ".join(text.split())
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
+    
+    def _doc_path(self, jd_id: str) -> Path:
+        return self.corpus_dir / jd_id[:2] / f"{jd_id}.json"
+    
+    def has_jd(self, jd_id: str) -> bool:
+        return self._doc_path(jd_id).exists()
+    
+    def load_jd(self, jd_id: str) -> Optional[Dict]:
+        path = self._doc_path(jd_id)
+        if not path.exists():
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    
+    def _store_jd(self, doc: Dict):
+        path = self._doc_path(doc["jd_id"])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(doc, f)
+        os.replace(tmp_path, path)
+    
+    def _index_texts(self, jd_data: Dict) -> List[str]:
+        if jd_data["requirements"]:
+            return jd_data["requirements"]
+        return [chunk["text"] for chunk in self.matching_engine.chunker.chunk_sections(jd_data["sections"])]
+    
+    def ingest(self, jobs: List[Dict], batch_size: Optional[int] = None) -> Dict:
+        batch_size = batch_size or settings.JD_INGEST_BATCH_SIZE
+        ingested = []
+        duplicates = []
+        seen = set()
+        
+        for start in range(0, len(jobs), batch_size):
+            pending = []
+            for job in jobs[start:start + batch_size]:
+                text = job.get("text", "")
+                if not text.strip():
+                    continue
+                
+                jd_id = self.content_hash(text)
+                if jd_id in seen or self.has_jd(jd_id):
+                    duplicates.append(jd_id)
+                    continue
+                seen.add(jd_id)
+                
+                jd_data = self.text_processor.process_jd_text(text)
+                index_texts = self._index_texts(jd_data)
+                if not index_texts:
+                    continue
+                
+                title = job.get("title") or text.strip().split("\n")[0][:100]
+                pending.append(({
+                    "jd_id": jd_id,
+                    "title": title,
+                    "source_id": job.get("source_id"),
+                    "jd_data": jd_data
+                }, index_texts))
+            
+            if not pending:
+                continue
+            
+            all_texts = [text for _, index_texts in pending for text in index_texts]
+            embeddings = self.embedding_service.embed_texts(all_texts, use_cache=False).astype("float32")
+            
+            offset = 0
+            upserts = []
+            for doc, index_texts in pending:
+                upserts.append({
+                    "jd_id": doc["jd_id"],
+                    "requirements": index_texts,
+                    "embeddings": embeddings[offset:offset + len(index_texts)].tolist(),
+                    "metadata": {"req_count": len(index_texts), "title": doc["title"]}
+                })
+                offset += len(index_texts)
+            self.vector_store.upsert_jd_requirements_many(upserts)
+            
+            for doc, _ in pending:
+                self._store_jd(doc)
+                ingested.append(doc["jd_id"])
+            
+            logger.info(f"Ingested {len(ingested)} JDs ({len(duplicates)} duplicates skipped)")
+        
+        return {"ingested": ingested, "duplicates": duplicates}
+    
+    def _retrieve(self, resume_data: Dict, hits_per_query: int) -> List[Dict]:
+        query_texts = [chunk["text"] for chunk in self.matching_engine.chunker.chunk_sections(resume_data["sections"])]
+        if not query_texts and resume_data.get("raw_text", "").strip():
+            query_texts = [resume_data["raw_text"]]
+        if not query_texts:
+            return []
+        
+        query_embeddings = self.embedding_service.embed_texts(query_texts).astype("float32")
+        
+        best = {}
+        info = {}
+        results = self.vector_store.query_requirements_many(query_embeddings.tolist(), n_results=hits_per_query)
+        for distances, metadatas in zip(results["distances"], results["metadatas"]):
+            for distance, metadata in zip(distances, metadatas):
+                jd_id = metadata["jd_id"]
+                similarity = 1.0 - distance
+                requirement_scores = best.setdefault(jd_id, {})
+                req_index = metadata["req_index"]
+                requirement_scores[req_index] = max(requirement_scores.get(req_index, 0.0), similarity)
+                info[jd_id] = metadata
+        
+        candidates = []
+        for jd_id, requirement_scores in best.items():
+            req_count = max(info[jd_id].get("req_count", len(requirement_scores)), 1)
+            candidates.append({
+                "jd_id": jd_id,
+                "title": info[jd_id].get("title", ""),
+                "retrieval_score": round(float(sum(requirement_scores.values()) / req_count), 4),
+                "requirements_hit": len(requirement_scores)
+            })
+        
+        candidates.sort(key=lambda c: c["retrieval_score"], reverse=True)
+        return candidates
+    
+    def search(self, resume_data: Dict, top_n: int = 10, shortlist_size: Optional[int] = None,
+               hits_per_query: Optional[int] = None, section_state: Optional[Dict] = None) -> List[Dict]:
+        shortlist_size = max(shortlist_size or settings.JOB_SEARCH_SHORTLIST_SIZE, top_n)
+        hits_per_query = hits_per_query or settings.JOB_SEARCH_HITS_PER_QUERY
+        
+        shortlist = self._retrieve(resume_data, hits_per_query)[:shortlist_size]
+        logger.info(f"Job search shortlisted {len(shortlist)} JDs")
+        if not shortlist:
+            return []
+        
+        if section_state is None:
+            section_state, _ = self.matching_engine.build_section_state(resume_data["sections"])
+        resume_skills = self.matching_engine.section_skills(resume_data["sections"], section_state)
+        
+        results = []
+        for candidate in shortlist:
+            doc = self.load_jd(candidate["jd_id"])
+            if doc is None:
+                continue
+            
+            match_results = self.matching_engine.compute_match_score(
+                resume_data,
+                doc["jd_data"],
+                resume_skills=resume_skills,
+                section_state=section_state
+            )
+            results.append({
+                **candidate,
+                "match_score": match_results["match_score"],
+                "scores": match_results["scores"],
+                "missing_skills": [skill["name"] for skill in match_results["skill_overlap"]["missing"]]
+            })
+        
+        results.sort(key=lambda r: r["match_score"], reverse=True)
+        return results[:top_n]
\ No newline at end of file
@@ -0,0 +1,150 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+class LLMResponseCache:
+    def __init__(self, max_entries: int = 1000, persist_dir: Optional[str] = None,
+                 ttl_seconds: Optional[float] = None, max_disk_entries: Optional[int] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_disk_entries = max_disk_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._stored = 0
+        
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        
+        if persist_dir:
+            path = Path(persist_dir)
+            path.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path / "llm_responses.sqlite3"), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_responses ("
+                "key TEXT PRIMARY KEY, provider TEXT, model TEXT, created_at REAL, accessed_at REAL, response TEXT)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS llm_responses_accessed ON llm_responses (accessed_at)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS llm_responses_created ON llm_responses (created_at)")
+            self._stored = self._db.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+            self._prune(time.time())
+            self._db.commit()
+    
+    @staticmethod
+    def key(provider: str, model: str, system_prompt: Optional[str], prompt: str, temperature: float) -> str:
+        payload = json.dumps([provider, model, system_prompt or "", prompt, round(float(temperature), 4)])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return bool(self.ttl_seconds) and now - created_at > self.ttl_seconds
+    
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                created_at, response = entry
+                if not self._is_expired(created_at, now):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return response
+                self._entries.pop(key, None)
+                self.expired += 1
+            
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT created_at, response FROM llm_responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    if not self._is_expired(row[0], now):
+                        self._db.execute("UPDATE llm_responses SET accessed_at = ? WHERE key = ?", (now, key))
+                        self._db.commit()
+                        self._remember(key, row[0], row[1])
+                        self.hits += 1
+                        self.disk_hits += 1
+                        return row[1]
+                    self._stored -= self._db.execute("DELETE FROM llm_responses WHERE key = ?", (key,)).rowcount
+                    self._db.commit()
+                    self.expired += 1
+            
+            self.misses += 1
+            return None
+    
+    def put(self, key: str, response: str, provider: str, model: str):
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, response)
+            if self._db is None:
+                return
+            
+            exists = self._db.execute("SELECT 1 FROM llm_responses WHERE key = ?", (key,)).fetchone() is not None
+            self._db.execute(
+                "INSERT OR REPLACE INTO llm_responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, provider, model, now, now, response)
+            )
+            if not exists:
+                self._stored += 1
+            self._prune(now)
+            self._db.commit()
+    
+    def _prune(self, now: float):
+        if self.ttl_seconds:
+            self._stored -= self._db.execute(
+                "DELETE FROM llm_responses WHERE created_at < ?", (now - self.ttl_seconds,)
+            ).rowcount
+        if self.max_disk_entries and self._stored > self.max_disk_entries:
+            removed = self._db.execute(
+                "DELETE FROM llm_responses WHERE key IN "
+                "(SELECT key FROM llm_responses ORDER BY accessed_at LIMIT ?)",
+                (self._stored - self.max_disk_entries,)
+            ).rowcount
+            self._stored -= removed
+            self.evictions += removed
+    
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+            if self._db is not None:
+                self._stored -= self._db.execute("DELETE FROM llm_responses WHERE key = ?", (key,)).rowcount
+                self._db.commit()
+    
+    def _remember(self, key: str, created_at: float, response: str):
+        self._entries[key] = (created_at, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM llm_responses")
+                self._db.commit()
+                self._stored = 0
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "stored": self._stored,
+                "max_disk_entries": self.max_disk_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "persistent": self._db is not None
+            }
\ No newline at end of file
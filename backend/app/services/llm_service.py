@@ -1,8 +1,12 @@
 import ollama
+import httpx
 import google.generativeai as genai
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from app.core.config import settings
 from app.services.observability_service import ObservabilityService
+from app.services.llm_cache import LLMResponseCache
+from app.utils.loop_local import LoopLocal
+import asyncio
 import json
 import time
 
@@ -20,59 +24,170 @@ class LLMService:
         
         self.ollama_base_url = settings.OLLAMA_BASE_URL
         self.ollama_model = settings.OLLAMA_MODEL
+        self._async_clients = LoopLocal(self._create_async_client)
+        
+        self.cache = None
+        if settings.LLM_CACHE_ENABLED:
+            self.cache = LLMResponseCache(
+                max_entries=settings.LLM_CACHE_SIZE,
+                persist_dir=settings.LLM_CACHE_DIR,
+                ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+                max_disk_entries=settings.LLM_CACHE_MAX_DISK_ENTRIES
+            )
+    
+    def _available(self, provider: Optional[str]) -> bool:
+        return provider == "ollama" or (provider == "gemini" and self.gemini_model is not None)
+    
+    def _resolve_provider(self) -> str:
+        if self._available(self.provider):
+            return self.provider
+        return self.fallback_provider
+    
+    def _model_name(self, provider: str) -> str:
+        return self.ollama_model if provider == "ollama" else "gemini-pro"
+    
+    def cache_key(self, prompt: str, system_prompt: Optional[str], temperature: float) -> str:
+        provider = self._resolve_provider()
+        return LLMResponseCache.key(provider, self._model_name(provider), system_prompt, prompt, temperature)
+    
+    def _lookup(self, prompt: str, system_prompt: Optional[str], temperature: float, trace: Optional[any],
+                use_cache: bool) -> Tuple[Optional[str], Optional[str]]:
+        if self.cache is None:
+            return None, None
+        
+        cache_key = self.cache_key(prompt, system_prompt, temperature)
+        if not use_cache:
+            return cache_key, None
+        
+        cached = self.cache.get(cache_key)
+        self.obs_service.record_cache_lookup("llm_response", cached is not None, trace)
+        return cache_key, cached
+    
+    def _record(self, cache_key: Optional[str], prompt: str, system_prompt: Optional[str], temperature: float,
+                response: str, start_time: float, trace: Optional[any]):
+        latency_ms = (time.time() - start_time) * 1000
+        
+        if trace:
+            self.obs_service.log_llm_call(
+                trace=trace,
+                model=self.provider,
+                prompt=prompt[:500],
+                response=response[:500],
+                metadata={"temperature": temperature, "has_system_prompt": system_prompt is not None},
+                latency_ms=latency_ms
+            )
+        
+        if cache_key is not None and response:
+            provider = self._resolve_provider()
+            self.cache.put(cache_key, response, provider, self._model_name(provider))
+    
+    def _call_provider(self, provider: str, prompt: str, system_prompt: Optional[str], temperature: float) -> str:
+        if provider == "ollama":
+            return self._generate_ollama(prompt, system_prompt, temperature)
+        if provider == "gemini" and self.gemini_model:
+            return self._generate_gemini(prompt, system_prompt, temperature)
+        raise Exception("No LLM provider available")
+    
+    async def _acall_provider(self, provider: str, prompt: str, system_prompt: Optional[str], temperature: float) -> str:
+        if provider == "ollama":
+            return await self._agenerate_ollama(prompt, system_prompt, temperature)
+        if provider == "gemini" and self.gemini_model:
+            return await asyncio.to_thread(self._generate_gemini, prompt, system_prompt, temperature)
+        raise Exception("No LLM provider available")
     
-    def generate(self, prompt: str, system_prompt: Optional[str] = None, temperature: float = 0.3, trace: Optional[any] = None) -> str:
+    def generate(self, prompt: str, system_prompt: Optional[str] = None, temperature: float = 0.3, trace: Optional[any] = None,
+                 use_cache: bool = True) -> str:
         start_time = time.time()
         
+        cache_key, cached = self._lookup(prompt, system_prompt, temperature, trace, use_cache)
+        if cached is not None:
+            return cached
+        
         try:
-            if self.provider == "ollama":
-                response = self._generate_ollama(prompt, system_prompt, temperature)
-            elif self.provider == "gemini" and self.gemini_model:
-                response = self._generate_gemini(prompt, system_prompt, temperature)
-            else:
-                if self.fallback_provider == "ollama":
-                    response = self._generate_ollama(prompt, system_prompt, temperature)
-                elif self.fallback_provider == "gemini" and self.gemini_model:
-                    response = self._generate_gemini(prompt, system_prompt, temperature)
-                else:
-                    raise Exception("No LLM provider available")
-            
-            latency_ms = (time.time() - start_time) * 1000
-            
-            if trace:
-                self.obs_service.log_llm_call(
-                    trace=trace,
-                    model=self.provider,
-                    prompt=prompt[:500],
-                    response=response[:500],
-                    metadata={"temperature": temperature, "has_system_prompt": system_prompt is not None},
-                    latency_ms=latency_ms
-                )
+            response = self._call_provider(self._resolve_provider(), prompt, system_prompt, temperature)
+            self._record(cache_key, prompt, system_prompt, temperature, response, start_time, trace)
+            return response
             
+        except Exception as e:
+            if self.fallback_provider and self.fallback_provider != self.provider and self._available(self.fallback_provider):
+                return self._call_provider(self.fallback_provider, prompt, system_prompt, temperature)
+            raise e
+    
+    async def agenerate(self, prompt: str, system_prompt: Optional[str] = None, temperature: float = 0.3,
+                        trace: Optional[any] = None, use_cache: bool = True) -> str:
+        start_time = time.time()
+        
+        cache_key, cached = await asyncio.to_thread(self._lookup, prompt, system_prompt, temperature, trace, use_cache)
+        if cached is not None:
+            return cached
+        
+        try:
+            response = await self._acall_provider(self._resolve_provider(), prompt, system_prompt, temperature)
+            await asyncio.to_thread(self._record, cache_key, prompt, system_prompt, temperature, response, start_time, trace)
             return response
             
         except Exception as e:
-            if self.fallback_provider and self.fallback_provider != self.provider:
-                if self.fallback_provider == "ollama":
-                    return self._generate_ollama(prompt, system_prompt, temperature)
-                elif self.fallback_provider == "gemini" and self.gemini_model:
-                    return self._generate_gemini(prompt, system_prompt, temperature)
+            if self.fallback_provider and self.fallback_provider != self.provider and self._available(self.fallback_provider):
+                return await self._acall_provider(self.fallback_provider, prompt, system_prompt, temperature)
             raise e
     
-    def _generate_ollama(self, prompt: str, system_prompt: Optional[str], temperature: float) -> str:
+    def _ollama_messages(self, prompt: str, system_prompt: Optional[str]) -> List[Dict]:
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
-        
+        return messages
+    
+    def _generate_ollama(self, prompt: str, system_prompt: Optional[str], temperature: float) -> str:
         response = ollama.chat(
             model=self.ollama_model,
-            messages=messages,
+            messages=self._ollama_messages(prompt, system_prompt),
             options={"temperature": temperature}
         )
         
         return response['message']['content']
     
+    def _create_async_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=self.ollama_base_url,
+            limits=httpx.Limits(
+                max_connections=settings.OLLAMA_POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.OLLAMA_POOL_MAX_KEEPALIVE,
+                keepalive_expiry=settings.OLLAMA_KEEPALIVE_EXPIRY_SECONDS
+            ),
+            timeout=httpx.Timeout(
+                settings.OLLAMA_READ_TIMEOUT_SECONDS,
+                connect=settings.OLLAMA_CONNECT_TIMEOUT_SECONDS,
+                pool=settings.OLLAMA_POOL_TIMEOUT_SECONDS
+            )
+        )
+    
+    def async_client(self) -> httpx.AsyncClient:
+        client = self._async_clients.get()
+        if client.is_closed:
+            self._async_clients.pop()
+            client = self._async_clients.get()
+        return client
+    
+    async def _agenerate_ollama(self, prompt: str, system_prompt: Optional[str], temperature: float) -> str:
+        response = await self.async_client().post(
+            "/api/chat",
+            json={
+                "model": self.ollama_model,
+                "messages": self._ollama_messages(prompt, system_prompt),
+                "stream": False,
+                "options": {"temperature": temperature}
+            }
+        )
+        response.raise_for_status()
+        
+        return response.json()["message"]["content"]
+    
+    async def aclose(self):
+        client = self._async_clients.pop()
+        if client is not None:
+            await client.aclose()
+    
     def _generate_gemini(self, prompt: str, system_prompt: Optional[str], temperature: float) -> str:
         full_prompt = prompt
         if system_prompt:
@@ -85,9 +200,17 @@ class LLMService:
         
         return response.text
     
-    def generate_json(self, prompt: str, system_prompt: Optional[str] = None, trace: Optional[any] = None) -> Dict:
-        response_text = self.generate(prompt, system_prompt, temperature=0.1, trace=trace)
-        
+    def generate_json(self, prompt: str, system_prompt: Optional[str] = None, trace: Optional[any] = None,
+                      use_cache: bool = True) -> Dict:
+        response_text = self.generate(prompt, system_prompt, temperature=0.1, trace=trace, use_cache=use_cache)
+        return self._parse_json(response_text, prompt, system_prompt)
+    
+    async def agenerate_json(self, prompt: str, system_prompt: Optional[str] = None, trace: Optional[any] = None,
+                             use_cache: bool = True) -> Dict:
+        response_text = await self.agenerate(prompt, system_prompt, temperature=0.1, trace=trace, use_cache=use_cache)
+        return await asyncio.to_thread(self._parse_json, response_text, prompt, system_prompt)
+    
+    def _parse_json(self, response_text: str, prompt: str, system_prompt: Optional[str]) -> Dict:
         try:
             json_start = response_text.find('{')
             json_end = response_text.rfind('}') + 1
@@ -98,4 +221,9 @@ class LLMService:
             else:
                 return json.loads(response_text)
         except json.JSONDecodeError:
-            return {"error": "Failed to parse JSON", "raw_response": response_text}
\ No newline at end of file
+            if self.cache is not None:
+                self.cache.delete(self.cache_key(prompt, system_prompt, 0.1))
+            return {"error": "Failed to parse JSON", "raw_response": response_text}
+    
+    def cache_stats(self) -> Dict:
+        return self.cache.stats() if self.cache else {"enabled": False}
\ No newline at end of file
@@ -1,14 +1,29 @@
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from app.services.skill_extractor import SkillExtractor
 from app.services.embedding_service import EmbeddingService
+from app.services.section_chunker import SectionChunker, fingerprint_section, section_lines
+from app.core.config import settings
+import numpy as np
 import re
 from datetime import datetime
 
 class MatchingEngine:
+    FEATURES = ["skills_exact", "semantic_fit", "seniority_fit", "recency"]
+    
     def __init__(self, skill_extractor: SkillExtractor, embedding_service: EmbeddingService):
         self.skill_extractor = skill_extractor
         self.embedding_service = embedding_service
         
+        self.rerank_enabled = settings.SEMANTIC_RERANK_ENABLED
+        self.rerank_top_k = settings.SEMANTIC_RERANK_TOP_K
+        self.rerank_batch_size = settings.SEMANTIC_RERANK_BATCH_SIZE
+        
+        self.chunker = SectionChunker(
+            token_counter=self.embedding_service.count_tokens,
+            max_tokens=settings.CHUNK_MAX_TOKENS,
+            max_chunks_per_document=settings.MAX_CHUNKS_PER_DOCUMENT
+        )
+        
         self.weights = {
             "skills_exact": 0.40,
             "semantic_fit": 0.35,
@@ -30,20 +45,92 @@ class MatchingEngine:
             "executive": 4
         }
     
-    def compute_match_score(self, resume_data: Dict, jd_data: Dict) -> Dict:
-        resume_skills = self.skill_extractor.extract_skills(resume_data["raw_text"])
-        jd_skills = self.skill_extractor.extract_skills(jd_data["raw_text"])
+    @property
+    def section_state_key(self) -> str:
+        return f"{self.embedding_service.cache.model_name}|{self.chunker.config_key}"
+    
+    def prepare_jd(self, jd_data: Dict) -> Dict:
+        return {
+            "skills": self.skill_extractor.extract_skills(jd_data["raw_text"]),
+            "requirement_embeddings": self.embedding_service.embed_texts(jd_data["requirements"]),
+            "seniority": self._detect_seniority(jd_data["raw_text"])
+        }
+    
+    def build_section_state(self, sections: List[Dict], previous: Optional[Dict] = None) -> Tuple[Dict, Dict]:
+        previous = previous or {}
+        state = {}
+        pending = []
+        reused = 0
+        for section in sections:
+            fingerprint = fingerprint_section(section)
+            if fingerprint in state:
+                continue
+            if fingerprint in previous:
+                state[fingerprint] = previous[fingerprint]
+                reused += 1
+            else:
+                state[fingerprint] = None
+                pending.append((fingerprint, section))
+        
+        if pending:
+            all_skills = self.skill_extractor.extract_skills_many([
+                "\n".join(section_lines(section)) for _, section in pending
+            ])
+            chunk_lists = [self.chunker.split_section(section) for _, section in pending]
+            embeddings = self.embedding_service.embed_texts([chunk for chunks in chunk_lists for chunk in chunks])
+            
+            offset = 0
+            for (fingerprint, _), skills, chunks in zip(pending, all_skills, chunk_lists):
+                state[fingerprint] = {
+                    "skills": skills["all"],
+                    "chunks": chunks,
+                    "embeddings": embeddings[offset:offset + len(chunks)]
+                }
+                offset += len(chunks)
+        
+        return state, {"reused": reused, "recomputed": len(pending)}
+    
+    def section_skills(self, sections: List[Dict], section_state: Dict) -> Dict:
+        detected = {}
+        for section in sections:
+            for skill in section_state[fingerprint_section(section)]["skills"]:
+                detected.setdefault(skill["id"], skill)
+        
+        skills = list(detected.values())
+        return {
+            "technical": [s for s in skills if s["type"] == "technical"],
+            "soft": [s for s in skills if s["type"] == "soft"],
+            "all": skills
+        }
+    
+    def compute_match_score(self, resume_data: Dict, jd_data: Dict, prepared_jd: Optional[Dict] = None,
+                            resume_skills: Optional[Dict] = None, section_state: Optional[Dict] = None) -> Dict:
+        if section_state is not None and resume_skills is None:
+            resume_skills = self.section_skills(resume_data["sections"], section_state)
+        
+        if prepared_jd is None and resume_skills is None:
+            resume_skills, jd_skills = self.skill_extractor.extract_skills_many([
+                resume_data["raw_text"],
+                jd_data["raw_text"]
+            ])
+        else:
+            jd_skills = prepared_jd["skills"] if prepared_jd else self.skill_extractor.extract_skills(jd_data["raw_text"])
+            if resume_skills is None:
+                resume_skills = self.skill_extractor.extract_skills(resume_data["raw_text"])
         
         skills_exact_score = self._compute_skills_exact(resume_skills["all"], jd_skills["all"])
         
         semantic_fit_score, semantic_evidence = self._compute_semantic_fit(
             resume_data["sections"], 
-            jd_data["requirements"]
+            jd_data["requirements"],
+            prepared_jd["requirement_embeddings"] if prepared_jd else None,
+            section_state
         )
         
         seniority_fit_score = self._compute_seniority_fit(
             resume_data["raw_text"], 
-            jd_data["raw_text"]
+            jd_data["raw_text"],
+            prepared_jd["seniority"] if prepared_jd else None
         )
         
         recency_score = self._compute_recency_score(resume_data["raw_text"])
@@ -69,6 +156,12 @@ class MatchingEngine:
                 "recency": round(recency_score, 2),
                 "contradiction_penalty": 0.0
             },
+            "features": {
+                "skills_exact": skills_exact_score,
+                "semantic_fit": semantic_fit_score,
+                "seniority_fit": seniority_fit_score,
+                "recency": recency_score
+            },
             "skill_overlap": skill_overlap,
             "semantic_evidence": semantic_evidence,
             "resume_skills": resume_skills,
@@ -87,7 +180,9 @@ class MatchingEngine:
         
         return matched / total if total > 0 else 0.0
     
-    def _compute_semantic_fit(self, resume_sections: List[Dict], jd_requirements: List[str]) -> Tuple[float, List[Dict]]:
+    def _compute_semantic_fit(self, resume_sections: List[Dict], jd_requirements: List[str],
+                              requirement_embeddings: Optional[np.ndarray] = None,
+                              section_state: Optional[Dict] = None) -> Tuple[float, List[Dict]]:
         if not jd_requirements:
             return 1.0, []
         
@@ -95,51 +190,96 @@ class MatchingEngine:
         total_similarity = 0.0
         matched_count = 0
         
-        resume_texts = []
-        for section in resume_sections:
-            content = section.get("content", [])
-            if isinstance(content, list):
-                resume_texts.extend(content)
-            else:
-                resume_texts.append(content)
+        if section_state is None:
+            chunks = self.chunker.chunk_sections(resume_sections)
+        else:
+            states = [section_state[fingerprint_section(section)] for section in resume_sections]
+            chunks = self.chunker.select_chunks(resume_sections, [state["chunks"] for state in states])
+        
+        if not chunks:
+            return 0.0, evidence
+        
+        chunk_texts = [chunk["text"] for chunk in chunks]
+        docs = chunk_texts
+        if section_state is not None:
+            docs = np.stack([states[chunk["section_index"]]["embeddings"][chunk["chunk_index"]] for chunk in chunks])
+        queries = jd_requirements if requirement_embeddings is None else requirement_embeddings
+        similarity_matrix = self.embedding_service.similarity_matrix(queries, docs)
+        section_scores = self._pool_section_scores(similarity_matrix, chunks)
+        best_indices = similarity_matrix.argmax(axis=1)
+        
+        evidence_indices = best_indices
+        rerank_scores = None
+        if self.rerank_enabled:
+            evidence_indices, rerank_scores = self._rerank_evidence(jd_requirements, chunk_texts, similarity_matrix)
         
         for req_idx, requirement in enumerate(jd_requirements):
-            best_match = {"similarity": 0.0, "text": "", "section": ""}
+            best_idx = int(best_indices[req_idx])
+            best_similarity = float(similarity_matrix[req_idx, best_idx])
             
-            for section in resume_sections:
-                content = section.get("content", [])
-                section_text = " ".join(content) if isinstance(content, list) else content
-                
-                if not section_text.strip():
-                    continue
-                
-                similarity = self.embedding_service.compute_similarity(requirement, section_text)
-                
-                if similarity > best_match["similarity"]:
-                    best_match = {
-                        "similarity": similarity,
-                        "text": section_text[:200],
-                        "section": section.get("title", "unknown")
-                    }
+            if best_similarity <= 0.0:
+                continue
             
-            if best_match["similarity"] > 0.5:
+            if best_similarity > 0.5:
                 matched_count += 1
-                evidence.append({
+                evidence_idx = int(evidence_indices[req_idx])
+                item = {
                     "requirement": requirement,
-                    "matched_section": best_match["section"],
-                    "matched_text": best_match["text"],
-                    "similarity": round(best_match["similarity"], 3)
-                })
+                    "matched_section": chunks[evidence_idx]["title"],
+                    "matched_text": chunk_texts[evidence_idx],
+                    "similarity": round(float(similarity_matrix[req_idx, evidence_idx]), 3),
+                    "section_scores": section_scores[req_idx]
+                }
+                if rerank_scores is not None:
+                    item["rerank_score"] = round(float(rerank_scores[req_idx]), 3)
+                evidence.append(item)
             
-            total_similarity += best_match["similarity"]
+            total_similarity += best_similarity
         
         avg_similarity = total_similarity / len(jd_requirements) if jd_requirements else 0.0
         
         return avg_similarity, evidence
     
-    def _compute_seniority_fit(self, resume_text: str, jd_text: str) -> float:
+    def _pool_section_scores(self, similarity_matrix, chunks: List[Dict]) -> List[List[Dict]]:
+        section_columns = {}
+        for col, chunk in enumerate(chunks):
+            section_columns.setdefault(chunk["section_index"], []).append(col)
+        
+        section_indices = list(section_columns.keys())
+        titles = {chunk["section_index"]: chunk["title"] for chunk in chunks}
+        pooled = np.stack(
+            [similarity_matrix[:, section_columns[idx]].max(axis=1) for idx in section_indices],
+            axis=1
+        )
+        
+        results = []
+        for row in pooled:
+            order = np.argsort(-row, kind="stable")
+            results.append([
+                {"section": titles[section_indices[i]], "similarity": round(float(row[i]), 3)}
+                for i in order
+            ])
+        return results
+    
+    def _rerank_evidence(self, jd_requirements: List[str], candidate_texts: List[str], similarity_matrix) -> Tuple[List[int], List[float]]:
+        shortlist, _ = self.embedding_service.top_k_from_scores(similarity_matrix, self.rerank_top_k)
+        
+        pairs = []
+        for req_idx, requirement in enumerate(jd_requirements):
+            for cand_idx in shortlist[req_idx]:
+                pairs.append([requirement, candidate_texts[cand_idx]])
+        
+        scores = self.embedding_service.rerank_pairs(pairs, batch_size=self.rerank_batch_size)
+        scores = scores.reshape(shortlist.shape)
+        
+        best = scores.argmax(axis=1)
+        chosen = [int(shortlist[i, best[i]]) for i in range(len(jd_requirements))]
+        chosen_scores = [float(scores[i, best[i]]) for i in range(len(jd_requirements))]
+        return chosen, chosen_scores
+    
+    def _compute_seniority_fit(self, resume_text: str, jd_text: str, jd_seniority: Optional[str] = None) -> float:
         resume_seniority = self._detect_seniority(resume_text)
-        jd_seniority = self._detect_seniority(jd_text)
+        jd_seniority = jd_seniority or self._detect_seniority(jd_text)
         
         resume_level = self.seniority_scores.get(resume_seniority, 2)
         jd_level = self.seniority_scores.get(jd_seniority, 2)
@@ -206,4 +346,21 @@ class MatchingEngine:
         if abs(total - 1.0) > 0.01:
             raise ValueError("Weights must sum to 1.0")
         
-        self.weights.update(new_weights)
\ No newline at end of file
+        self.weights.update(new_weights)
+    
+    def weight_vector(self, weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+        unknown = set(weights or {}) - set(self.FEATURES)
+        if unknown:
+            raise ValueError(f"Unknown weight components: {sorted(unknown)}")
+        
+        merged = {**self.weights, **(weights or {})}
+        if abs(sum(merged.values()) - 1.0) > 0.01:
+            raise ValueError("Weights must sum to 1.0")
+        return np.array([merged[name] for name in self.FEATURES], dtype=np.float64)
+    
+    def feature_vector(self, features: Dict[str, float]) -> np.ndarray:
+        return np.array([features[name] for name in self.FEATURES], dtype=np.float64)
+    
+    def rescore(self, feature_matrix: np.ndarray, weight_sets: List[Dict[str, float]]) -> np.ndarray:
+        weight_matrix = np.stack([self.weight_vector(weights) for weights in weight_sets])
+        return np.round(100 * np.atleast_2d(feature_matrix) @ weight_matrix.T, 2)
\ No newline at end of file
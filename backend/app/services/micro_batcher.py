@@ -0,0 +1,123 @@
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List
+import queue
+import threading
+import time
+
+class _Pending:
+    __slots__ = ("item", "future", "enqueued_at")
+    
+    def __init__(self, item: Any):
+        self.item = item
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+class MicroBatcher:
+    def __init__(self, name: str, process_fn: Callable[[List[Any]], List[Any]],
+                 max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        self.name = name
+        self.process_fn = process_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        
+        self.batches = 0
+        self.items = 0
+        self.total_queue_delay_ms = 0.0
+        self.max_queue_delay_ms = 0.0
+        self.total_process_ms = 0.0
+        
+        self._worker = threading.Thread(target=self._run, name=f"micro-batcher-{name}", daemon=True)
+        self._worker.start()
+    
+    def submit(self, item: Any) -> Future:
+        if self._closed:
+            raise RuntimeError(f"MicroBatcher '{self.name}' is closed")
+        pending = _Pending(item)
+        self._queue.put(pending)
+        return pending.future
+    
+    def map(self, items: List[Any], timeout: float = None) -> List[Any]:
+        futures = [self.submit(item) for item in items]
+        return [future.result(timeout=timeout) for future in futures]
+    
+    def _collect(self, first: _Pending) -> List[_Pending]:
+        batch = [first]
+        deadline = first.enqueued_at + self.max_wait
+        
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except queue.Empty:
+                pass
+            
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        
+        return batch
+    
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            
+            batch = self._collect(first)
+            stop = None in batch
+            batch = [p for p in batch if p is not None]
+            
+            started = time.perf_counter()
+            try:
+                results = self.process_fn([p.item for p in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(f"{self.name}: expected {len(batch)} results, got {len(results)}")
+                for pending, result in zip(batch, results):
+                    pending.future.set_result(result)
+            except Exception as e:
+                for pending in batch:
+                    if not pending.future.done():
+                        pending.future.set_exception(e)
+            finished = time.perf_counter()
+            
+            with self._lock:
+                self.batches += 1
+                self.items += len(batch)
+                self.total_process_ms += (finished - started) * 1000
+                for pending in batch:
+                    delay_ms = (started - pending.enqueued_at) * 1000
+                    self.total_queue_delay_ms += delay_ms
+                    self.max_queue_delay_ms = max(self.max_queue_delay_ms, delay_ms)
+            
+            if stop:
+                return
+    
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._worker.join(timeout=5)
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "name": self.name,
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+                "batches": self.batches,
+                "items": self.items,
+                "avg_batch_size": self.items / self.batches if self.batches else 0.0,
+                "fill_ratio": self.items / (self.batches * self.max_batch_size) if self.batches else 0.0,
+                "avg_queue_delay_ms": self.total_queue_delay_ms / self.items if self.items else 0.0,
+                "max_queue_delay_ms": self.max_queue_delay_ms,
+                "avg_batch_ms": self.total_process_ms / self.batches if self.batches else 0.0
+            }
\ No newline at end of file
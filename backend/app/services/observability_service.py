@@ -1,6 +1,7 @@
 from langfuse import Langfuse
 from app.core.config import settings
 import logging
+import threading
 import time
 from typing import Dict, Optional, Any
 from functools import wraps
@@ -9,6 +10,9 @@ import traceback
 logger = logging.getLogger(__name__)
 
 class ObservabilityService:
+    _cache_counters = {}
+    _counter_lock = threading.Lock()
+    
     def __init__(self):
         self.enabled = settings.USE_LANGFUSE
         
@@ -72,6 +76,29 @@ class ObservabilityService:
         except Exception as e:
             logger.error(f"Failed to log embedding call: {e}")
     
+    def record_cache_lookup(self, cache: str, hit: bool, trace: Any = None):
+        with self._counter_lock:
+            counters = self._cache_counters.setdefault(cache, {"hits": 0, "misses": 0})
+            counters["hits" if hit else "misses"] += 1
+        
+        if trace is None or not self.enabled or not self.langfuse:
+            return
+        
+        try:
+            trace.event(name=f"{cache}_cache_{'hit' if hit else 'miss'}")
+        except Exception as e:
+            logger.error(f"Failed to log cache lookup: {e}")
+    
+    def cache_counters(self) -> Dict:
+        with self._counter_lock:
+            return {
+                cache: {
+                    **counters,
+                    "hit_rate": counters["hits"] / (counters["hits"] + counters["misses"])
+                }
+                for cache, counters in self._cache_counters.items()
+            }
+    
     def log_error(self, trace: Any, error: Exception, context: Optional[Dict] = None):
         if not self.enabled or not self.langfuse:
             return
@@ -0,0 +1,180 @@
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+from app.core.config import settings
+import json
+import numpy as np
+
+EMBEDDING_TASK = "embedding"
+SEQUENCE_CLASSIFICATION_TASK = "sequence-classification"
+
+MODEL_FILE = "model.onnx"
+QUANTIZED_MODEL_FILE = "model.int8.onnx"
+
+def model_dir_for(model_name: str, base_dir: Optional[str] = None) -> Path:
+    return Path(base_dir or settings.ONNX_MODEL_DIR) / model_name.replace("/", "__")
+
+def export_model(model_name: str, task: str, output_dir: Optional[Union[str, Path]] = None, quantize: bool = True) -> Path:
+    import torch
+    from transformers import AutoTokenizer, AutoModel, AutoModelForSequenceClassification
+    
+    output_dir = Path(output_dir) if output_dir else model_dir_for(model_name)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    if task == EMBEDDING_TASK:
+        model = AutoModel.from_pretrained(model_name)
+        output_names = ["last_hidden_state"]
+    else:
+        model = AutoModelForSequenceClassification.from_pretrained(model_name)
+        output_names = ["logits"]
+    model.eval()
+    
+    sample = tokenizer(["export sample", "second export sample"], padding=True, return_tensors="pt")
+    input_names = [name for name in ["input_ids", "attention_mask", "token_type_ids"] if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes[output_names[0]] = {0: "batch"} if task != EMBEDDING_TASK else {0: "batch", 1: "sequence"}
+    
+    model_path = output_dir / MODEL_FILE
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in input_names),
+            str(model_path),
+            input_names=input_names,
+            output_names=output_names,
+            dynamic_axes=dynamic_axes,
+            opset_version=14
+        )
+    
+    tokenizer.save_pretrained(str(output_dir))
+    model.config.save_pretrained(str(output_dir))
+    with open(output_dir / "onnx_export.json", "w", encoding="utf-8") as f:
+        json.dump({"model_name": model_name, "task": task, "inputs": input_names}, f)
+    
+    if quantize:
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        quantize_dynamic(str(model_path), str(output_dir / QUANTIZED_MODEL_FILE), weight_type=QuantType.QInt8)
+    
+    return output_dir
+
+def _ensure_exported(model_name: str, task: str, quantized: bool) -> Path:
+    model_dir = model_dir_for(model_name)
+    model_file = QUANTIZED_MODEL_FILE if quantized else MODEL_FILE
+    if not (model_dir / model_file).exists():
+        export_model(model_name, task, model_dir, quantize=quantized)
+    return model_dir
+
+class OnnxModel:
+    def __init__(self, model_dir: Union[str, Path], quantized: bool = True, max_length: int = 512):
+        import onnxruntime as ort
+        from transformers import AutoConfig, AutoTokenizer
+        
+        self.model_dir = Path(model_dir)
+        self.tokenizer = AutoTokenizer.from_pretrained(str(self.model_dir))
+        self.config = AutoConfig.from_pretrained(str(self.model_dir))
+        self.max_length = min(max_length, getattr(self.tokenizer, "model_max_length", max_length))
+        
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if settings.ONNX_NUM_THREADS:
+            options.intra_op_num_threads = settings.ONNX_NUM_THREADS
+        
+        model_file = QUANTIZED_MODEL_FILE if quantized else MODEL_FILE
+        self.session = ort.InferenceSession(
+            str(self.model_dir / model_file),
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+        self.input_names = [i.name for i in self.session.get_inputs()]
+    
+    def _run(self, texts, text_pairs=None) -> Dict[str, np.ndarray]:
+        encoded = self.tokenizer(
+            texts,
+            text_pairs,
+            padding=True,
+            truncation=True,
+            max_length=self.max_length,
+            return_tensors="np"
+        )
+        feeds = {name: encoded[name].astype(np.int64) for name in self.input_names if name in encoded}
+        outputs = self.session.run(None, feeds)
+        return {"outputs": outputs[0], "attention_mask": encoded["attention_mask"]}
+
+class OnnxSentenceEncoder(OnnxModel):
+    def __init__(self, model_dir: Union[str, Path], quantized: bool = True, max_length: int = 256, normalize: bool = True):
+        super().__init__(model_dir, quantized, max_length)
+        self.normalize = normalize
+    
+    @classmethod
+    def from_pretrained(cls, model_name: str, quantized: bool = True) -> "OnnxSentenceEncoder":
+        name = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+        return cls(_ensure_exported(name, EMBEDDING_TASK, quantized), quantized)
+    
+    def encode(self, texts: List[str], convert_to_numpy: bool = True, batch_size: int = 32, **kwargs) -> np.ndarray:
+        if isinstance(texts, str):
+            texts = [texts]
+        
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            result = self._run(texts[start:start + batch_size])
+            token_embeddings = result["outputs"]
+            mask = result["attention_mask"][..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            if self.normalize:
+                pooled = pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            batches.append(pooled.astype(np.float32))
+        
+        if not batches:
+            return np.zeros((0, self.config.hidden_size), dtype=np.float32)
+        return np.vstack(batches)
+    
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.config.hidden_size
+
+class OnnxCrossEncoder(OnnxModel):
+    def __init__(self, model_dir: Union[str, Path], quantized: bool = True, max_length: int = 512):
+        super().__init__(model_dir, quantized, max_length)
+        self.apply_sigmoid = self._uses_sigmoid(self.config)
+    
+    @classmethod
+    def from_pretrained(cls, model_name: str, quantized: bool = True) -> "OnnxCrossEncoder":
+        return cls(_ensure_exported(model_name, SEQUENCE_CLASSIFICATION_TASK, quantized), quantized)
+    
+    @staticmethod
+    def _uses_sigmoid(config) -> bool:
+        activation = getattr(config, "sbert_ce_default_activation_function", None)
+        activation = (getattr(config, "sentence_transformers", None) or {}).get("activation_fn", activation)
+        if activation is None:
+            return config.num_labels == 1
+        return activation.endswith("Sigmoid")
+    
+    def predict(self, pairs: List[List[str]], batch_size: int = 32, **kwargs) -> np.ndarray:
+        scores = []
+        for start in range(0, len(pairs), batch_size):
+            batch = pairs[start:start + batch_size]
+            logits = self._run([p[0] for p in batch], [p[1] for p in batch])["outputs"]
+            if logits.shape[1] == 1:
+                logits = logits[:, 0]
+            if self.apply_sigmoid:
+                logits = 1.0 / (1.0 + np.exp(-logits))
+            scores.append(logits)
+        if not scores:
+            return np.zeros((0,), dtype=np.float32)
+        return np.concatenate(scores).astype(np.float32)
+
+class OnnxTextClassifier(OnnxModel):
+    @classmethod
+    def from_pretrained(cls, model_name: str, quantized: bool = True) -> "OnnxTextClassifier":
+        return cls(_ensure_exported(model_name, SEQUENCE_CLASSIFICATION_TASK, quantized), quantized)
+    
+    def __call__(self, inputs: Union[str, List[str]], batch_size: int = 16, **kwargs) -> List[Dict]:
+        texts = [inputs] if isinstance(inputs, str) else list(inputs)
+        results = []
+        for start in range(0, len(texts), batch_size):
+            logits = self._run(texts[start:start + batch_size])["outputs"]
+            exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+            probs = exp / exp.sum(axis=1, keepdims=True)
+            for row in probs:
+                label_id = int(row.argmax())
+                results.append({"label": self.config.id2label[label_id], "score": float(row[label_id])})
+        return results
\ No newline at end of file
@@ -1,37 +1,330 @@
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple
 from app.services.llm_service import LLMService
 from app.services.contradiction_checker import ContradictionChecker
+from app.services.suggestion_cache import SemanticSuggestionCache
+from app.core.config import settings
+from app.utils.logger import get_logger
+from app.utils.loop_local import LoopLocal
+import asyncio
 import json
+import time
+import numpy as np
+
+logger = get_logger(__name__)
 
 class RewriteAgent:
-    def __init__(self, llm_service: LLMService, contradiction_checker: ContradictionChecker):
+    def __init__(self, llm_service: LLMService, contradiction_checker: ContradictionChecker,
+                 max_concurrency: Optional[int] = None, deadline_seconds: Optional[float] = None,
+                 mode: Optional[str] = None, embedding_service=None):
         self.llm = llm_service
         self.contradiction_checker = contradiction_checker
+        self.max_concurrency = settings.LLM_MAX_CONCURRENCY if max_concurrency is None else max_concurrency
+        self.deadline_seconds = settings.SUGGESTION_DEADLINE_SECONDS if deadline_seconds is None else deadline_seconds
+        self.mode = mode or settings.SUGGESTION_MODE
+        
+        self.semantic_cache = None
+        if embedding_service is not None and settings.SEMANTIC_CACHE_ENABLED:
+            self.semantic_cache = SemanticSuggestionCache(embedding_service)
+        
+        self.executor = None
+        if self.max_concurrency > 1:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="llm")
+        self._semaphores = LoopLocal(lambda: asyncio.Semaphore(max(self.max_concurrency, 1)))
+    
+    def generate_suggestions(self, resume_data: Dict, jd_data: Dict, match_results: Dict,
+                             deadline_seconds: Optional[float] = None) -> List[Dict]:
+        resume_facts = self._extract_resume_facts(resume_data)
+        items = self._plan_items(match_results)
+        expires_at = self._expires_at(deadline_seconds)
+        
+        resolved, embeddings = self._lookup_cached(items, resume_facts, jd_data, resume_data)
+        
+        remaining = [index for index in range(len(items)) if index not in resolved]
+        if self.mode == "batched" and len(remaining) > 1:
+            batch_items = [items[index] for index in remaining]
+            batched = self._run_tasks([(self._suggest_batched, (batch_items, resume_facts, jd_data))], expires_at)[0]
+            self._merge_batched(resolved, remaining, batched or {})
+        
+        pending = [index for index in range(len(items)) if index not in resolved]
+        results = self._run_tasks(
+            [(self._suggest_item, (items[index], resume_facts, jd_data)) for index in pending],
+            expires_at
+        )
+        resolved.update(zip(pending, results))
+        
+        return self._finish(items, resolved, embeddings, resume_facts)
     
-    def generate_suggestions(self, resume_data: Dict, jd_data: Dict, match_results: Dict) -> List[Dict]:
+    async def agenerate_suggestions(self, resume_data: Dict, jd_data: Dict, match_results: Dict,
+                                    deadline_seconds: Optional[float] = None) -> List[Dict]:
         resume_facts = self._extract_resume_facts(resume_data)
+        items = self._plan_items(match_results)
+        expires_at = self._expires_at(deadline_seconds)
+        
+        resolved, embeddings = await asyncio.to_thread(self._lookup_cached, items, resume_facts, jd_data, resume_data)
+        
+        remaining = [index for index in range(len(items)) if index not in resolved]
+        if self.mode == "batched" and len(remaining) > 1:
+            batch_items = [items[index] for index in remaining]
+            batched = (await self._arun_tasks([(self._asuggest_batched, (batch_items, resume_facts, jd_data))], expires_at))[0]
+            self._merge_batched(resolved, remaining, batched or {})
+        
+        pending = [index for index in range(len(items)) if index not in resolved]
+        results = await self._arun_tasks(
+            [(self._asuggest_item, (items[index], resume_facts, jd_data)) for index in pending],
+            expires_at
+        )
+        resolved.update(zip(pending, results))
+        
+        return await asyncio.to_thread(self._finish, items, resolved, embeddings, resume_facts)
+    
+    def _plan_items(self, match_results: Dict) -> List[Tuple[str, Dict]]:
         missing_skills = match_results["skill_overlap"]["missing"]
         semantic_evidence = match_results.get("semantic_evidence", [])
         
-        suggestions = []
+        items = []
         
         for skill in missing_skills[:5]:
-            suggestion = self._suggest_skill_addition(skill, resume_facts, jd_data)
-            if suggestion:
-                suggestions.append(suggestion)
+            items.append(("skill_addition", skill))
         
         for evidence in semantic_evidence[:3]:
             if evidence["similarity"] < 0.7:
-                suggestion = self._suggest_content_improvement(evidence, resume_facts, jd_data)
-                if suggestion:
-                    suggestions.append(suggestion)
+                items.append(("content_improvement", evidence))
+        
+        return items
+    
+    def _expires_at(self, deadline_seconds: Optional[float]) -> Optional[float]:
+        deadline = self.deadline_seconds if deadline_seconds is None else deadline_seconds
+        return time.monotonic() + deadline if deadline else None
+    
+    def _lookup_cached(self, items: List[Tuple[str, Dict]], resume_facts: List[str], jd_data: Dict,
+                       resume_data: Dict) -> Tuple[Dict[int, Optional[Dict]], Optional[np.ndarray]]:
+        if self.semantic_cache is None or not items:
+            return {}, None
+        
+        resolved, embeddings = self.semantic_cache.lookup(items, resume_facts, jd_data, self._resume_text(resume_data))
+        if resolved:
+            remaining = len(items) - len(resolved)
+            self.semantic_cache.record_saved_calls(self._planned_calls(len(items)) - self._planned_calls(remaining))
+        return resolved, embeddings
+    
+    def _merge_batched(self, resolved: Dict[int, Optional[Dict]], remaining: List[int], batched: Dict[int, Optional[Dict]]):
+        resolved.update({remaining[position]: suggestion for position, suggestion in batched.items()})
+        if len(batched) < len(remaining):
+            logger.info(f"Batched suggestions resolved {len(batched)}/{len(remaining)} items, falling back per item")
+    
+    def _finish(self, items: List[Tuple[str, Dict]], resolved: Dict[int, Optional[Dict]],
+                embeddings: Optional[np.ndarray], resume_facts: List[str]) -> List[Dict]:
+        suggestions = [resolved[index] for index in range(len(items)) if resolved[index]]
+        
+        validated = self._validate_suggestions(suggestions, resume_facts)
         
-        validated_suggestions = []
-        for suggestion in suggestions:
-            if self._validate_suggestion(suggestion, resume_facts):
-                validated_suggestions.append(suggestion)
+        if self.semantic_cache is not None and items:
+            validated_ids = {id(suggestion) for suggestion in validated}
+            self.semantic_cache.store(items, embeddings, {
+                index: suggestion for index, suggestion in resolved.items()
+                if suggestion and id(suggestion) in validated_ids and not suggestion.get("cached")
+            })
         
-        return validated_suggestions
+        return validated
+    
+    def semantic_cache_stats(self) -> Dict:
+        return self.semantic_cache.stats() if self.semantic_cache else {"enabled": False}
+    
+    def _planned_calls(self, item_count: int) -> int:
+        if self.mode == "batched" and item_count > 1:
+            return 1
+        return item_count
+    
+    def _run_tasks(self, tasks: List[Tuple[Callable, tuple]], expires_at: Optional[float]) -> List:
+        if not tasks:
+            return []
+        if expires_at is not None and time.monotonic() >= expires_at:
+            logger.warning(f"Suggestion deadline hit before {len(tasks)} LLM calls started")
+            return [None] * len(tasks)
+        
+        if self.executor is None:
+            results = []
+            for fn, args in tasks:
+                if expires_at is not None and time.monotonic() >= expires_at:
+                    logger.warning(f"Suggestion deadline hit after {len(results)}/{len(tasks)} LLM calls")
+                    break
+                results.append(fn(*args))
+            return results + [None] * (len(tasks) - len(results))
+        
+        futures = [self.executor.submit(fn, *args) for fn, args in tasks]
+        timeout = None if expires_at is None else max(0.0, expires_at - time.monotonic())
+        done, pending = wait(futures, timeout=timeout)
+        
+        if pending:
+            for future in pending:
+                future.cancel()
+            logger.warning(f"Suggestion deadline hit with {len(pending)}/{len(tasks)} LLM calls outstanding")
+        
+        return [future.result() if future in done and future.exception() is None else None for future in futures]
+    
+    async def _arun_tasks(self, tasks: List[Tuple[Callable, tuple]], expires_at: Optional[float]) -> List:
+        if not tasks:
+            return []
+        if expires_at is not None and time.monotonic() >= expires_at:
+            logger.warning(f"Suggestion deadline hit before {len(tasks)} LLM calls started")
+            return [None] * len(tasks)
+        
+        semaphore = self._semaphores.get()
+        
+        async def bounded(fn, args):
+            async with semaphore:
+                return await fn(*args)
+        
+        futures = [asyncio.ensure_future(bounded(fn, args)) for fn, args in tasks]
+        timeout = None if expires_at is None else max(0.0, expires_at - time.monotonic())
+        done, pending = await asyncio.wait(futures, timeout=timeout)
+        
+        if pending:
+            for future in pending:
+                future.cancel()
+            logger.warning(f"Suggestion deadline hit with {len(pending)}/{len(tasks)} LLM calls outstanding")
+        
+        return [
+            future.result() if future in done and not future.cancelled() and future.exception() is None else None
+            for future in futures
+        ]
+    
+    def _item_prompt(self, item: Tuple[str, Dict], resume_facts: List[str], jd_data: Dict) -> Tuple[str, str]:
+        suggestion_type, payload = item
+        if suggestion_type == "skill_addition":
+            return self._skill_addition_prompt(payload, resume_facts, jd_data)
+        return self._content_improvement_prompt(payload, resume_facts, jd_data)
+    
+    def _parse_item(self, item: Tuple[str, Dict], response: Dict) -> Optional[Dict]:
+        suggestion_type, payload = item
+        return self._build_suggestion(response, suggestion_type, payload["id"] if suggestion_type == "skill_addition" else None)
+    
+    def _suggest_item(self, item: Tuple[str, Dict], resume_facts: List[str], jd_data: Dict) -> Optional[Dict]:
+        try:
+            return self._parse_item(item, self.llm.generate_json(*self._item_prompt(item, resume_facts, jd_data)))
+        except Exception:
+            return None
+    
+    async def _asuggest_item(self, item: Tuple[str, Dict], resume_facts: List[str], jd_data: Dict) -> Optional[Dict]:
+        try:
+            return self._parse_item(item, await self.llm.agenerate_json(*self._item_prompt(item, resume_facts, jd_data)))
+        except Exception:
+            return None
+    
+    def _build_suggestion(self, response: Dict, suggestion_type: str, skill_id: Optional[str] = None) -> Optional[Dict]:
+        if not isinstance(response, dict) or not response.get("before") or not response.get("after"):
+            return None
+        
+        suggestion = {
+            "before": response["before"],
+            "after": response["after"],
+            "reasoning": response.get("reasoning", ""),
+            "confidence": response.get("confidence", 0.5),
+            "grounded_by": [0],
+            "type": suggestion_type
+        }
+        if skill_id is not None:
+            suggestion["skill_id"] = skill_id
+        return suggestion
+    
+    def _batched_prompt(self, items: List[Tuple[str, Dict]], resume_facts: List[str], jd_data: Dict) -> Tuple[str, str]:
+        system_prompt = """You are a resume improvement assistant. Produce one suggestion per task based ONLY on existing resume content.
+Rules:
+1. Only rephrase existing content, never add new facts, achievements or experiences
+2. For skill_addition tasks, rephrase ONE existing resume fact to highlight the skill, or skip if impossible
+3. For content_improvement tasks, improve the given resume content to better match the requirement while staying factual
+4. Answer every task id exactly once
+5. Output valid JSON only"""
+        
+        tasks = []
+        for index, (suggestion_type, payload) in enumerate(items):
+            if suggestion_type == "skill_addition":
+                tasks.append({"id": index, "task": suggestion_type, "missing_skill": payload["name"]})
+            else:
+                tasks.append({
+                    "id": index,
+                    "task": suggestion_type,
+                    "resume_content": payload.get("matched_text", ""),
+                    "requirement": payload.get("requirement", ""),
+                    "current_similarity": payload.get("similarity", 0)
+                })
+        
+        user_prompt = f"""Resume Facts:
+{json.dumps(resume_facts[:10], indent=2)}
+
+Job Requirement Context: {jd_data['raw_text'][:500]}
+
+Tasks:
+{json.dumps(tasks, indent=2)}
+
+Output JSON format:
+{{
+  "suggestions": [
+    {{
+      "id": 0,
+      "before": "original resume text",
+      "after": "improved text",
+      "reasoning": "why this change helps",
+      "confidence": 0.0-1.0
+    }},
+    {{"id": 1, "skip": true}}
+  ]
+}}"""
+        
+        return user_prompt, system_prompt
+    
+    def _suggest_batched(self, items: List[Tuple[str, Dict]], resume_facts: List[str], jd_data: Dict) -> Dict[int, Optional[Dict]]:
+        try:
+            response = self.llm.generate_json(*self._batched_prompt(items, resume_facts, jd_data))
+        except Exception as e:
+            logger.warning(f"Batched suggestion call failed: {e}")
+            return {}
+        return self._parse_batched(items, response)
+    
+    async def _asuggest_batched(self, items: List[Tuple[str, Dict]], resume_facts: List[str], jd_data: Dict) -> Dict[int, Optional[Dict]]:
+        try:
+            response = await self.llm.agenerate_json(*self._batched_prompt(items, resume_facts, jd_data))
+        except Exception as e:
+            logger.warning(f"Batched suggestion call failed: {e}")
+            return {}
+        return self._parse_batched(items, response)
+    
+    def _parse_batched(self, items: List[Tuple[str, Dict]], response: Dict) -> Dict[int, Optional[Dict]]:
+        entries = response.get("suggestions") if isinstance(response, dict) else None
+        if not isinstance(entries, list):
+            return {}
+        
+        by_id = {}
+        for entry in entries:
+            if isinstance(entry, dict) and isinstance(entry.get("id"), int):
+                by_id.setdefault(entry["id"], entry)
+        
+        resolved = {}
+        for index, (suggestion_type, payload) in enumerate(items):
+            entry = by_id.get(index)
+            if entry is None:
+                continue
+            if entry.get("skip"):
+                resolved[index] = None
+                continue
+            
+            suggestion = self._build_suggestion(
+                entry,
+                suggestion_type,
+                payload["id"] if suggestion_type == "skill_addition" else None
+            )
+            if suggestion is not None:
+                resolved[index] = suggestion
+        
+        return resolved
+    
+    def _resume_text(self, resume_data: Dict) -> str:
+        lines = []
+        for section in resume_data.get("sections", []):
+            content = section.get("content", [])
+            lines.extend(content if isinstance(content, list) else [content])
+        return "\n".join(str(line) for line in lines)
     
     def _extract_resume_facts(self, resume_data: Dict) -> List[str]:
         facts = []
@@ -45,7 +338,7 @@ class RewriteAgent:
         
         return [f for f in facts if len(f) > 20]
     
-    def _suggest_skill_addition(self, skill: Dict, resume_facts: List[str], jd_data: Dict) -> Optional[Dict]:
+    def _skill_addition_prompt(self, skill: Dict, resume_facts: List[str], jd_data: Dict) -> Tuple[str, str]:
         system_prompt = """You are a resume improvement assistant. Generate suggestions to add missing skills based ONLY on existing resume content.
 Rules:
 1. Only suggest rephrasing existing content to highlight the skill
@@ -70,25 +363,9 @@ Output JSON format:
   "skill_id": "{skill['id']}"
 }}"""
         
-        try:
-            response = self.llm.generate_json(user_prompt, system_prompt)
-            
-            if response and "before" in response and response.get("before"):
-                return {
-                    "before": response["before"],
-                    "after": response["after"],
-                    "reasoning": response.get("reasoning", ""),
-                    "confidence": response.get("confidence", 0.5),
-                    "grounded_by": [0],
-                    "type": "skill_addition",
-                    "skill_id": skill["id"]
-                }
-        except Exception:
-            pass
-        
-        return None
+        return user_prompt, system_prompt
     
-    def _suggest_content_improvement(self, evidence: Dict, resume_facts: List[str], jd_data: Dict) -> Optional[Dict]:
+    def _content_improvement_prompt(self, evidence: Dict, resume_facts: List[str], jd_data: Dict) -> Tuple[str, str]:
         system_prompt = """You are a resume improvement assistant. Improve existing resume content to better match job requirements.
 Rules:
 1. Only modify existing content, never add new facts
@@ -117,39 +394,27 @@ Output JSON format:
   "confidence": 0.0-1.0
 }}"""
         
-        try:
-            response = self.llm.generate_json(user_prompt, system_prompt)
-            
-            if response and "before" in response and response.get("before"):
-                return {
-                    "before": response["before"],
-                    "after": response["after"],
-                    "reasoning": response.get("reasoning", ""),
-                    "confidence": response.get("confidence", 0.5),
-                    "grounded_by": [0],
-                    "type": "content_improvement"
-                }
-        except Exception:
-            pass
-        
-        return None
+        return user_prompt, system_prompt
     
     def _validate_suggestion(self, suggestion: Dict, resume_facts: List[str]) -> bool:
-        if not suggestion.get("after"):
-            return False
+        return bool(self._validate_suggestions([suggestion], resume_facts))
+    
+    def _validate_suggestions(self, suggestions: List[Dict], resume_facts: List[str]) -> List[Dict]:
+        candidates = [
+            s for s in suggestions
+            if s.get("after") and s.get("confidence", 0) >= 0.3
+        ]
         
-        contradiction_result = self.contradiction_checker.check_suggestion_against_resume(
+        contradiction_results = self.contradiction_checker.check_suggestions_against_resume(
             resume_facts,
-            suggestion["after"]
+            [s["after"] for s in candidates]
         )
         
-        if contradiction_result["has_contradiction"]:
-            return False
-        
-        if suggestion.get("confidence", 0) < 0.3:
-            return False
-        
-        return True
+        return [
+            suggestion
+            for suggestion, contradiction_result in zip(candidates, contradiction_results)
+            if not contradiction_result["has_contradiction"]
+        ]
     
     def generate_bullet_improvements(self, bullets: List[str], jd_data: Dict) -> List[Dict]:
         system_prompt = """You are a resume bullet point optimizer. Improve bullet points for impact and ATS optimization.
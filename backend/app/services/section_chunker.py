@@ -0,0 +1,123 @@
+from typing import Callable, Dict, List, Optional
+import hashlib
+import json
+import re
+
+def section_lines(section: Dict) -> List[str]:
+    content = section.get("content", [])
+    lines = content if isinstance(content, list) else str(content).split("\n")
+    return [str(line).strip() for line in lines if str(line).strip()]
+
+def fingerprint_section(section: Dict) -> str:
+    payload = json.dumps([section.get("title", "unknown"), section_lines(section)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+def sections_to_text(sections: List[Dict]) -> str:
+    lines = []
+    for section in sections:
+        if section.get("title") and section.get("title") != "header":
+            lines.append(section["title"])
+        lines.extend(section_lines(section))
+    return "\n".join(lines)
+
+class SectionChunker:
+    def __init__(self, token_counter: Optional[Callable[[str], int]] = None, max_tokens: int = 128,
+                 max_chunks_per_document: int = 96):
+        self.token_counter = token_counter or self._approximate_tokens
+        self.max_tokens = max_tokens
+        self.max_chunks_per_document = max_chunks_per_document
+        
+        self.bullet_pattern = re.compile(r'^\s*(?:[-•*▪◦●‣–]|\d+[.)])\s+')
+        self.sentence_pattern = re.compile(r'(?<=[.!?;])\s+(?=[A-Z0-9(])')
+    
+    @property
+    def config_key(self) -> str:
+        return f"chunks:{self.max_tokens}:{self.max_chunks_per_document}"
+    
+    def _approximate_tokens(self, text: str) -> int:
+        return int(len(text.split()) * 1.3) + 1
+    
+    def _split_units(self, content) -> List[str]:
+        lines = content if isinstance(content, list) else str(content).split("\n")
+        
+        units = []
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            
+            is_bullet = bool(self.bullet_pattern.match(line))
+            line = self.bullet_pattern.sub("", line)
+            
+            continues_previous = (
+                units
+                and not is_bullet
+                and line[:1].islower()
+                and not units[-1].rstrip().endswith((".", "!", "?", ":"))
+            )
+            if continues_previous:
+                units[-1] = f"{units[-1]} {line}"
+            else:
+                units.append(line)
+        
+        return units
+    
+    def _split_long(self, text: str) -> List[str]:
+        if self.token_counter(text) <= self.max_tokens:
+            return [text]
+        
+        windows = []
+        current = ""
+        for sentence in self.sentence_pattern.split(text):
+            candidate = f"{current} {sentence}".strip()
+            if current and self.token_counter(candidate) > self.max_tokens:
+                windows.append(current)
+                current = sentence
+            else:
+                current = candidate
+        if current:
+            windows.append(current)
+        
+        chunks = []
+        for window in windows:
+            if self.token_counter(window) <= self.max_tokens:
+                chunks.append(window)
+                continue
+            
+            words = window.split()
+            step = max(1, int(self.max_tokens / 1.3))
+            for start in range(0, len(words), step):
+                chunks.append(" ".join(words[start:start + step]))
+        
+        return chunks
+    
+    def split_section(self, section: Dict) -> List[str]:
+        chunks = []
+        for unit in self._split_units(section.get("content", [])):
+            chunks.extend(self._split_long(unit))
+        return [c for c in chunks if c.strip()]
+    
+    def select_chunks(self, sections: List[Dict], per_section: List[List[str]]) -> List[Dict]:
+        selected = []
+        rank = 0
+        remaining = sum(len(chunks) for chunks in per_section)
+        while remaining and len(selected) < self.max_chunks_per_document:
+            for section_index, chunks in enumerate(per_section):
+                if rank < len(chunks) and len(selected) < self.max_chunks_per_document:
+                    selected.append((section_index, rank))
+                    remaining -= 1
+            rank += 1
+        
+        selected.sort()
+        return [
+            {
+                "section_index": section_index,
+                "chunk_index": chunk_rank,
+                "title": sections[section_index].get("title", "unknown"),
+                "text": per_section[section_index][chunk_rank]
+            }
+            for section_index, chunk_rank in selected
+        ]
+    
+    def chunk_sections(self, sections: List[Dict]) -> List[Dict]:
+        return self.select_chunks(sections, [self.split_section(section) for section in sections])
\ No newline at end of file
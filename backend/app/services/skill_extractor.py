@@ -1,95 +1,144 @@
 import spacy
 import re
-import csv
+import time
 from typing import List, Dict, Set, Optional
 from pathlib import Path
 from fuzzywuzzy import fuzz
+from app.core.config import settings
+from app.services.skill_matcher import SkillMatcher
+from app.services.skill_index import SkillIndex
+from app.services.taxonomy_artifact import (ARTIFACT_NAME, load_artifact, read_taxonomy_csv,
+                                            source_fingerprint, write_artifact)
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SPACY_EXCLUDED_COMPONENTS = ["ner", "lemmatizer"]
 
 class SkillExtractor:
-    def __init__(self, taxonomy_path: str = "data/esco_taxonomy"):
-        self.nlp = spacy.load("en_core_web_sm")
+    def __init__(self, taxonomy_path: str = "data/esco_taxonomy", use_artifact: Optional[bool] = None):
+        self.nlp = spacy.load("en_core_web_sm", exclude=SPACY_EXCLUDED_COMPONENTS)
         self.taxonomy_path = Path(taxonomy_path)
         
         self.skills_db = {}
         self.skill_synonyms = {}
-        self.skill_patterns = {}
+        self.skill_matcher = None
+        self.skill_index = None
+        self.taxonomy_artifact = None
+        
+        self.use_artifact = settings.USE_TAXONOMY_ARTIFACT if use_artifact is None else use_artifact
         
-        self._load_taxonomy()
-        self._build_patterns()
+        start_time = time.perf_counter()
+        
+        if self.use_artifact and self._load_artifact():
+            source = "artifact"
+        else:
+            self._load_taxonomy()
+            self._build_patterns()
+            source = "csv"
+            if self.use_artifact and settings.TAXONOMY_ARTIFACT_CACHE_DIR:
+                self._write_artifact()
+        
+        load_ms = (time.perf_counter() - start_time) * 1000
+        logger.info(f"Loaded {len(self.skills_db)} skills from {source} in {load_ms:.1f} ms")
     
     def _load_taxonomy(self):
-        skills_file = self.taxonomy_path / "skills.csv"
-        synonyms_file = self.taxonomy_path / "skill_synonyms.csv"
-        
-        if skills_file.exists():
-            with open(skills_file, "r", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    skill_id = row["id"]
-                    self.skills_db[skill_id] = {
-                        "name": row["name"].lower(),
-                        "type": row["type"],
-                        "category": row["category"]
-                    }
-        
-        if synonyms_file.exists():
-            with open(synonyms_file, "r", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    skill_id = row["skill_id"]
-                    synonym = row["synonym"].lower()
-                    if skill_id not in self.skill_synonyms:
-                        self.skill_synonyms[skill_id] = []
-                    self.skill_synonyms[skill_id].append(synonym)
+        self.skills_db, self.skill_synonyms = read_taxonomy_csv(self.taxonomy_path)
+    
+    def _cache_path(self, fingerprint: str) -> Optional[Path]:
+        if not settings.TAXONOMY_ARTIFACT_CACHE_DIR:
+            return None
+        return Path(settings.TAXONOMY_ARTIFACT_CACHE_DIR) / f"taxonomy-{fingerprint[:16]}.bin"
+    
+    def _load_artifact(self) -> bool:
+        fingerprint = source_fingerprint(self.taxonomy_path)
+        artifact = load_artifact(self.taxonomy_path / ARTIFACT_NAME, fingerprint)
+        cache_path = self._cache_path(fingerprint)
+        if artifact is None and cache_path is not None:
+            artifact = load_artifact(cache_path, fingerprint)
+        if artifact is None:
+            return False
+        
+        self.taxonomy_artifact = artifact
+        self.skills_db = artifact.skills_db()
+        self.skill_synonyms = artifact.skill_synonyms()
+        self.skill_matcher = artifact.skill_matcher()
+        self.skill_index = artifact.skill_index()
+        return True
+    
+    def _write_artifact(self):
+        fingerprint = source_fingerprint(self.taxonomy_path)
+        cache_path = self._cache_path(fingerprint)
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            write_artifact(
+                cache_path,
+                fingerprint,
+                self.skills_db,
+                self.skill_synonyms,
+                self.skill_matcher,
+                self.skill_index
+            )
+        except OSError as e:
+            logger.warning(f"Could not write taxonomy artifact: {e}")
     
     def _build_patterns(self):
-        for skill_id, skill_data in self.skills_db.items():
-            terms = [skill_data["name"]]
-            if skill_id in self.skill_synonyms:
-                terms.extend(self.skill_synonyms[skill_id])
-            
-            self.skill_patterns[skill_id] = [
-                re.compile(r'\b' + re.escape(term) + r'\b', re.IGNORECASE)
-                for term in terms
-            ]
+        self.skill_matcher = SkillMatcher.from_taxonomy(self.skills_db, self.skill_synonyms)
+        self.skill_index = SkillIndex.from_taxonomy(self.skills_db, self.skill_synonyms)
     
     def extract_skills(self, text: str, min_confidence: float = 0.8) -> Dict[str, List[Dict]]:
+        return self._extract_from_doc(text, self.nlp(text), min_confidence)
+    
+    def extract_skills_many(self, texts: List[str], min_confidence: float = 0.8,
+                            batch_size: Optional[int] = None, n_process: Optional[int] = None) -> List[Dict[str, List[Dict]]]:
+        texts = list(texts)
+        docs = self.nlp.pipe(
+            texts,
+            batch_size=batch_size or settings.SPACY_BATCH_SIZE,
+            n_process=n_process or settings.SPACY_N_PROCESS
+        )
+        return [self._extract_from_doc(text, doc, min_confidence) for text, doc in zip(texts, docs)]
+    
+    def _extract_from_doc(self, text: str, doc, min_confidence: float) -> Dict[str, List[Dict]]:
         text_lower = text.lower()
         detected_skills = []
         
-        for skill_id, patterns in self.skill_patterns.items():
-            for pattern in patterns:
-                matches = pattern.findall(text_lower)
-                if matches:
-                    skill_data = self.skills_db[skill_id]
-                    detected_skills.append({
-                        "id": skill_id,
-                        "name": skill_data["name"],
-                        "type": skill_data["type"],
-                        "category": skill_data["category"],
-                        "confidence": 1.0,
-                        "matched_term": matches[0]
-                    })
-                    break
-        
-        doc = self.nlp(text)
+        for match in self.skill_matcher.match_skills(text_lower):
+            skill_id = match["skill_id"]
+            skill_data = self.skills_db[skill_id]
+            detected_skills.append({
+                "id": skill_id,
+                "name": skill_data["name"],
+                "type": skill_data["type"],
+                "category": skill_data["category"],
+                "confidence": 1.0,
+                "matched_term": match["term"],
+                "span": [match["start"], match["end"]]
+            })
+        
+        detected_ids = set(s["id"] for s in detected_skills)
         
         noun_phrases = [chunk.text.lower() for chunk in doc.noun_chunks]
         for phrase in noun_phrases:
-            for skill_id, skill_data in self.skills_db.items():
+            for candidate in self.skill_index.candidates(phrase, min_similarity=min_confidence):
+                skill_id = candidate["skill_id"]
+                if skill_id in detected_ids:
+                    continue
+                
+                skill_data = self.skills_db[skill_id]
                 skill_name = skill_data["name"]
                 similarity = fuzz.ratio(phrase, skill_name) / 100.0
                 
                 if similarity >= min_confidence:
-                    if not any(s["id"] == skill_id for s in detected_skills):
-                        detected_skills.append({
-                            "id": skill_id,
-                            "name": skill_name,
-                            "type": skill_data["type"],
-                            "category": skill_data["category"],
-                            "confidence": similarity,
-                            "matched_term": phrase
-                        })
+                    detected_ids.add(skill_id)
+                    detected_skills.append({
+                        "id": skill_id,
+                        "name": skill_name,
+                        "type": skill_data["type"],
+                        "category": skill_data["category"],
+                        "confidence": similarity,
+                        "matched_term": phrase
+                    })
         
         technical = [s for s in detected_skills if s["type"] == "technical"]
         soft = [s for s in detected_skills if s["type"] == "soft"]
@@ -128,14 +177,10 @@ class SkillExtractor:
         return experience_map
     
     def _match_to_taxonomy(self, skill_text: str) -> Optional[Dict]:
-        for skill_id, skill_data in self.skills_db.items():
-            if skill_data["name"] in skill_text:
-                return {"id": skill_id, "name": skill_data["name"]}
-            
-            if skill_id in self.skill_synonyms:
-                for syn in self.skill_synonyms[skill_id]:
-                    if syn in skill_text:
-                        return {"id": skill_id, "name": skill_data["name"]}
+        hits = self.skill_index.find_contained(skill_text)
+        if hits:
+            skill_id = hits[0]["skill_id"]
+            return {"id": skill_id, "name": self.skills_db[skill_id]["name"]}
         
         return None
     
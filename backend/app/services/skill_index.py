@@ -0,0 +1,185 @@
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from itertools import chain
+from math import ceil
+from typing import Dict, List, Set, Tuple, Sequence
+
+class SkillIndex:
+    TABLES = ["term_skill", "term_rank", "term_inner_count", "short_terms", "posting_offsets", "posting_name_ends", "posting_ids",
+              "length_offsets", "length_term_ids"]
+    PAD = "\x00"
+    
+    def __init__(self, skill_ids: List[str], terms: List[Tuple[int, int, str]], gram_size: int = 3):
+        self.skill_ids = skill_ids
+        self.gram_size = gram_size
+        
+        self.term_skill = array("I")
+        self.term_rank = array("I")
+        self.term_inner_count = array("I")
+        self.term_text = []
+        self.short_terms = array("I")
+        
+        name_postings = defaultdict(lambda: array("I"))
+        synonym_postings = defaultdict(lambda: array("I"))
+        by_length = defaultdict(lambda: array("I"))
+        
+        for skill_idx, rank, term in terms:
+            if not term:
+                continue
+            term_id = len(self.term_text)
+            inner_count = len(self.grams(term, padded=False))
+            
+            self.term_skill.append(skill_idx)
+            self.term_rank.append(rank)
+            self.term_inner_count.append(inner_count)
+            self.term_text.append(term)
+            by_length[len(term)].append(term_id)
+            
+            if not inner_count:
+                self.short_terms.append(term_id)
+            postings = name_postings if rank == 0 else synonym_postings
+            for gram in self.grams(term):
+                postings[gram].append(term_id)
+        
+        self.gram_keys = sorted(set(name_postings).union(synonym_postings))
+        self.posting_offsets = array("I", [0])
+        self.posting_name_ends = array("I")
+        self.posting_ids = array("I")
+        for gram in self.gram_keys:
+            self.posting_ids.extend(name_postings.get(gram, ()))
+            self.posting_name_ends.append(len(self.posting_ids))
+            self.posting_ids.extend(synonym_postings.get(gram, ()))
+            self.posting_offsets.append(len(self.posting_ids))
+        
+        max_length = max(by_length) if by_length else 0
+        self.length_offsets = array("I", [0])
+        self.length_term_ids = array("I")
+        for length in range(max_length + 1):
+            self.length_term_ids.extend(by_length.get(length, ()))
+            self.length_offsets.append(len(self.length_term_ids))
+    
+    @classmethod
+    def from_taxonomy(cls, skills_db: Dict[str, Dict], skill_synonyms: Dict[str, List[str]], **kwargs) -> "SkillIndex":
+        skill_ids = list(skills_db.keys())
+        terms = []
+        for skill_idx, skill_id in enumerate(skill_ids):
+            terms.append((skill_idx, 0, skills_db[skill_id]["name"]))
+            for rank, synonym in enumerate(skill_synonyms.get(skill_id, []), start=1):
+                terms.append((skill_idx, rank, synonym))
+        return cls(skill_ids, terms, **kwargs)
+    
+    @classmethod
+    def from_tables(cls, skill_ids: Sequence[str], term_text: Sequence[str], gram_keys: Sequence[str],
+                    tables: Dict[str, Sequence[int]], gram_size: int = 3) -> "SkillIndex":
+        index = cls.__new__(cls)
+        index.skill_ids = skill_ids
+        index.term_text = term_text
+        index.gram_keys = gram_keys
+        index.gram_size = gram_size
+        for name in cls.TABLES:
+            setattr(index, name, tables[name])
+        return index
+    
+    def grams(self, text: str, padded: bool = True) -> Set[str]:
+        n = self.gram_size
+        if padded:
+            text = self.PAD * (n - 1) + text + self.PAD * (n - 1)
+        return {text[i:i + n] for i in range(len(text) - n + 1)}
+    
+    def _posting(self, gram: str, names_only: bool = False) -> Sequence[int]:
+        pos = bisect_left(self.gram_keys, gram)
+        if pos < len(self.gram_keys) and self.gram_keys[pos] == gram:
+            end = self.posting_name_ends[pos] if names_only else self.posting_offsets[pos + 1]
+            return self.posting_ids[self.posting_offsets[pos]:end]
+        return ()
+    
+    def _shared_gram_counts(self, grams: Set[str], names_only: bool = False) -> Dict[int, int]:
+        return Counter(chain.from_iterable(self._posting(gram, names_only) for gram in grams))
+    
+    def _required_shared(self, phrase_len: int, term_len: int, min_similarity: float, duplicates: int) -> int:
+        q = self.gram_size
+        lcs = max(0, ceil(min_similarity * (phrase_len + term_len) / 2 - 1e-9))
+        phrase_loss = q * (phrase_len - lcs) + (q - 1) * (term_len - lcs)
+        term_loss = q * (term_len - lcs) + (q - 1) * (phrase_len - lcs)
+        return max(phrase_len + q - 1 - phrase_loss, term_len + q - 1 - term_loss) - duplicates
+    
+    def _length_range(self, phrase_len: int, min_similarity: float) -> range:
+        max_length = len(self.length_offsets) - 2
+        if min_similarity <= 0:
+            return range(1, max_length + 1)
+        lo = ceil(min_similarity * phrase_len / (2 - min_similarity) - 1e-9)
+        hi = int(phrase_len * (2 - min_similarity) / min_similarity + 1e-9)
+        return range(max(lo, 1), min(hi, max_length) + 1)
+    
+    def candidates(self, phrase: str, min_similarity: float = 0.0, limit: int = None, names_only: bool = True) -> List[Dict]:
+        if not phrase:
+            return []
+        
+        bound = min_similarity - 0.005
+        phrase_grams = self.grams(phrase)
+        phrase_len = len(phrase)
+        duplicates = phrase_len + self.gram_size - 1 - len(phrase_grams)
+        counts = self._shared_gram_counts(phrase_grams, names_only)
+        
+        required = {}
+        exhaustive = []
+        for term_len in self._length_range(phrase_len, bound):
+            required[term_len] = self._required_shared(phrase_len, term_len, bound, duplicates)
+            if required[term_len] <= 0:
+                exhaustive.extend(self.length_term_ids[self.length_offsets[term_len]:self.length_offsets[term_len + 1]])
+        
+        if not required:
+            return []
+        
+        floor = min(required.values())
+        shortlist = [term_id for term_id, shared in counts.items() if shared >= floor]
+        
+        scored = []
+        for term_id in set(shortlist).union(exhaustive):
+            if names_only and self.term_rank[term_id] != 0:
+                continue
+            
+            term_len = len(self.term_text[term_id])
+            shared = counts.get(term_id, 0)
+            if term_len not in required or shared < required[term_len]:
+                continue
+            
+            overlap = 2 * shared / (len(phrase_grams) + term_len + self.gram_size - 1)
+            scored.append((overlap, term_id))
+        
+        if limit:
+            scored.sort(key=lambda x: (-x[0], self.term_skill[x[1]], self.term_rank[x[1]]))
+            scored = scored[:limit]
+        scored.sort(key=lambda x: (self.term_skill[x[1]], self.term_rank[x[1]]))
+        
+        return [
+            {
+                "skill_id": self.skill_ids[self.term_skill[term_id]],
+                "term": self.term_text[term_id],
+                "overlap": overlap
+            }
+            for overlap, term_id in scored
+        ]
+    
+    def find_contained(self, text: str) -> List[Dict]:
+        counts = self._shared_gram_counts(self.grams(text, padded=False))
+        
+        hits = []
+        for term_id, shared in counts.items():
+            inner_count = self.term_inner_count[term_id]
+            if inner_count and shared >= inner_count and self.term_text[term_id] in text:
+                hits.append(term_id)
+        for term_id in self.short_terms:
+            if self.term_text[term_id] in text:
+                hits.append(term_id)
+        
+        hits.sort(key=lambda t: (self.term_skill[t], self.term_rank[t]))
+        
+        return [
+            {
+                "skill_id": self.skill_ids[self.term_skill[term_id]],
+                "term": self.term_text[term_id]
+            }
+            for term_id in hits
+        ]
\ No newline at end of file
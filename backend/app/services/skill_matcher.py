@@ -0,0 +1,174 @@
+from array import array
+from bisect import bisect_left
+from collections import deque
+from typing import Dict, List, Tuple, Optional, Sequence
+
+def _is_word_char(ch: Optional[str]) -> bool:
+    return ch is not None and (ch.isalnum() or ch == "_")
+
+class SkillMatcher:
+    TABLES = ["term_skill", "term_rank", "term_length", "edge_offsets", "edge_chars",
+              "edge_targets", "term_offsets", "node_term_ids", "fail", "output_link"]
+    
+    def __init__(self, skill_ids: List[str], terms: List[Tuple[int, int, str]]):
+        self.skill_ids = skill_ids
+        self.term_skill = array("I")
+        self.term_rank = array("I")
+        self.term_length = array("I")
+        self.term_text = []
+        
+        trie = [{}]
+        node_terms = [[]]
+        
+        for skill_idx, rank, term in terms:
+            if not term:
+                continue
+            node = 0
+            for ch in term:
+                nxt = trie[node].get(ch)
+                if nxt is None:
+                    nxt = len(trie)
+                    trie[node][ch] = nxt
+                    trie.append({})
+                    node_terms.append([])
+                node = nxt
+            node_terms[node].append(len(self.term_text))
+            self.term_skill.append(skill_idx)
+            self.term_rank.append(rank)
+            self.term_length.append(len(term))
+            self.term_text.append(term)
+        
+        self._freeze(trie, node_terms)
+    
+    @classmethod
+    def from_taxonomy(cls, skills_db: Dict[str, Dict], skill_synonyms: Dict[str, List[str]]) -> "SkillMatcher":
+        skill_ids = list(skills_db.keys())
+        terms = []
+        for skill_idx, skill_id in enumerate(skill_ids):
+            terms.append((skill_idx, 0, skills_db[skill_id]["name"]))
+            for rank, synonym in enumerate(skill_synonyms.get(skill_id, []), start=1):
+                terms.append((skill_idx, rank, synonym))
+        return cls(skill_ids, terms)
+    
+    @classmethod
+    def from_tables(cls, skill_ids: Sequence[str], term_text: Sequence[str], tables: Dict[str, Sequence[int]]) -> "SkillMatcher":
+        matcher = cls.__new__(cls)
+        matcher.skill_ids = skill_ids
+        matcher.term_text = term_text
+        for name in cls.TABLES:
+            setattr(matcher, name, tables[name])
+        return matcher
+    
+    def _freeze(self, trie: List[Dict[str, int]], node_terms: List[List[int]]):
+        node_count = len(trie)
+        
+        self.edge_offsets = array("I", [0]) * (node_count + 1)
+        self.edge_chars = array("I")
+        self.edge_targets = array("I")
+        for node, edges in enumerate(trie):
+            for ch in sorted(edges):
+                self.edge_chars.append(ord(ch))
+                self.edge_targets.append(edges[ch])
+            self.edge_offsets[node + 1] = len(self.edge_chars)
+        
+        self.term_offsets = array("I", [0]) * (node_count + 1)
+        self.node_term_ids = array("I")
+        for node, term_ids in enumerate(node_terms):
+            self.node_term_ids.extend(term_ids)
+            self.term_offsets[node + 1] = len(self.node_term_ids)
+        
+        self.fail = array("I", [0]) * node_count
+        self.output_link = array("I", [0]) * node_count
+        
+        queue = deque()
+        for target in trie[0].values():
+            queue.append(target)
+        
+        while queue:
+            node = queue.popleft()
+            for ch, target in trie[node].items():
+                code = ord(ch)
+                state = self.fail[node]
+                nxt = self._step(state, code)
+                while nxt is None and state != 0:
+                    state = self.fail[state]
+                    nxt = self._step(state, code)
+                if nxt is None:
+                    nxt = 0
+                self.fail[target] = nxt
+                if node_terms[nxt]:
+                    self.output_link[target] = nxt
+                else:
+                    self.output_link[target] = self.output_link[nxt]
+                queue.append(target)
+    
+    def _step(self, node: int, code: int) -> Optional[int]:
+        lo = self.edge_offsets[node]
+        hi = self.edge_offsets[node + 1]
+        if lo == hi:
+            return None
+        pos = bisect_left(self.edge_chars, code, lo, hi)
+        if pos < hi and self.edge_chars[pos] == code:
+            return self.edge_targets[pos]
+        return None
+    
+    def _iter_hits(self, text: str, word_boundaries: bool = True):
+        node = 0
+        length = len(text)
+        for end, ch in enumerate(text, start=1):
+            code = ord(ch)
+            while True:
+                nxt = self._step(node, code)
+                if nxt is not None:
+                    node = nxt
+                    break
+                if node == 0:
+                    break
+                node = self.fail[node]
+            
+            state = node if self.term_offsets[node] != self.term_offsets[node + 1] else self.output_link[node]
+            while state:
+                for pos in range(self.term_offsets[state], self.term_offsets[state + 1]):
+                    term_id = self.node_term_ids[pos]
+                    start = end - self.term_length[term_id]
+                    if word_boundaries:
+                        before = text[start - 1] if start > 0 else None
+                        after = text[end] if end < length else None
+                        if _is_word_char(before) == _is_word_char(text[start]):
+                            continue
+                        if _is_word_char(text[end - 1]) == _is_word_char(after):
+                            continue
+                    yield term_id, start, end
+                state = self.output_link[state]
+    
+    def find_matches(self, text: str, word_boundaries: bool = True) -> List[Dict]:
+        matches = []
+        for term_id, start, end in self._iter_hits(text, word_boundaries):
+            matches.append({
+                "skill_id": self.skill_ids[self.term_skill[term_id]],
+                "term": self.term_text[term_id],
+                "start": start,
+                "end": end
+            })
+        matches.sort(key=lambda m: (m["start"], -m["end"]))
+        return matches
+    
+    def match_skills(self, text: str, word_boundaries: bool = True) -> List[Dict]:
+        best = {}
+        for term_id, start, end in self._iter_hits(text, word_boundaries):
+            skill_idx = self.term_skill[term_id]
+            key = (self.term_rank[term_id], start)
+            current = best.get(skill_idx)
+            if current is None or key < current[0]:
+                best[skill_idx] = (key, term_id, start, end)
+        
+        results = []
+        for skill_idx in sorted(best):
+            _, term_id, start, end = best[skill_idx]
+            results.append({
+                "skill_id": self.skill_ids[skill_idx],
+                "term": self.term_text[term_id],
+                "start": start,
+                "end": end
+            })
+        return results
\ No newline at end of file
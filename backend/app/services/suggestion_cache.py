@@ -0,0 +1,105 @@
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from app.services.embedding_service import EmbeddingService
+from app.core.config import settings
+from app.utils.logger import get_logger
+import itertools
+import threading
+import numpy as np
+
+logger = get_logger(__name__)
+
+class SemanticSuggestionCache:
+    def __init__(self, embedding_service: EmbeddingService, threshold: Optional[float] = None,
+                 max_entries: Optional[int] = None):
+        self.embedding_service = embedding_service
+        self.threshold = settings.SEMANTIC_CACHE_THRESHOLD if threshold is None else threshold
+        self.max_entries = max_entries or settings.SEMANTIC_CACHE_MAX_ENTRIES
+        
+        self._entries = OrderedDict()
+        self._groups = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        
+        self.lookups = 0
+        self.hits = 0
+        self.stale = 0
+        self.stores = 0
+        self.saved_llm_calls = 0
+    
+    def _group(self, item: Tuple[str, Dict]) -> str:
+        suggestion_type, payload = item
+        if suggestion_type == "skill_addition":
+            return f"{suggestion_type}:{payload['id']}"
+        return suggestion_type
+    
+    def key_text(self, item: Tuple[str, Dict], resume_facts: List[str], jd_data: Dict) -> str:
+        suggestion_type, payload = item
+        if suggestion_type == "skill_addition":
+            relevant = [fact for fact in resume_facts if payload["name"].lower() in fact.lower()] or resume_facts[:3]
+            return "\n".join([payload["name"], *relevant[:3], jd_data["raw_text"][:300]])
+        return "\n".join([payload.get("requirement", ""), payload.get("matched_text", "")])
+    
+    def lookup(self, items: List[Tuple[str, Dict]], resume_facts: List[str], jd_data: Dict,
+               resume_text: str) -> Tuple[Dict[int, Dict], np.ndarray]:
+        embeddings = self.embedding_service.embed_texts([self.key_text(item, resume_facts, jd_data) for item in items])
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        
+        hits = {}
+        with self._lock:
+            self.lookups += len(items)
+            for index, item in enumerate(items):
+                entry_ids = list(self._groups.get(self._group(item), ()))
+                if not entry_ids:
+                    continue
+                
+                similarities = np.stack([self._entries[entry_id][1] for entry_id in entry_ids]) @ embeddings[index]
+                for position in np.argsort(-similarities, kind="stable"):
+                    if similarities[position] < self.threshold:
+                        break
+                    entry_id = entry_ids[position]
+                    suggestion = self._entries[entry_id][2]
+                    if suggestion["before"] not in resume_text:
+                        self.stale += 1
+                        continue
+                    self._entries.move_to_end(entry_id)
+                    hits[index] = {**suggestion, "cached": True, "cache_similarity": round(float(similarities[position]), 3)}
+                    break
+            self.hits += len(hits)
+        
+        if hits:
+            logger.info(f"Semantic suggestion cache served {len(hits)}/{len(items)} items")
+        return hits, embeddings
+    
+    def record_saved_calls(self, count: int):
+        with self._lock:
+            self.saved_llm_calls += count
+    
+    def store(self, items: List[Tuple[str, Dict]], embeddings: np.ndarray, suggestions: Dict[int, Dict]):
+        with self._lock:
+            for index, suggestion in suggestions.items():
+                entry_id = next(self._ids)
+                group = self._group(items[index])
+                self._entries[entry_id] = (group, embeddings[index], dict(suggestion))
+                self._groups.setdefault(group, OrderedDict())[entry_id] = None
+                self.stores += 1
+            
+            while len(self._entries) > self.max_entries:
+                entry_id, (group, _, _) = self._entries.popitem(last=False)
+                self._groups[group].pop(entry_id, None)
+                if not self._groups[group]:
+                    del self._groups[group]
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "threshold": self.threshold,
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "saved_llm_calls": self.saved_llm_calls,
+                "stale": self.stale,
+                "stores": self.stores,
+                "hit_rate": self.hits / self.lookups if self.lookups else 0.0
+            }
\ No newline at end of file
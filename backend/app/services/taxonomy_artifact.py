@@ -0,0 +1,237 @@
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+from app.services.skill_matcher import SkillMatcher
+from app.services.skill_index import SkillIndex
+import csv
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+ARTIFACT_MAGIC = b"RTTAXv1\x00"
+ARTIFACT_VERSION = 2
+ARTIFACT_NAME = "taxonomy.bin"
+SOURCE_FILES = ["skills.csv", "skill_synonyms.csv"]
+ALIGNMENT = 8
+
+class StringTable:
+    def __init__(self, blob: memoryview, offsets: Sequence[int]):
+        self.blob = blob
+        self.offsets = offsets
+    
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+    
+    def __getitem__(self, idx: int) -> str:
+        if idx < 0:
+            idx += len(self)
+        if idx < 0 or idx >= len(self):
+            raise IndexError("string table index out of range")
+        return bytes(self.blob[self.offsets[idx]:self.offsets[idx + 1]]).decode("utf-8")
+    
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+
+class TaxonomyArtifact:
+    def __init__(self, path: Path, header: Dict, buffer: mmap.mmap):
+        self.path = path
+        self.header = header
+        self._buffer = buffer
+        self._view = memoryview(buffer)
+    
+    def array(self, name: str) -> memoryview:
+        offset, typecode, nbytes = self.header["sections"][name]
+        return self._view[offset:offset + nbytes].cast(typecode)
+    
+    def strings(self, name: str) -> StringTable:
+        return StringTable(self.array(f"{name}_blob"), self.array(f"{name}_offsets"))
+    
+    def skill_ids(self) -> StringTable:
+        return self.strings("skill_ids")
+    
+    def skills_db(self) -> Dict[str, Dict]:
+        ids = self.strings("skill_ids")
+        names = self.strings("skill_names")
+        types = self.strings("skill_types")
+        categories = self.strings("skill_categories")
+        return {
+            ids[i]: {"name": names[i], "type": types[i], "category": categories[i]}
+            for i in range(len(ids))
+        }
+    
+    def skill_synonyms(self) -> Dict[str, List[str]]:
+        ids = self.strings("skill_ids")
+        synonyms = self.strings("synonyms")
+        offsets = self.array("synonym_offsets")
+        result = {}
+        for i in range(len(ids)):
+            start, end = offsets[i], offsets[i + 1]
+            if end > start:
+                result[ids[i]] = [synonyms[j] for j in range(start, end)]
+        return result
+    
+    def skill_matcher(self) -> SkillMatcher:
+        tables = {name: self.array(f"matcher_{name}") for name in SkillMatcher.TABLES}
+        return SkillMatcher.from_tables(self.skill_ids(), self.strings("matcher_terms"), tables)
+    
+    def skill_index(self) -> SkillIndex:
+        tables = {name: self.array(f"index_{name}") for name in SkillIndex.TABLES}
+        return SkillIndex.from_tables(
+            self.skill_ids(),
+            self.strings("index_terms"),
+            self.strings("index_grams"),
+            tables,
+            gram_size=self.header["gram_size"]
+        )
+
+def source_fingerprint(taxonomy_path: Path) -> str:
+    digest = hashlib.sha256()
+    digest.update(f"v{ARTIFACT_VERSION}".encode())
+    for name in SOURCE_FILES:
+        source = taxonomy_path / name
+        digest.update(name.encode())
+        if not source.exists():
+            digest.update(b"<missing>")
+            continue
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+def read_taxonomy_csv(taxonomy_path: Path):
+    skills_db = {}
+    skill_synonyms = {}
+    skills_file = taxonomy_path / "skills.csv"
+    synonyms_file = taxonomy_path / "skill_synonyms.csv"
+    
+    if skills_file.exists():
+        with open(skills_file, "r", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                skill_id = row["id"]
+                skills_db[skill_id] = {
+                    "name": row["name"].lower(),
+                    "type": row["type"],
+                    "category": row["category"]
+                }
+    
+    if synonyms_file.exists():
+        with open(synonyms_file, "r", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                skill_id = row["skill_id"]
+                synonym = row["synonym"].lower()
+                if skill_id not in skill_synonyms:
+                    skill_synonyms[skill_id] = []
+                skill_synonyms[skill_id].append(synonym)
+    
+    return skills_db, skill_synonyms
+
+def _string_sections(name: str, values: Sequence[str]) -> Dict[str, array]:
+    blob = array("B")
+    offsets = array("Q", [0])
+    for value in values:
+        blob.frombytes(value.encode("utf-8"))
+        offsets.append(len(blob))
+    return {f"{name}_blob": blob, f"{name}_offsets": offsets}
+
+def write_artifact(path: Path, fingerprint: str, skills_db: Dict[str, Dict], skill_synonyms: Dict[str, List[str]],
+                   matcher: SkillMatcher, index: SkillIndex):
+    skill_ids = list(skills_db.keys())
+    synonym_offsets = array("I", [0])
+    synonyms = []
+    for skill_id in skill_ids:
+        synonyms.extend(skill_synonyms.get(skill_id, []))
+        synonym_offsets.append(len(synonyms))
+    
+    sections = {}
+    sections.update(_string_sections("skill_ids", skill_ids))
+    sections.update(_string_sections("skill_names", [skills_db[s]["name"] for s in skill_ids]))
+    sections.update(_string_sections("skill_types", [skills_db[s]["type"] for s in skill_ids]))
+    sections.update(_string_sections("skill_categories", [skills_db[s]["category"] for s in skill_ids]))
+    sections.update(_string_sections("synonyms", synonyms))
+    sections["synonym_offsets"] = synonym_offsets
+    
+    sections.update(_string_sections("matcher_terms", matcher.term_text))
+    for name in SkillMatcher.TABLES:
+        sections[f"matcher_{name}"] = array("I", getattr(matcher, name))
+    
+    sections.update(_string_sections("index_terms", index.term_text))
+    sections.update(_string_sections("index_grams", index.gram_keys))
+    for name in SkillIndex.TABLES:
+        sections[f"index_{name}"] = array("I", getattr(index, name))
+    
+    layout = {}
+    offset = 0
+    for name, data in sections.items():
+        nbytes = len(data) * data.itemsize
+        layout[name] = [offset, data.typecode, nbytes]
+        offset += nbytes + (-nbytes % ALIGNMENT)
+    
+    header = {
+        "version": ARTIFACT_VERSION,
+        "fingerprint": fingerprint,
+        "byteorder": sys.byteorder,
+        "itemsizes": {"I": array("I").itemsize, "Q": array("Q").itemsize},
+        "skill_count": len(skill_ids),
+        "synonym_count": len(synonyms),
+        "gram_size": index.gram_size,
+        "sections": layout
+    }
+    header_bytes = json.dumps(header).encode("utf-8")
+    data_start = len(ARTIFACT_MAGIC) + 8 + len(header_bytes)
+    data_start += -data_start % ALIGNMENT
+    
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(ARTIFACT_MAGIC)
+        f.write(struct.pack("<Q", data_start))
+        f.write(header_bytes)
+        f.write(b"\x00" * (data_start - f.tell()))
+        for name, data in sections.items():
+            data.tofile(f)
+            f.write(b"\x00" * (-(len(data) * data.itemsize) % ALIGNMENT))
+    os.replace(tmp_path, path)
+
+def load_artifact(path: Path, fingerprint: Optional[str] = None) -> Optional[TaxonomyArtifact]:
+    if not path.exists():
+        return None
+    
+    with open(path, "rb") as f:
+        if f.read(len(ARTIFACT_MAGIC)) != ARTIFACT_MAGIC:
+            return None
+        (data_start,) = struct.unpack("<Q", f.read(8))
+        header_bytes = f.read(data_start - len(ARTIFACT_MAGIC) - 8).rstrip(b"\x00")
+        header = json.loads(header_bytes)
+        
+        if header.get("version") != ARTIFACT_VERSION or header.get("byteorder") != sys.byteorder:
+            return None
+        if header.get("itemsizes") != {"I": array("I").itemsize, "Q": array("Q").itemsize}:
+            return None
+        if fingerprint is not None and header.get("fingerprint") != fingerprint:
+            return None
+        
+        for section in header["sections"].values():
+            section[0] += data_start
+        
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    return TaxonomyArtifact(path, header, buffer)
+
+def build_artifact(taxonomy_path: Path, force: bool = False) -> Path:
+    taxonomy_path = Path(taxonomy_path)
+    path = taxonomy_path / ARTIFACT_NAME
+    fingerprint = source_fingerprint(taxonomy_path)
+    
+    if not force and load_artifact(path, fingerprint) is not None:
+        return path
+    
+    skills_db, skill_synonyms = read_taxonomy_csv(taxonomy_path)
+    matcher = SkillMatcher.from_taxonomy(skills_db, skill_synonyms)
+    index = SkillIndex.from_taxonomy(skills_db, skill_synonyms)
+    write_artifact(path, fingerprint, skills_db, skill_synonyms, matcher, index)
+    return path
\ No newline at end of file
@@ -0,0 +1,364 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Optional
+from app.services.vector_compression import VectorCodec, search
+import json
+import os
+import threading
+import numpy as np
+
+class VectorBackend(ABC):
+    max_batch_size: Optional[int] = None
+    
+    @abstractmethod
+    def upsert(self, collection: str, ids: List[str], embeddings: List[List[float]], documents: List[str],
+               metadatas: List[Dict]):
+        pass
+    
+    @abstractmethod
+    def query(self, collection: str, query_embeddings: List[List[float]], n_results: int,
+              where: Optional[Dict] = None) -> Dict:
+        pass
+    
+    @abstractmethod
+    def delete(self, collection: str, where: Dict):
+        pass
+    
+    @abstractmethod
+    def count(self, collection: str) -> int:
+        pass
+
+class ChromaBackend(VectorBackend):
+    def __init__(self, persist_dir: str, collections: List[str]):
+        import chromadb
+        from chromadb.config import Settings
+        
+        self.client = chromadb.PersistentClient(
+            path=persist_dir,
+            settings=Settings(anonymized_telemetry=False)
+        )
+        self.collections = {
+            name: self.client.get_or_create_collection(name=name, metadata={"hnsw:space": "cosine"})
+            for name in collections
+        }
+        
+        get_max_batch_size = getattr(self.client, "get_max_batch_size", None)
+        if get_max_batch_size is not None:
+            self.max_batch_size = get_max_batch_size()
+    
+    def upsert(self, collection: str, ids: List[str], embeddings: List[List[float]], documents: List[str],
+               metadatas: List[Dict]):
+        self.collections[collection].upsert(ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas)
+    
+    def query(self, collection: str, query_embeddings: List[List[float]], n_results: int,
+              where: Optional[Dict] = None) -> Dict:
+        return self.collections[collection].query(
+            query_embeddings=query_embeddings,
+            n_results=n_results,
+            where=where
+        )
+    
+    def delete(self, collection: str, where: Dict):
+        self.collections[collection].delete(where=where)
+    
+    def count(self, collection: str) -> int:
+        return self.collections[collection].count()
+
+class FlatCollection:
+    def __init__(self, path: Path, dtype: str = "float32", compact_ratio: float = 0.25,
+                 codec: Optional[VectorCodec] = None, rescore_factor: int = 10):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.dtype = np.dtype(np.float16 if dtype == "float16" else np.float32)
+        self.compact_ratio = compact_ratio
+        self.codec = codec
+        self.rescore_factor = rescore_factor
+        self._lock = threading.RLock()
+        
+        self.dim = None
+        self.generation = 0
+        self.ids: List[Optional[str]] = []
+        self.documents: List[Optional[str]] = []
+        self.metadatas: List[Optional[Dict]] = []
+        self.alive = bytearray()
+        self.row_of: Dict[str, int] = {}
+        self.postings: Dict[tuple, List[int]] = {}
+        self.tombstones = 0
+        self._matrix = None
+        self._codes = None
+        
+        self._load()
+    
+    @property
+    def vectors_path(self) -> Path:
+        return self.path / f"vectors.{self.generation}.bin"
+    
+    @property
+    def rows_path(self) -> Path:
+        return self.path / f"rows.{self.generation}.jsonl"
+    
+    @property
+    def codes_path(self) -> Path:
+        return self.path / f"codes.{self.generation}.{self.codec.codec_id}.bin"
+    
+    @property
+    def header_path(self) -> Path:
+        return self.path / "header.json"
+    
+    def _load(self):
+        if self.header_path.exists():
+            with open(self.header_path, "r", encoding="utf-8") as f:
+                header = json.load(f)
+            self.dim = header["dim"]
+            self.dtype = np.dtype(header["dtype"])
+            self.generation = header["generation"]
+        
+        if self.rows_path.exists():
+            with open(self.rows_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.endswith("\n"):
+                        break
+                    record = json.loads(line)
+                    if "delete" in record:
+                        self._tombstone(record["delete"])
+                    else:
+                        self._append_row(record["id"], record["document"], record["metadata"])
+        
+        if self.dim is not None:
+            row_bytes = self.dim * self.dtype.itemsize
+            expected = len(self.ids) * row_bytes
+            if self.vectors_path.exists() and self.vectors_path.stat().st_size > expected:
+                with open(self.vectors_path, "r+b") as f:
+                    f.truncate(expected)
+        
+        self._sync_codes()
+    
+    def _sync_codes(self, block_size: int = 65536):
+        if self.codec is None or self.dim is None:
+            return
+        if self.codec.input_dim != self.dim:
+            raise ValueError(f"Codec expects {self.codec.input_dim}-dim vectors, collection stores {self.dim}")
+        
+        rows = len(self.ids)
+        encoded = self.codes_path.stat().st_size // self.codec.bytes_per_vector if self.codes_path.exists() else 0
+        if encoded > rows:
+            with open(self.codes_path, "r+b") as f:
+                f.truncate(rows * self.codec.bytes_per_vector)
+        elif encoded < rows:
+            matrix = self._matrix_view()
+            with open(self.codes_path, "ab") as f:
+                for start in range(encoded, rows, block_size):
+                    f.write(self.codec.encode(matrix[start:min(start + block_size, rows)]).tobytes())
+        self._codes = None
+    
+    def _codes_view(self) -> np.ndarray:
+        rows = len(self.ids)
+        if self._codes is None or self._codes.shape[0] != rows:
+            self._codes = np.memmap(self.codes_path, dtype=self.codec.code_dtype, mode="r",
+                                    shape=(rows, self.codec.code_width))
+        return self._codes
+    
+    def _append_row(self, row_id: str, document: str, metadata: Dict):
+        row = len(self.ids)
+        previous = self.row_of.get(row_id)
+        if previous is not None:
+            self._tombstone(previous)
+        self.ids.append(row_id)
+        self.documents.append(document)
+        self.metadatas.append(metadata)
+        self.alive.append(1)
+        self.row_of[row_id] = row
+        for key, value in metadata.items():
+            self.postings.setdefault((key, value), []).append(row)
+    
+    def _tombstone(self, row: int):
+        if not self.alive[row]:
+            return
+        self.alive[row] = 0
+        self.tombstones += 1
+        if self.row_of.get(self.ids[row]) == row:
+            del self.row_of[self.ids[row]]
+    
+    def _matrix_view(self) -> np.ndarray:
+        rows = len(self.ids)
+        if rows == 0 or self.dim is None:
+            return np.zeros((0, self.dim or 0), dtype=self.dtype)
+        if self._matrix is None or self._matrix.shape[0] != rows:
+            self._matrix = np.memmap(self.vectors_path, dtype=self.dtype, mode="r", shape=(rows, self.dim))
+        return self._matrix
+    
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        if vectors.ndim == 1:
+            vectors = vectors[None, :]
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+    
+    def _write_header(self):
+        tmp_path = self.header_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"dim": self.dim, "dtype": self.dtype.name, "generation": self.generation}, f)
+        os.replace(tmp_path, self.header_path)
+    
+    def upsert(self, ids: List[str], embeddings: List[List[float]], documents: List[str], metadatas: List[Dict]):
+        if not ids:
+            return
+        
+        vectors = self._normalize(np.asarray(embeddings, dtype=np.float32)).astype(self.dtype)
+        
+        with self._lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+                self._write_header()
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Expected embeddings of dimension {self.dim}, got {vectors.shape[1]}")
+            
+            with open(self.vectors_path, "ab") as f:
+                f.write(vectors.tobytes())
+            
+            records = []
+            for row_id, document, metadata in zip(ids, documents, metadatas):
+                records.append({"id": row_id, "document": document, "metadata": metadata})
+                self._append_row(row_id, document, metadata)
+            
+            with open(self.rows_path, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(record) + "\n" for record in records))
+            
+            self._sync_codes()
+            self._maybe_compact()
+    
+    def _alive_mask(self) -> np.ndarray:
+        return np.frombuffer(bytes(self.alive), dtype=bool).copy()
+    
+    def _maybe_compact(self):
+        if self.tombstones > self.compact_ratio * len(self.ids):
+            self.compact()
+    
+    def _filter_mask(self, where: Optional[Dict]) -> np.ndarray:
+        mask = self._alive_mask()
+        if not where:
+            return mask
+        
+        conditions = where["$and"] if "$and" in where else [where]
+        for condition in conditions:
+            for key, value in condition.items():
+                if isinstance(value, dict):
+                    raise ValueError(f"Unsupported filter operator for '{key}': {value}")
+                selected = np.zeros(len(self.ids), dtype=bool)
+                selected[self.postings.get((key, value), [])] = True
+                mask &= selected
+        return mask
+    
+    def query(self, query_embeddings: List[List[float]], n_results: int, where: Optional[Dict] = None) -> Dict:
+        results = {"ids": [], "distances": [], "documents": [], "metadatas": []}
+        if len(query_embeddings) == 0:
+            return results
+        queries = self._normalize(np.asarray(query_embeddings, dtype=np.float32))
+        
+        with self._lock:
+            matrix = self._matrix_view()
+            if not where and self.tombstones == 0:
+                candidates = np.arange(len(self.ids))
+            else:
+                candidates = np.flatnonzero(self._filter_mask(where))
+            
+            if len(candidates) == 0:
+                for _ in range(len(queries)):
+                    for key in results:
+                        results[key].append([])
+                return results
+            
+            top, top_scores = search(
+                queries,
+                matrix,
+                n_results,
+                codec=self.codec,
+                codes=self._codes_view() if self.codec is not None else None,
+                rescore_factor=self.rescore_factor,
+                rows=None if len(candidates) == len(self.ids) else candidates
+            )
+            
+            for row_indices, row_scores in zip(top, top_scores):
+                rows = candidates[row_indices]
+                results["ids"].append([self.ids[r] for r in rows])
+                results["distances"].append([float(1.0 - s) for s in row_scores])
+                results["documents"].append([self.documents[r] for r in rows])
+                results["metadatas"].append([self.metadatas[r] for r in rows])
+        
+        return results
+    
+    def delete(self, where: Dict):
+        with self._lock:
+            rows = np.flatnonzero(self._filter_mask(where))
+            if len(rows) == 0:
+                return
+            for row in rows:
+                self._tombstone(int(row))
+            with open(self.rows_path, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps({"delete": int(row)}) + "\n" for row in rows))
+            
+            self._maybe_compact()
+    
+    def compact(self):
+        with self._lock:
+            keep = np.flatnonzero(self._alive_mask())
+            matrix = self._matrix_view()
+            old_paths = [self.vectors_path, self.rows_path]
+            if self.codec is not None:
+                old_paths.append(self.codes_path)
+            
+            self.generation += 1
+            with open(self.vectors_path, "wb") as f:
+                for start in range(0, len(keep), 65536):
+                    f.write(np.ascontiguousarray(matrix[keep[start:start + 65536]]).tobytes())
+            with open(self.rows_path, "w", encoding="utf-8") as f:
+                for row in keep:
+                    f.write(json.dumps({
+                        "id": self.ids[row],
+                        "document": self.documents[row],
+                        "metadata": self.metadatas[row]
+                    }) + "\n")
+            
+            self._write_header()
+            self._matrix = None
+            self._codes = None
+            for path in old_paths:
+                path.unlink(missing_ok=True)
+            
+            self.ids, self.documents, self.metadatas = [], [], []
+            self.alive = bytearray()
+            self.row_of, self.postings = {}, {}
+            self.tombstones = 0
+            self._load()
+    
+    def count(self) -> int:
+        return len(self.alive) - self.alive.count(0)
+
+class FlatBackend(VectorBackend):
+    def __init__(self, persist_dir: str, collections: List[str], dtype: str = "float32", compact_ratio: float = 0.25,
+                 codec: Optional[VectorCodec] = None, rescore_factor: int = 10):
+        self.collections = {
+            name: FlatCollection(
+                Path(persist_dir) / name,
+                dtype=dtype,
+                compact_ratio=compact_ratio,
+                codec=codec,
+                rescore_factor=rescore_factor
+            )
+            for name in collections
+        }
+    
+    def upsert(self, collection: str, ids: List[str], embeddings: List[List[float]], documents: List[str],
+               metadatas: List[Dict]):
+        self.collections[collection].upsert(ids, embeddings, documents, metadatas)
+    
+    def query(self, collection: str, query_embeddings: List[List[float]], n_results: int,
+              where: Optional[Dict] = None) -> Dict:
+        return self.collections[collection].query(query_embeddings, n_results, where)
+    
+    def delete(self, collection: str, where: Dict):
+        self.collections[collection].delete(where)
+    
+    def count(self, collection: str) -> int:
+        return self.collections[collection].count()
\ No newline at end of file
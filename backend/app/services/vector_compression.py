@@ -0,0 +1,210 @@
+from pathlib import Path
+from typing import Optional, Tuple, Union
+import hashlib
+import numpy as np
+
+def _squared_distances(x: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    return (x * x).sum(axis=1, keepdims=True) - 2.0 * (x @ centroids.T) + (centroids * centroids).sum(axis=1)[None, :]
+
+def _block(array: np.ndarray, rows: Optional[np.ndarray], start: int, size: int) -> np.ndarray:
+    return array[start:start + size] if rows is None else array[rows[start:start + size]]
+
+def _kmeans(x: np.ndarray, k: int, iterations: int, rng: np.random.Generator) -> np.ndarray:
+    k = min(k, len(x))
+    centroids = x[rng.choice(len(x), size=k, replace=False)].copy()
+    
+    for _ in range(iterations):
+        assignments = _squared_distances(x, centroids).argmin(axis=1)
+        counts = np.bincount(assignments, minlength=k)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, x)
+        
+        empty = counts == 0
+        centroids[~empty] = sums[~empty] / counts[~empty, None]
+        if empty.any():
+            centroids[empty] = x[rng.choice(len(x), size=int(empty.sum()), replace=False)]
+    
+    return centroids.astype(np.float32)
+
+class VectorCodec:
+    def __init__(self, mean: np.ndarray, components: Optional[np.ndarray] = None,
+                 codebooks: Optional[np.ndarray] = None):
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.components = None if components is None else np.asarray(components, dtype=np.float32)
+        self.codebooks = None if codebooks is None else np.asarray(codebooks, dtype=np.float32)
+        
+        digest = hashlib.sha256(self.mean.tobytes())
+        for array in (self.components, self.codebooks):
+            if array is not None:
+                digest.update(array.tobytes())
+        self.codec_id = digest.hexdigest()[:16]
+    
+    @property
+    def input_dim(self) -> int:
+        return self.mean.shape[0]
+    
+    @property
+    def projected_dim(self) -> int:
+        return self.input_dim if self.components is None else self.components.shape[1]
+    
+    @property
+    def subspaces(self) -> int:
+        return 0 if self.codebooks is None else self.codebooks.shape[0]
+    
+    @property
+    def code_dtype(self) -> np.dtype:
+        if self.codebooks is None:
+            return np.dtype(np.float16)
+        return np.dtype(np.uint8 if self.codebooks.shape[1] <= 256 else np.uint16)
+    
+    @property
+    def code_width(self) -> int:
+        return self.projected_dim if self.codebooks is None else self.subspaces
+    
+    @property
+    def bytes_per_vector(self) -> int:
+        return self.code_width * self.code_dtype.itemsize
+    
+    def describe(self) -> str:
+        parts = []
+        if self.components is not None:
+            parts.append(f"pca{self.projected_dim}")
+        if self.codebooks is not None:
+            parts.append(f"pq{self.subspaces}x{self.codebooks.shape[1]}")
+        return "+".join(parts) or "identity"
+    
+    @classmethod
+    def fit(cls, sample: np.ndarray, pca_dim: Optional[int] = None, pq_subspaces: Optional[int] = None,
+            pq_centroids: int = 256, iterations: int = 20, seed: int = 0) -> "VectorCodec":
+        sample = np.asarray(sample, dtype=np.float32)
+        rng = np.random.default_rng(seed)
+        mean = sample.mean(axis=0)
+        centered = sample - mean
+        
+        components = None
+        if pca_dim:
+            _, _, vt = np.linalg.svd(centered, full_matrices=False)
+            components = vt[:pca_dim].T.astype(np.float32)
+            centered = centered @ components
+        
+        codebooks = None
+        if pq_subspaces:
+            dim = centered.shape[1]
+            if dim % pq_subspaces != 0:
+                raise ValueError(f"Projected dimension {dim} is not divisible by {pq_subspaces} subspaces")
+            width = dim // pq_subspaces
+            codebooks = np.stack([
+                _kmeans(centered[:, m * width:(m + 1) * width], pq_centroids, iterations, rng)
+                for m in range(pq_subspaces)
+            ])
+        
+        return cls(mean, components, codebooks)
+    
+    def project(self, vectors: np.ndarray) -> np.ndarray:
+        centered = np.asarray(vectors, dtype=np.float32) - self.mean
+        return centered if self.components is None else centered @ self.components
+    
+    def encode(self, vectors: np.ndarray, block_size: int = 65536) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.codebooks is None:
+            return self.project(vectors).astype(self.code_dtype)
+        
+        width = self.projected_dim // self.subspaces
+        codes = np.empty((len(vectors), self.subspaces), dtype=self.code_dtype)
+        for start in range(0, len(vectors), block_size):
+            projected = self.project(vectors[start:start + block_size])
+            for m in range(self.subspaces):
+                sub = projected[:, m * width:(m + 1) * width]
+                codes[start:start + len(sub), m] = _squared_distances(sub, self.codebooks[m]).argmin(axis=1)
+        return codes
+    
+    def scores(self, queries: np.ndarray, codes: np.ndarray, block_size: int = 65536,
+               rows: Optional[np.ndarray] = None) -> np.ndarray:
+        queries = np.asarray(queries, dtype=np.float32)
+        offsets = queries @ self.mean
+        projected = queries if self.components is None else queries @ self.components
+        count = len(codes) if rows is None else len(rows)
+        scores = np.empty((len(queries), count), dtype=np.float32)
+        
+        if self.codebooks is None:
+            for start in range(0, count, block_size):
+                block = np.asarray(_block(codes, rows, start, block_size), dtype=np.float32)
+                scores[:, start:start + len(block)] = projected @ block.T
+            return scores + offsets[:, None]
+        
+        width = self.projected_dim // self.subspaces
+        tables = np.stack([
+            projected[:, m * width:(m + 1) * width] @ self.codebooks[m].T
+            for m in range(self.subspaces)
+        ], axis=1)
+        
+        for start in range(0, count, block_size):
+            block = np.asarray(_block(codes, rows, start, block_size))
+            partial = np.zeros((len(queries), len(block)), dtype=np.float32)
+            for m in range(self.subspaces):
+                partial += tables[:, m, block[:, m]]
+            scores[:, start:start + len(block)] = partial
+        return scores + offsets[:, None]
+    
+    def save(self, path: Union[str, Path]):
+        arrays = {"mean": self.mean}
+        if self.components is not None:
+            arrays["components"] = self.components
+        if self.codebooks is not None:
+            arrays["codebooks"] = self.codebooks
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+    
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "VectorCodec":
+        with np.load(path) as data:
+            return cls(
+                data["mean"],
+                data["components"] if "components" in data else None,
+                data["codebooks"] if "codebooks" in data else None
+            )
+
+def top_k(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    k = min(k, scores.shape[1])
+    if k < scores.shape[1]:
+        indices = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        indices = np.tile(np.arange(scores.shape[1]), (scores.shape[0], 1))
+    values = np.take_along_axis(scores, indices, axis=1)
+    order = np.argsort(-values, axis=1, kind="stable")
+    return np.take_along_axis(indices, order, axis=1), np.take_along_axis(values, order, axis=1)
+
+def exact_scores(queries: np.ndarray, vectors: np.ndarray, rows: Optional[np.ndarray] = None,
+                 block_size: int = 65536) -> np.ndarray:
+    queries = np.asarray(queries, dtype=np.float32)
+    if rows is None and vectors.dtype == np.float32:
+        return queries @ vectors.T
+    
+    count = len(vectors) if rows is None else len(rows)
+    scores = np.empty((len(queries), count), dtype=np.float32)
+    for start in range(0, count, block_size):
+        block = np.asarray(_block(vectors, rows, start, block_size), dtype=np.float32)
+        scores[:, start:start + len(block)] = queries @ block.T
+    return scores
+
+def search(queries: np.ndarray, vectors: np.ndarray, k: int, codec: Optional[VectorCodec] = None,
+           codes: Optional[np.ndarray] = None, rescore_factor: int = 10,
+           rows: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    queries = np.asarray(queries, dtype=np.float32)
+    if codec is None:
+        return top_k(exact_scores(queries, vectors, rows), k)
+    
+    shortlist, approx = top_k(codec.scores(queries, codes, rows=rows), k * max(rescore_factor, 1))
+    if rescore_factor <= 1:
+        return shortlist[:, :k], approx[:, :k]
+    
+    indices = np.empty((len(queries), min(k, shortlist.shape[1])), dtype=np.int64)
+    values = np.empty(indices.shape, dtype=np.float32)
+    for qi, positions in enumerate(shortlist):
+        positions = np.sort(positions)
+        selected = positions if rows is None else rows[positions]
+        exact = np.asarray(vectors[selected], dtype=np.float32) @ queries[qi]
+        best, best_scores = top_k(exact[None, :], k)
+        indices[qi] = positions[best[0]]
+        values[qi] = best_scores[0]
+    return indices, values
\ No newline at end of file
@@ -1,72 +1,145 @@
-import chromadb
-from chromadb.config import Settings
 from typing import List, Dict, Optional
 from app.core.config import settings as app_settings
+from app.services.vector_backends import VectorBackend, ChromaBackend, FlatBackend
+from app.services.vector_compression import VectorCodec
 
-class VectorStore:
-    def __init__(self):
-        self.client = chromadb.PersistentClient(
-            path=app_settings.CHROMA_PERSIST_DIR,
-            settings=Settings(anonymized_telemetry=False)
-        )
-        self.resume_collection = self.client.get_or_create_collection(
-            name="resume_sections",
-            metadata={"hnsw:space": "cosine"}
-        )
-        self.jd_collection = self.client.get_or_create_collection(
-            name="jd_requirements",
-            metadata={"hnsw:space": "cosine"}
+RESUME_COLLECTION = "resume_sections"
+JD_COLLECTION = "jd_requirements"
+
+def create_backend(name: Optional[str] = None, persist_dir: Optional[str] = None) -> VectorBackend:
+    name = name or app_settings.VECTOR_BACKEND
+    collections = [RESUME_COLLECTION, JD_COLLECTION]
+    if name == "flat":
+        codec = VectorCodec.load(app_settings.VECTOR_CODEC_PATH) if app_settings.VECTOR_CODEC_PATH else None
+        return FlatBackend(
+            persist_dir or app_settings.FLAT_INDEX_DIR,
+            collections,
+            dtype=app_settings.FLAT_INDEX_DTYPE,
+            compact_ratio=app_settings.FLAT_INDEX_COMPACT_RATIO,
+            codec=codec,
+            rescore_factor=app_settings.VECTOR_RESCORE_FACTOR
         )
+    if name == "chroma":
+        return ChromaBackend(persist_dir or app_settings.CHROMA_PERSIST_DIR, collections)
+    raise ValueError(f"Unknown vector backend: {name}")
+
+class VectorStore:
+    def __init__(self, persist_dir: Optional[str] = None, batch_size: Optional[int] = None,
+                 backend: Optional[VectorBackend] = None):
+        self.backend = backend or create_backend(persist_dir=persist_dir)
+        
+        self.batch_size = batch_size or app_settings.VECTOR_UPSERT_BATCH_SIZE
+        if self.backend.max_batch_size is not None:
+            self.batch_size = min(self.batch_size, self.backend.max_batch_size)
     
-    def add_resume_sections(self, sections: List[Dict], embeddings: List[List[float]], resume_id: str):
+    def _upsert(self, collection: str, ids: List[str], embeddings: List[List[float]], documents: List[str],
+                metadatas: List[Dict], batch_size: Optional[int] = None):
+        batch_size = batch_size or self.batch_size
+        for start in range(0, len(ids), batch_size):
+            end = start + batch_size
+            self.backend.upsert(
+                collection,
+                ids[start:end],
+                embeddings[start:end],
+                documents[start:end],
+                metadatas[start:end]
+            )
+    
+    @staticmethod
+    def _where(**filters) -> Optional[Dict]:
+        conditions = [{key: value} for key, value in filters.items() if value is not None]
+        if not conditions:
+            return None
+        if len(conditions) == 1:
+            return conditions[0]
+        return {"$and": conditions}
+    
+    def _resume_rows(self, sections: List[Dict], resume_id: str):
         ids = [f"{resume_id}_section_{i}" for i in range(len(sections))]
         documents = [s.get("content", "") if isinstance(s.get("content"), str) else " ".join(s.get("content", [])) for s in sections]
         metadatas = [{"resume_id": resume_id, "title": s.get("title", ""), "section_index": i} for i, s in enumerate(sections)]
-        
-        self.resume_collection.add(
-            ids=ids,
-            embeddings=embeddings,
-            documents=documents,
-            metadatas=metadatas
-        )
+        return ids, documents, metadatas
     
-    def add_jd_requirements(self, requirements: List[str], embeddings: List[List[float]], jd_id: str):
+    def _jd_rows(self, requirements: List[str], jd_id: str, metadata: Optional[Dict] = None):
         ids = [f"{jd_id}_req_{i}" for i in range(len(requirements))]
-        metadatas = [{"jd_id": jd_id, "req_index": i} for i in range(len(requirements))]
-        
-        self.jd_collection.add(
-            ids=ids,
-            embeddings=embeddings,
-            documents=requirements,
-            metadatas=metadatas
-        )
+        metadatas = [{**(metadata or {}), "jd_id": jd_id, "req_index": i} for i in range(len(requirements))]
+        return ids, list(requirements), metadatas
+    
+    def add_resume_sections(self, sections: List[Dict], embeddings: List[List[float]], resume_id: str):
+        ids, documents, metadatas = self._resume_rows(sections, resume_id)
+        self._upsert(RESUME_COLLECTION, ids, list(embeddings), documents, metadatas)
+    
+    def add_jd_requirements(self, requirements: List[str], embeddings: List[List[float]], jd_id: str,
+                            metadata: Optional[Dict] = None):
+        ids, documents, metadatas = self._jd_rows(requirements, jd_id, metadata)
+        self._upsert(JD_COLLECTION, ids, list(embeddings), documents, metadatas)
+    
+    def upsert_resume_sections_many(self, resumes: List[Dict], batch_size: Optional[int] = None):
+        ids, embeddings, documents, metadatas = [], [], [], []
+        for resume in resumes:
+            resume_ids, resume_documents, resume_metadatas = self._resume_rows(resume["sections"], resume["resume_id"])
+            ids.extend(resume_ids)
+            embeddings.extend(resume["embeddings"])
+            documents.extend(resume_documents)
+            metadatas.extend(resume_metadatas)
+        self._upsert(RESUME_COLLECTION, ids, embeddings, documents, metadatas, batch_size)
     
-    def query_similar_sections(self, query_embedding: List[float], n_results: int = 5) -> Dict:
-        results = self.resume_collection.query(
-            query_embeddings=[query_embedding],
-            n_results=n_results
+    def upsert_jd_requirements_many(self, jds: List[Dict], batch_size: Optional[int] = None):
+        ids, embeddings, documents, metadatas = [], [], [], []
+        for jd in jds:
+            jd_ids, jd_documents, jd_metadatas = self._jd_rows(jd["requirements"], jd["jd_id"], jd.get("metadata"))
+            ids.extend(jd_ids)
+            embeddings.extend(jd["embeddings"])
+            documents.extend(jd_documents)
+            metadatas.extend(jd_metadatas)
+        self._upsert(JD_COLLECTION, ids, embeddings, documents, metadatas, batch_size)
+    
+    def query_sections_many(self, query_embeddings: List[List[float]], n_results: int = 5,
+                            resume_id: Optional[str] = None, title: Optional[str] = None) -> Dict:
+        return self.backend.query(
+            RESUME_COLLECTION,
+            list(query_embeddings),
+            n_results,
+            where=self._where(resume_id=resume_id, title=title)
         )
-        return results
     
-    def query_similar_requirements(self, query_embedding: List[float], n_results: int = 5) -> Dict:
-        results = self.jd_collection.query(
-            query_embeddings=[query_embedding],
-            n_results=n_results
+    def query_requirements_many(self, query_embeddings: List[List[float]], n_results: int = 5,
+                                jd_id: Optional[str] = None) -> Dict:
+        return self.backend.query(
+            JD_COLLECTION,
+            list(query_embeddings),
+            n_results,
+            where=self._where(jd_id=jd_id)
         )
-        return results
+    
+    def query_similar_sections(self, query_embedding: List[float], n_results: int = 5,
+                               resume_id: Optional[str] = None, title: Optional[str] = None) -> Dict:
+        return self.query_sections_many([query_embedding], n_results, resume_id=resume_id, title=title)
+    
+    def query_similar_requirements(self, query_embedding: List[float], n_results: int = 5,
+                                   jd_id: Optional[str] = None) -> Dict:
+        return self.query_requirements_many([query_embedding], n_results, jd_id=jd_id)
+    
+    def delete_sections(self, resume_id: Optional[str] = None, title: Optional[str] = None):
+        where = self._where(resume_id=resume_id, title=title)
+        if where is None:
+            raise ValueError("delete_sections requires at least one filter")
+        self.backend.delete(RESUME_COLLECTION, where)
+    
+    def delete_requirements(self, jd_id: Optional[str] = None):
+        where = self._where(jd_id=jd_id)
+        if where is None:
+            raise ValueError("delete_requirements requires at least one filter")
+        self.backend.delete(JD_COLLECTION, where)
     
     def clear_resume(self, resume_id: str):
-        try:
-            results = self.resume_collection.get(where={"resume_id": resume_id})
-            if results["ids"]:
-                self.resume_collection.delete(ids=results["ids"])
-        except Exception:
-            pass
+        self.delete_sections(resume_id=resume_id)
     
     def clear_jd(self, jd_id: str):
-        try:
-            results = self.jd_collection.get(where={"jd_id": jd_id})
-            if results["ids"]:
-                self.jd_collection.delete(ids=results["ids"])
-        except Exception:
-            pass
\ No newline at end of file
+        self.delete_requirements(jd_id=jd_id)
+    
+    def count(self) -> Dict[str, int]:
+        return {
+            RESUME_COLLECTION: self.backend.count(RESUME_COLLECTION),
+            JD_COLLECTION: self.backend.count(JD_COLLECTION)
+        }
\ No newline at end of file
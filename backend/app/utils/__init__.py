@@ -1 +1,2 @@
-from .logger import setup_logger, get_logger
\ No newline at end of file
+from .logger import setup_logger, get_logger
+from .loop_local import LoopLocal
\ No newline at end of file
@@ -0,0 +1,30 @@
+from typing import Callable, Dict, Generic, Optional, TypeVar
+import asyncio
+import threading
+
+T = TypeVar("T")
+
+class LoopLocal(Generic[T]):
+    def __init__(self, factory: Callable[[], T]):
+        self.factory = factory
+        self._values: Dict[asyncio.AbstractEventLoop, T] = {}
+        self._lock = threading.Lock()
+    
+    def get(self) -> T:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            for stale in [other for other in self._values if other.is_closed()]:
+                del self._values[stale]
+            value = self._values.get(loop)
+            if value is None:
+                value = self._values[loop] = self.factory()
+        return value
+    
+    def pop(self) -> Optional[T]:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            return self._values.pop(loop, None)
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._values)
\ No newline at end of file
@@ -0,0 +1,134 @@
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class StubOllamaServer:
+    def __init__(self, delay_ms: float):
+        self.delay_ms = delay_ms
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.active = 0
+        self.peak = 0
+        self.connections = 0
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def setup(self):
+                super().setup()
+                with server.lock:
+                    server.connections += 1
+            
+            def log_message(self, *args):
+                pass
+            
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if self.path != "/api/chat":
+                    self.send_error(404)
+                    return
+                
+                with server.lock:
+                    server.requests += 1
+                    server.active += 1
+                    server.peak = max(server.peak, server.active)
+                time.sleep(server.delay_ms / 1000)
+                with server.lock:
+                    server.active -= 1
+                
+                prompt = body["messages"][-1]["content"]
+                content = json.dumps({"before": prompt[:40], "after": f"{prompt[:40]} (improved)", "confidence": 0.8})
+                payload = json.dumps({
+                    "model": body.get("model"),
+                    "message": {"role": "assistant", "content": content},
+                    "done": True
+                }).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+        
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+    
+    def start(self):
+        self.thread.start()
+        return self
+    
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+    
+    def reset(self):
+        with self.lock:
+            self.requests = 0
+            self.peak = 0
+            self.connections = 0
+
+async def measure(handler, requests: int):
+    lag = {"max": 0.0}
+    stop = asyncio.Event()
+    
+    async def ticker():
+        while not stop.is_set():
+            expected = time.perf_counter() + 0.01
+            await asyncio.sleep(0.01)
+            lag["max"] = max(lag["max"], time.perf_counter() - expected)
+    
+    tick = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    results = await asyncio.gather(*(handler(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await tick
+    return elapsed, lag["max"], results
+
+async def run(args):
+    server = StubOllamaServer(args.delay_ms).start()
+    os.environ["OLLAMA_HOST"] = server.url
+    
+    from app.core.config import settings
+    settings.OLLAMA_BASE_URL = server.url
+    settings.LLM_CACHE_ENABLED = False
+    settings.USE_LANGFUSE = False
+    settings.OLLAMA_POOL_MAX_CONNECTIONS = args.pool
+    settings.OLLAMA_POOL_MAX_KEEPALIVE = args.pool
+    from app.services.llm_service import LLMService
+    
+    llm = LLMService()
+    prompts = [f"Rephrase resume fact number {i} to highlight python" for i in range(args.requests)]
+    
+    async def blocking_handler(i):
+        return llm.generate_json(prompts[i], "Output valid JSON only")
+    
+    async def async_handler(i):
+        return await llm.agenerate_json(prompts[i], "Output valid JSON only")
+    
+    print(f"{args.requests} concurrent requests, stub /api/chat latency {args.delay_ms:.0f} ms, pool={args.pool}")
+    print(f"{'path':>18} {'total s':>9} {'max loop lag ms':>16} {'server peak':>12} {'connections':>12} {'parsed':>7}")
+    for name, handler in (("sync in handler", blocking_handler), ("async pooled", async_handler)):
+        server.reset()
+        elapsed, lag, results = await measure(handler, args.requests)
+        parsed = sum(1 for r in results if "after" in r)
+        print(f"{name:>18} {elapsed:>9.2f} {lag * 1000:>16.1f} {server.peak:>12} {server.connections:>12} {parsed:>7}")
+    
+    await llm.aclose()
+    server.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="Blocking ollama.chat vs pooled httpx.AsyncClient against a stub Ollama /api/chat server")
+    parser.add_argument("--requests", type=int, default=16)
+    parser.add_argument("--delay-ms", type=float, default=250.0)
+    parser.add_argument("--pool", type=int, default=8)
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,161 @@
+import argparse
+import json
+import subprocess
+import sys
+import time
+from typing import Dict, List
+import numpy as np
+
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+RERANKER_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+NLI_MODEL = "cross-encoder/nli-deberta-v3-small"
+
+TEXTS = [
+    "Built REST APIs in Python with FastAPI and PostgreSQL serving 2M requests per day",
+    "Led a team of 5 engineers to migrate services to Kubernetes on AWS",
+    "Experience with machine learning pipelines using PyTorch and scikit-learn",
+    "Strong communication skills and experience working in agile teams",
+    "Designed CI/CD pipelines with Jenkins, Docker and Terraform",
+    "5+ years of experience building distributed backend systems",
+    "Reduced infrastructure cost by 30% through autoscaling and caching",
+    "Bachelor's degree in Computer Science or related field",
+]
+
+NLI_PAIRS = [
+    ("Worked at Acme Corp from 2019 to 2022 as a backend engineer", "Worked at Acme Corp from 2015 to 2016"),
+    ("Managed a team of 5 engineers", "Managed a team of 5 engineers using agile practices"),
+    ("Reduced latency by 40% in 2021", "Increased latency by 40% in 2021"),
+    ("Built data pipelines in Python processing 10TB daily", "Built Python data pipelines processing 10TB per day"),
+    ("Graduated in 2018 with a BSc in Physics", "Never attended university"),
+]
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def load_models(backend: str, quantized: bool):
+    if backend == "onnx":
+        from app.services.onnx_backend import OnnxSentenceEncoder, OnnxCrossEncoder, OnnxTextClassifier
+        return (
+            OnnxSentenceEncoder.from_pretrained(EMBEDDING_MODEL, quantized=quantized),
+            OnnxCrossEncoder.from_pretrained(RERANKER_MODEL, quantized=quantized),
+            OnnxTextClassifier.from_pretrained(NLI_MODEL, quantized=quantized),
+        )
+    from sentence_transformers import SentenceTransformer, CrossEncoder
+    from transformers import pipeline
+    return (
+        SentenceTransformer(EMBEDDING_MODEL),
+        CrossEncoder(RERANKER_MODEL),
+        pipeline("text-classification", model=NLI_MODEL),
+    )
+
+def run_models(models, repeat: int) -> Dict[str, float]:
+    encoder, reranker, classifier = models
+    pairs = [[TEXTS[0], t] for t in TEXTS]
+    nli_inputs = [f"{p} [SEP] {h}" for p, h in NLI_PAIRS]
+    
+    timings = {}
+    for name, fn in [
+        ("encode_ms", lambda: encoder.encode(TEXTS, convert_to_numpy=True)),
+        ("rerank_ms", lambda: reranker.predict(pairs)),
+        ("nli_ms", lambda: [classifier(x) for x in nli_inputs]),
+    ]:
+        fn()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        timings[name] = (time.perf_counter() - start) * 1000 / repeat
+    return timings
+
+def measure(backend: str, quantized: bool, repeat: int) -> Dict:
+    base_rss = rss_mb()
+    start = time.perf_counter()
+    models = load_models(backend, quantized)
+    load_ms = (time.perf_counter() - start) * 1000
+    result = {"backend": backend, "quantized": quantized, "load_ms": load_ms, "rss_delta_mb": rss_mb() - base_rss}
+    result.update(run_models(models, repeat))
+    return result
+
+def cosine_rows(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return (a * b).sum(axis=1)
+
+def parity(quantized: bool, min_cosine: float, min_rank_agreement: float, min_label_agreement: float,
+           max_score_delta: float) -> bool:
+    torch_models = load_models("torch", quantized)
+    onnx_models = load_models("onnx", quantized)
+    
+    cosines = cosine_rows(
+        np.asarray(torch_models[0].encode(TEXTS, convert_to_numpy=True)),
+        np.asarray(onnx_models[0].encode(TEXTS, convert_to_numpy=True))
+    )
+    
+    pairs = [[TEXTS[0], t] for t in TEXTS]
+    torch_scores = np.asarray(torch_models[1].predict(pairs), dtype=np.float32)
+    onnx_scores = np.asarray(onnx_models[1].predict(pairs), dtype=np.float32)
+    score_delta = float(np.abs(torch_scores - onnx_scores).max())
+    torch_order = np.argsort(-torch_scores)
+    onnx_order = np.argsort(-onnx_scores)
+    rank_agreement = float(np.mean(torch_order == onnx_order))
+    
+    nli_inputs = [f"{p} [SEP] {h}" for p, h in NLI_PAIRS]
+    torch_labels = [torch_models[2](x)[0]["label"].lower() for x in nli_inputs]
+    onnx_labels = [onnx_models[2](x)[0]["label"].lower() for x in nli_inputs]
+    label_agreement = float(np.mean([a == b for a, b in zip(torch_labels, onnx_labels)]))
+    
+    checks = [
+        ("embedding min cosine", float(cosines.min()), min_cosine, True),
+        ("reranker rank agreement", rank_agreement, min_rank_agreement, True),
+        ("reranker max score delta", score_delta, max_score_delta, False),
+        ("nli label agreement", label_agreement, min_label_agreement, True),
+    ]
+    ok = True
+    for name, value, threshold, higher_is_better in checks:
+        passed = value >= threshold if higher_is_better else value <= threshold
+        ok = ok and passed
+        print(f"{name:<26} {value:.4f} (threshold {threshold:.2f}) {'PASS' if passed else 'FAIL'}")
+    return ok
+
+def main(argv: List[str]):
+    parser = argparse.ArgumentParser(description="ONNX vs torch parity, latency and memory")
+    parser.add_argument("--fp32", action="store_true", help="Compare the unquantized ONNX export")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--min-cosine", type=float, default=0.98)
+    parser.add_argument("--min-rank-agreement", type=float, default=0.75)
+    parser.add_argument("--max-score-delta", type=float, default=1.0)
+    parser.add_argument("--min-label-agreement", type=float, default=0.8)
+    parser.add_argument("--measure", choices=["torch", "onnx"], help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    quantized = not args.fp32
+    
+    if args.measure:
+        print(json.dumps(measure(args.measure, quantized, args.repeat)))
+        return
+    
+    ok = parity(quantized, args.min_cosine, args.min_rank_agreement, args.min_label_agreement, args.max_score_delta)
+    
+    rows = []
+    for backend in ["torch", "onnx"]:
+        cmd = [sys.executable, "-m", "benchmarks.bench_onnx_backend", "--measure", backend, "--repeat", str(args.repeat)]
+        if args.fp32:
+            cmd.append("--fp32")
+        output = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+        rows.append(json.loads(output.strip().splitlines()[-1]))
+    
+    print(f"\n{'backend':>8} {'load ms':>9} {'rss MB':>8} {'encode ms':>10} {'rerank ms':>10} {'nli ms':>8}")
+    for row in rows:
+        print(f"{row['backend']:>8} {row['load_ms']:>9.0f} {row['rss_delta_mb']:>8.0f} {row['encode_ms']:>10.1f} {row['rerank_ms']:>10.1f} {row['nli_ms']:>8.1f}")
+    
+    if not ok:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
\ No newline at end of file
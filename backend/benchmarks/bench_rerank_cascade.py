@@ -0,0 +1,79 @@
+import argparse
+import time
+import numpy as np
+from app.services.embedding_service import EmbeddingService
+from app.services.matching_engine import MatchingEngine
+
+RESUME_SECTIONS = [
+    {"title": "summary", "content": ["Backend engineer with 6 years of experience building Python services and data platforms"]},
+    {"title": "experience", "content": [
+        "Built REST APIs with FastAPI and PostgreSQL serving 2M requests per day",
+        "Migrated 40 services to Kubernetes on AWS and cut deploy time by 70%",
+        "Led a team of 5 engineers using Scrum",
+    ]},
+    {"title": "experience", "content": [
+        "Designed streaming ETL pipelines with Kafka and Spark",
+        "Introduced CI/CD with Jenkins, Docker and Terraform",
+    ]},
+    {"title": "projects", "content": ["Trained gradient boosted models with scikit-learn for churn prediction"]},
+    {"title": "skills", "content": ["Python, Go, SQL, Docker, Kubernetes, AWS, Terraform, Kafka, Spark"]},
+    {"title": "education", "content": ["BSc Computer Science, 2016"]},
+    {"title": "awards", "content": ["Hackathon winner for an internal search tool"]},
+    {"title": "certifications", "content": ["AWS Certified Solutions Architect"]},
+]
+
+JD_REQUIREMENTS = [
+    "5+ years of backend development in Python",
+    "Experience operating services on Kubernetes in a public cloud",
+    "Hands-on experience with infrastructure as code",
+    "Experience building batch and streaming data pipelines",
+    "Familiarity with machine learning workflows",
+    "Experience mentoring or leading engineers",
+    "Strong SQL and relational database design skills",
+    "Degree in computer science or equivalent",
+    "Experience designing public APIs",
+    "Cloud certification is a plus",
+]
+
+def section_texts():
+    return [" ".join(s["content"]) for s in RESUME_SECTIONS]
+
+def main():
+    parser = argparse.ArgumentParser(description="Bi-encoder shortlist + cross-encoder rerank: quality vs latency by k")
+    parser.add_argument("--ks", type=int, nargs="+", default=[1, 2, 3, 5, 8])
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    embedding_service = EmbeddingService()
+    engine = MatchingEngine(None, embedding_service)
+    engine.rerank_enabled = True
+    engine.rerank_batch_size = args.batch_size
+    
+    texts = section_texts()
+    similarity_matrix = embedding_service.similarity_matrix(JD_REQUIREMENTS, texts)
+    
+    exhaustive = embedding_service.rerank_pairs(
+        [[req, text] for req in JD_REQUIREMENTS for text in texts], batch_size=args.batch_size
+    ).reshape(len(JD_REQUIREMENTS), len(texts))
+    oracle = exhaustive.argmax(axis=1)
+    bi_encoder_only = similarity_matrix.argmax(axis=1)
+    
+    print(f"{len(JD_REQUIREMENTS)} requirements x {len(texts)} sections")
+    print(f"{'k':>4} {'ce pairs':>9} {'latency ms':>11} {'top1 vs full CE':>16} {'mean CE score':>14}")
+    print(f"{'bi':>4} {0:>9} {0.0:>11.1f} {np.mean(bi_encoder_only == oracle):>16.2f} "
+          f"{exhaustive[np.arange(len(oracle)), bi_encoder_only].mean():>14.3f}")
+    
+    for k in args.ks:
+        engine.rerank_top_k = k
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            chosen, _ = engine._rerank_evidence(JD_REQUIREMENTS, texts, similarity_matrix)
+        latency_ms = (time.perf_counter() - start) * 1000 / args.repeat
+        chosen = np.asarray(chosen)
+        pairs = len(JD_REQUIREMENTS) * min(k, len(texts))
+        print(f"{k:>4} {pairs:>9} {latency_ms:>11.1f} {np.mean(chosen == oracle):>16.2f} "
+              f"{exhaustive[np.arange(len(oracle)), chosen].mean():>14.3f}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,102 @@
+import argparse
+import hashlib
+import time
+from typing import Dict, List
+import numpy as np
+from app.core.config import settings
+from app.services import embedding_service as embedding_module
+from app.services.embedding_service import EmbeddingService
+from app.services.matching_engine import MatchingEngine
+
+class CountingEncoder:
+    def __init__(self, model=None, dim: int = 384, call_overhead_ms: float = 4.0, per_text_ms: float = 0.5):
+        self.model = model
+        self.dim = dim
+        self.call_overhead_ms = call_overhead_ms
+        self.per_text_ms = per_text_ms
+        self.calls = 0
+        self.texts = 0
+    
+    def encode(self, texts: List[str], convert_to_numpy: bool = True, **kwargs) -> np.ndarray:
+        self.calls += 1
+        self.texts += len(texts)
+        if self.model is not None:
+            return self.model.encode(texts, convert_to_numpy=convert_to_numpy, **kwargs)
+        
+        time.sleep((self.call_overhead_ms + self.per_text_ms * len(texts)) / 1000)
+        vectors = []
+        for text in texts:
+            seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:4], "little")
+            vectors.append(np.random.default_rng(seed).standard_normal(self.dim).astype(np.float32))
+        return np.vstack(vectors)
+    
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dim
+    
+    def reset(self):
+        self.calls = 0
+        self.texts = 0
+
+def pairwise_semantic_fit(embedding_service: EmbeddingService, resume_sections: List[Dict], jd_requirements: List[str]) -> float:
+    total_similarity = 0.0
+    for requirement in jd_requirements:
+        best = 0.0
+        for section in resume_sections:
+            section_text = " ".join(section["content"])
+            if not section_text.strip():
+                continue
+            best = max(best, embedding_service.compute_similarity(requirement, section_text))
+        total_similarity += best
+    return total_similarity / len(jd_requirements)
+
+def build_inputs(section_count: int, requirement_count: int):
+    sections = [
+        {"title": f"section {i}", "content": [f"Delivered project {i}.{j} using python, docker and aws" for j in range(4)]}
+        for i in range(section_count)
+    ]
+    requirements = [f"Experience with technology area {i} in production systems" for i in range(requirement_count)]
+    return sections, requirements
+
+def main():
+    parser = argparse.ArgumentParser(description="Pairwise vs batched semantic fit")
+    parser.add_argument("--sections", type=int, default=8)
+    parser.add_argument("--requirements", type=int, default=15)
+    parser.add_argument("--model", help="Load a real SentenceTransformer (e.g. all-MiniLM-L6-v2) instead of the stub")
+    args = parser.parse_args()
+    
+    model = None
+    if args.model:
+        from sentence_transformers import SentenceTransformer
+        model = SentenceTransformer(args.model)
+    
+    encoder = CountingEncoder(model)
+    settings.EMBEDDING_CACHE_SIZE = 0
+    settings.EMBEDDING_CACHE_DIR = None
+    settings.MICRO_BATCHING_ENABLED = False
+    settings.INFERENCE_BACKEND = "torch"
+    embedding_module.SentenceTransformer = lambda name: encoder
+    embedding_module.CrossEncoder = lambda name: None
+    embedding_service = EmbeddingService()
+    engine = MatchingEngine(None, embedding_service)
+    
+    sections, requirements = build_inputs(args.sections, args.requirements)
+    
+    encoder.reset()
+    start = time.perf_counter()
+    before_score = pairwise_semantic_fit(embedding_service, sections, requirements)
+    before_ms = (time.perf_counter() - start) * 1000
+    before_calls, before_texts = encoder.calls, encoder.texts
+    
+    encoder.reset()
+    start = time.perf_counter()
+    after_score, _ = engine._compute_semantic_fit(sections, requirements)
+    after_ms = (time.perf_counter() - start) * 1000
+    after_calls, after_texts = encoder.calls, encoder.texts
+    
+    print(f"{args.sections} sections x {args.requirements} requirements")
+    print(f"{'':>10} {'encode calls':>13} {'texts encoded':>14} {'latency ms':>11} {'semantic_fit':>13}")
+    print(f"{'pairwise':>10} {before_calls:>13} {before_texts:>14} {before_ms:>11.1f} {before_score:>13.4f}")
+    print(f"{'batched':>10} {after_calls:>13} {after_texts:>14} {after_ms:>11.1f} {after_score:>13.4f}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,93 @@
+import argparse
+import random
+import re
+import time
+from typing import Dict, List, Tuple
+from app.services.skill_matcher import SkillMatcher
+
+SYLLABLES = ["ka", "lo", "mi", "tra", "ven", "dex", "sor", "pli", "qua", "rin", "zo", "tek", "nar", "vil", "os"]
+
+def build_taxonomy(skill_count: int, synonyms_per_skill: int, seed: int = 7) -> Tuple[Dict[str, Dict], Dict[str, List[str]]]:
+    rng = random.Random(seed)
+    skills_db = {}
+    skill_synonyms = {}
+    seen = set()
+    
+    while len(skills_db) < skill_count:
+        words = ["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(rng.randint(1, 3))]
+        name = " ".join(words)
+        if name in seen:
+            continue
+        seen.add(name)
+        
+        skill_id = f"S{len(skills_db)}"
+        skills_db[skill_id] = {"name": name, "type": "technical", "category": "synthetic"}
+        skill_synonyms[skill_id] = [f"{name} {suffix}" for suffix in ["development", "programming", "framework", "engineering", "tooling", "expertise", "platform", "systems"][:synonyms_per_skill]]
+    
+    return skills_db, skill_synonyms
+
+def build_document(skills_db: Dict[str, Dict], words: int = 800, skill_mentions: int = 25, seed: int = 11) -> str:
+    rng = random.Random(seed)
+    filler = ["designed", "built", "the", "team", "service", "with", "and", "for", "using", "delivered", "led", "data"]
+    tokens = [rng.choice(filler) for _ in range(words)]
+    names = [s["name"] for s in skills_db.values()]
+    for _ in range(skill_mentions):
+        tokens.insert(rng.randrange(len(tokens)), rng.choice(names))
+    return " ".join(tokens)
+
+def regex_loop(skills_db: Dict[str, Dict], skill_synonyms: Dict[str, List[str]]):
+    patterns = {}
+    for skill_id, skill_data in skills_db.items():
+        terms = [skill_data["name"]] + skill_synonyms.get(skill_id, [])
+        patterns[skill_id] = [re.compile(r'\b' + re.escape(term) + r'\b', re.IGNORECASE) for term in terms]
+    
+    def run(text: str) -> List[str]:
+        found = []
+        for skill_id, skill_patterns in patterns.items():
+            for pattern in skill_patterns:
+                if pattern.findall(text):
+                    found.append(skill_id)
+                    break
+        return found
+    
+    return run
+
+def time_call(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-term regex loop vs single-pass SkillMatcher")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[40, 1000, 13000])
+    parser.add_argument("--synonyms", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    print(f"{'skills':>8} {'terms':>8} {'regex build ms':>15} {'regex scan ms':>14} {'ac build ms':>12} {'ac scan ms':>11} {'speedup':>8}")
+    for size in args.sizes:
+        skills_db, skill_synonyms = build_taxonomy(size, args.synonyms)
+        text = build_document(skills_db).lower()
+        term_count = size + sum(len(v) for v in skill_synonyms.values())
+        
+        start = time.perf_counter()
+        regex_run = regex_loop(skills_db, skill_synonyms)
+        regex_build = (time.perf_counter() - start) * 1000
+        
+        start = time.perf_counter()
+        matcher = SkillMatcher.from_taxonomy(skills_db, skill_synonyms)
+        ac_build = (time.perf_counter() - start) * 1000
+        
+        expected = regex_run(text)
+        actual = [m["skill_id"] for m in matcher.match_skills(text)]
+        if expected != actual:
+            raise SystemExit(f"Result mismatch at {size} skills: {len(expected)} vs {len(actual)}")
+        
+        regex_scan = time_call(lambda: regex_run(text), args.repeat)
+        ac_scan = time_call(lambda: matcher.match_skills(text), args.repeat)
+        
+        print(f"{size:>8} {term_count:>8} {regex_build:>15.1f} {regex_scan:>14.2f} {ac_build:>12.1f} {ac_scan:>11.2f} {regex_scan / ac_scan:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
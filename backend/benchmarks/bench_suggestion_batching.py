@@ -0,0 +1,102 @@
+import argparse
+import json
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+from app.services.rewrite_agent import RewriteAgent
+
+class StubLLM:
+    def __init__(self, call_overhead_ms: float = 300.0, per_token_ms: float = 0.5, malformed_rate: float = 0.0, seed: int = 0):
+        self.call_overhead_ms = call_overhead_ms
+        self.per_token_ms = per_token_ms
+        self.malformed_rate = malformed_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+    
+    def _tokens(self, text: str) -> int:
+        return int(len(text.split()) * 1.3) + 1
+    
+    def generate_json(self, prompt: str, system_prompt: Optional[str] = None, trace=None) -> Dict:
+        tokens = self._tokens(prompt) + self._tokens(system_prompt or "")
+        with self.lock:
+            self.calls += 1
+            self.prompt_tokens += tokens
+            malformed = self.rng.random() < self.malformed_rate
+        time.sleep((self.call_overhead_ms + self.per_token_ms * tokens) / 1000)
+        
+        if "Tasks:\n" in prompt:
+            if malformed:
+                return {"error": "Failed to parse JSON", "raw_response": "{\"suggestions\": ["}
+            tasks = json.loads(prompt.split("Tasks:\n", 1)[1].split("\n\nOutput JSON format", 1)[0])
+            return {"suggestions": [self._answer(task.get("missing_skill") or task["requirement"], task["id"]) for task in tasks]}
+        
+        if "Missing Skill: " in prompt:
+            return self._answer(prompt.split("Missing Skill: ", 1)[1].split("\n", 1)[0])
+        return self._answer(prompt.split("Job Requirement:\n", 1)[1].split("\n", 1)[0])
+    
+    def _answer(self, topic: str, item_id: Optional[int] = None) -> Dict:
+        answer = {
+            "before": "Built data pipelines for reporting",
+            "after": f"Built data pipelines for reporting, applying {topic}",
+            "reasoning": f"Highlights {topic}",
+            "confidence": 0.8
+        }
+        if item_id is not None:
+            answer["id"] = item_id
+        return answer
+
+class StubContradictionChecker:
+    def check_suggestions_against_resume(self, resume_facts: List[str], suggestions: List[str]) -> List[Dict]:
+        return [{"has_contradiction": False, "contradictions": [], "penalty": 0.0} for _ in suggestions]
+
+def build_inputs(missing_count: int, evidence_count: int):
+    resume_data = {
+        "sections": [
+            {"title": "experience", "content": [f"Built data pipelines for reporting across team {i} with measurable impact" for i in range(12)]}
+        ]
+    }
+    jd_data = {"raw_text": "We are hiring a data engineer to build reliable pipelines and platform services. " * 10}
+    match_results = {
+        "skill_overlap": {"missing": [{"id": f"skill_{i}", "name": f"skill {i}"} for i in range(missing_count)]},
+        "semantic_evidence": [
+            {"requirement": f"Requirement {i} about platform ownership", "matched_text": f"Owned platform component {i}", "similarity": 0.55}
+            for i in range(evidence_count)
+        ]
+    }
+    return resume_data, jd_data, match_results
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-item vs batched suggestion prompts against a stub LLM")
+    parser.add_argument("--missing-skills", type=int, default=5)
+    parser.add_argument("--evidence", type=int, default=3)
+    parser.add_argument("--analyses", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--call-overhead-ms", type=float, default=300.0)
+    parser.add_argument("--per-token-ms", type=float, default=0.5)
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="Fraction of batched responses returned as broken JSON")
+    args = parser.parse_args()
+    
+    resume_data, jd_data, match_results = build_inputs(args.missing_skills, args.evidence)
+    
+    print(f"{args.analyses} analyses, {args.missing_skills} missing skills + {args.evidence} evidence items, concurrency={args.concurrency}")
+    print(f"{'mode':>10} {'LLM calls':>10} {'prompt tokens':>14} {'latency s':>10} {'suggestions':>12}")
+    for mode in ("per_item", "batched"):
+        llm = StubLLM(args.call_overhead_ms, args.per_token_ms, args.malformed_rate)
+        agent = RewriteAgent(llm, StubContradictionChecker(), max_concurrency=args.concurrency, deadline_seconds=0, mode=mode)
+        
+        suggestions = 0
+        start = time.perf_counter()
+        for _ in range(args.analyses):
+            suggestions += len(agent.generate_suggestions(resume_data, jd_data, match_results))
+        elapsed = time.perf_counter() - start
+        
+        print(f"{mode:>10} {llm.calls:>10} {llm.prompt_tokens:>14} {elapsed:>10.2f} {suggestions:>12}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,79 @@
+import argparse
+import shutil
+import tempfile
+import time
+import numpy as np
+from app.services.vector_store import VectorStore, create_backend
+
+def random_unit_vectors(count: int, dim: int, seed: int) -> np.ndarray:
+    vectors = np.random.default_rng(seed).standard_normal((count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+def load(store: VectorStore, vectors: np.ndarray, reqs_per_jd: int, chunk: int = 20000) -> float:
+    start = time.perf_counter()
+    for offset in range(0, len(vectors), chunk):
+        block = vectors[offset:offset + chunk]
+        jds = []
+        for i in range(0, len(block), reqs_per_jd):
+            jd_index = (offset + i) // reqs_per_jd
+            rows = block[i:i + reqs_per_jd]
+            jds.append({
+                "jd_id": f"jd_{jd_index}",
+                "requirements": [f"requirement {j} of jd {jd_index}" for j in range(len(rows))],
+                "embeddings": rows.tolist()
+            })
+        store.upsert_jd_requirements_many(jds)
+    return time.perf_counter() - start
+
+def measure_queries(store: VectorStore, queries: np.ndarray, k: int):
+    latencies = []
+    ids = []
+    for query in queries:
+        start = time.perf_counter()
+        result = store.query_similar_requirements(query.tolist(), n_results=k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        ids.append(result["ids"][0])
+    
+    start = time.perf_counter()
+    store.query_requirements_many(queries.tolist(), n_results=k)
+    batch_ms = (time.perf_counter() - start) * 1000
+    return np.percentile(latencies, 50), np.percentile(latencies, 95), batch_ms, ids
+
+def recall(found, expected) -> float:
+    hits = sum(len(set(f) & set(e)) for f, e in zip(found, expected))
+    return hits / max(sum(len(e) for e in expected), 1)
+
+def main():
+    parser = argparse.ArgumentParser(description="Chroma vs in-process flat/mmap vector backend")
+    parser.add_argument("--sizes", default="10000,100000", help="Comma-separated vector counts, e.g. 10000,100000,1000000")
+    parser.add_argument("--backends", default="chroma,flat")
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--reqs-per-jd", type=int, default=10)
+    parser.add_argument("--dtype", default="float32", choices=["float32", "float16"])
+    args = parser.parse_args()
+    
+    from app.core.config import settings
+    settings.FLAT_INDEX_DTYPE = args.dtype
+    
+    print(f"{'vectors':>9} {'backend':>8} {'load s':>8} {'vec/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'batch ms':>9} {'recall@k':>9}")
+    for size in [int(s) for s in args.sizes.split(",")]:
+        vectors = random_unit_vectors(size, args.dim, seed=size)
+        queries = random_unit_vectors(args.queries, args.dim, seed=size + 1)
+        exact = np.argsort(-(queries @ vectors.T), axis=1)[:, :args.k]
+        expected = [[f"jd_{row // args.reqs_per_jd}_req_{row % args.reqs_per_jd}" for row in rows] for rows in exact]
+        
+        for backend_name in args.backends.split(","):
+            persist_dir = tempfile.mkdtemp(prefix=f"bench_{backend_name}_")
+            try:
+                store = VectorStore(backend=create_backend(backend_name, persist_dir))
+                load_s = load(store, vectors, args.reqs_per_jd)
+                p50, p95, batch_ms, ids = measure_queries(store, queries, args.k)
+                print(f"{size:>9} {backend_name:>8} {load_s:>8.1f} {size / load_s:>9.0f} {p50:>8.2f} {p95:>8.2f} "
+                      f"{batch_ms:>9.1f} {recall(ids, expected):>9.3f}")
+            finally:
+                shutil.rmtree(persist_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,71 @@
+import argparse
+import shutil
+import tempfile
+import time
+import numpy as np
+from app.services.vector_store import VectorStore
+
+def random_unit_vectors(count: int, dim: int, seed: int) -> np.ndarray:
+    vectors = np.random.default_rng(seed).standard_normal((count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+def build_jds(jd_count: int, reqs_per_jd: int, dim: int, offset: int = 0):
+    embeddings = random_unit_vectors(jd_count * reqs_per_jd, dim, seed=offset)
+    jds = []
+    for i in range(jd_count):
+        rows = embeddings[i * reqs_per_jd:(i + 1) * reqs_per_jd]
+        jds.append({
+            "jd_id": f"jd_{offset + i}",
+            "requirements": [f"requirement {j} of jd {offset + i}" for j in range(reqs_per_jd)],
+            "embeddings": rows.tolist()
+        })
+    return jds
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-document vs bulk VectorStore throughput on a local persistent Chroma dir")
+    parser.add_argument("--jds", type=int, default=2000)
+    parser.add_argument("--reqs-per-jd", type=int, default=8)
+    parser.add_argument("--queries", type=int, default=64)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--persist-dir", help="Chroma directory to use (defaults to a temporary dir that is removed afterwards)")
+    args = parser.parse_args()
+    
+    persist_dir = args.persist_dir or tempfile.mkdtemp(prefix="bench_chroma_")
+    try:
+        store = VectorStore(persist_dir=persist_dir, batch_size=args.batch_size)
+        half = args.jds // 2
+        per_doc_jds = build_jds(half, args.reqs_per_jd, args.dim)
+        bulk_jds = build_jds(args.jds - half, args.reqs_per_jd, args.dim, offset=half)
+        vectors = args.reqs_per_jd
+        
+        per_doc_s = timed(lambda: [
+            store.add_jd_requirements(jd["requirements"], jd["embeddings"], jd["jd_id"]) for jd in per_doc_jds
+        ])
+        bulk_s = timed(lambda: store.upsert_jd_requirements_many(bulk_jds))
+        
+        queries = random_unit_vectors(args.queries, args.dim, seed=10 ** 6).tolist()
+        single_s = timed(lambda: [store.query_similar_requirements(q, n_results=10) for q in queries])
+        many_s = timed(lambda: store.query_requirements_many(queries, n_results=10))
+        filtered_s = timed(lambda: store.query_requirements_many(queries, n_results=5, jd_id=bulk_jds[0]["jd_id"]))
+        
+        delete_s = timed(lambda: [store.clear_jd(jd["jd_id"]) for jd in bulk_jds[:100]])
+        
+        print(f"{args.jds} JDs x {args.reqs_per_jd} requirements, dim={args.dim}, batch_size={store.batch_size}")
+        print(f"{'per-document add':>22}: {len(per_doc_jds) * vectors / per_doc_s:>10.0f} vectors/s")
+        print(f"{'bulk upsert':>22}: {len(bulk_jds) * vectors / bulk_s:>10.0f} vectors/s")
+        print(f"{'single queries':>22}: {args.queries / single_s:>10.1f} queries/s")
+        print(f"{'multi-query':>22}: {args.queries / many_s:>10.1f} queries/s")
+        print(f"{'filtered multi-query':>22}: {args.queries / filtered_s:>10.1f} queries/s")
+        print(f"{'delete-by-filter':>22}: {100 / delete_s:>10.1f} JDs/s")
+    finally:
+        if not args.persist_dir:
+            shutil.rmtree(persist_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,36 @@
+import argparse
+import time
+from pathlib import Path
+from app.services.taxonomy_artifact import build_artifact, load_artifact, read_taxonomy_csv
+from app.services.skill_matcher import SkillMatcher
+from app.services.skill_index import SkillIndex
+
+parser = argparse.ArgumentParser(description="Compile the skill taxonomy CSVs into a memory-mappable artifact")
+parser.add_argument("--taxonomy-path", default="data/esco_taxonomy")
+parser.add_argument("--force", action="store_true", help="Rebuild even if the artifact is up to date")
+args = parser.parse_args()
+
+taxonomy_path = Path(args.taxonomy_path)
+
+start = time.perf_counter()
+artifact_path = build_artifact(taxonomy_path, force=args.force)
+build_ms = (time.perf_counter() - start) * 1000
+
+start = time.perf_counter()
+skills_db, skill_synonyms = read_taxonomy_csv(taxonomy_path)
+SkillMatcher.from_taxonomy(skills_db, skill_synonyms)
+SkillIndex.from_taxonomy(skills_db, skill_synonyms)
+csv_ms = (time.perf_counter() - start) * 1000
+
+start = time.perf_counter()
+artifact = load_artifact(artifact_path)
+artifact.skills_db()
+artifact.skill_synonyms()
+artifact.skill_matcher()
+artifact.skill_index()
+artifact_ms = (time.perf_counter() - start) * 1000
+
+print(f"Artifact written to {artifact_path} ({artifact_path.stat().st_size / 1024:.1f} KiB) in {build_ms:.1f} ms")
+print(f"Skills: {artifact.header['skill_count']}, synonyms: {artifact.header['synonym_count']}")
+print(f"CSV load + matcher build: {csv_ms:.1f} ms")
+print(f"Artifact load (mmap): {artifact_ms:.1f} ms")
\ No newline at end of file
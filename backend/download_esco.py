@@ -1,7 +1,16 @@
+import argparse
 import csv
 import os
+import random
+import re
+import sys
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
 
-os.makedirs("data/esco_taxonomy", exist_ok=True)
+DEFAULT_OUTPUT_DIR = "data/esco_taxonomy"
+SKILL_FIELDS = ["id", "name", "type", "category"]
+SYNONYM_FIELDS = ["skill_id", "synonym"]
 
 skills_data = [
     {"id": "S1.0.0", "name": "python", "type": "technical", "category": "programming"},
@@ -57,11 +66,6 @@ skills_data = [
     {"id": "S9.0.5", "name": "scrum", "type": "soft", "category": "methodology"},
 ]
 
-with open("data/esco_taxonomy/skills.csv", "w", newline="", encoding="utf-8") as f:
-    writer = csv.DictWriter(f, fieldnames=["id", "name", "type", "category"])
-    writer.writeheader()
-    writer.writerows(skills_data)
-
 synonyms_data = [
     {"skill_id": "S1.0.0", "synonym": "python programming"},
     {"skill_id": "S1.0.0", "synonym": "python development"},
@@ -87,11 +91,209 @@ synonyms_data = [
     {"skill_id": "S9.0.4", "synonym": "agile development"},
 ]
 
-with open("data/esco_taxonomy/skill_synonyms.csv", "w", newline="", encoding="utf-8") as f:
-    writer = csv.DictWriter(f, fieldnames=["skill_id", "synonym"])
-    writer.writeheader()
-    writer.writerows(synonyms_data)
+def normalize_label(label: str) -> str:
+    label = unicodedata.normalize("NFKC", label or "")
+    label = label.strip().strip('"\'').lower()
+    return re.sub(r"\s+", " ", label)
+
+def normalize_category(label: str) -> str:
+    label = normalize_label(label)
+    label = re.sub(r"[^\w]+", "_", label).strip("_")
+    return label or "uncategorized"
+
+def concept_id(uri: str) -> str:
+    return uri.rstrip("/").rsplit("/", 1)[-1]
+
+def split_labels(value: Optional[str]) -> List[str]:
+    if not value:
+        return []
+    return [part for part in re.split(r"[\n|]", value) if part.strip()]
+
+def dedupe_labels(name: str, labels: List[str]) -> List[str]:
+    seen = {name}
+    result = []
+    for label in labels:
+        label = normalize_label(label)
+        if label and label not in seen:
+            seen.add(label)
+            result.append(label)
+    return result
+
+class TaxonomyWriter:
+    def __init__(self, output_dir: str):
+        os.makedirs(output_dir, exist_ok=True)
+        self.output_dir = Path(output_dir)
+        self.skills_file = open(self.output_dir / "skills.csv", "w", newline="", encoding="utf-8")
+        self.synonyms_file = open(self.output_dir / "skill_synonyms.csv", "w", newline="", encoding="utf-8")
+        self.skills_writer = csv.DictWriter(self.skills_file, fieldnames=SKILL_FIELDS)
+        self.synonyms_writer = csv.DictWriter(self.synonyms_file, fieldnames=SYNONYM_FIELDS)
+        self.skills_writer.writeheader()
+        self.synonyms_writer.writeheader()
+        self.skill_count = 0
+        self.synonym_count = 0
+    
+    def write_skill(self, skill: Dict, synonyms: List[str]):
+        self.skills_writer.writerow(skill)
+        self.skill_count += 1
+        self.write_synonyms(skill["id"], synonyms)
+    
+    def write_synonyms(self, skill_id: str, synonyms: List[str]):
+        for synonym in synonyms:
+            self.synonyms_writer.writerow({"skill_id": skill_id, "synonym": synonym})
+            self.synonym_count += 1
+    
+    def close(self):
+        self.skills_file.close()
+        self.synonyms_file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+def write_sample_taxonomy(output_dir: str) -> TaxonomyWriter:
+    synonyms_by_skill = {}
+    for row in synonyms_data:
+        synonyms_by_skill.setdefault(row["skill_id"], []).append(row["synonym"])
+    
+    with TaxonomyWriter(output_dir) as writer:
+        for skill in skills_data:
+            writer.write_skill(skill, synonyms_by_skill.get(skill["id"], []))
+    return writer
+
+def read_csv_rows(path: str) -> Iterator[Dict]:
+    with open(path, "r", newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            yield row
+
+def load_skill_groups(hierarchy_path: Optional[str], groups_path: Optional[str]):
+    group_labels = {}
+    broader = {}
+    
+    if groups_path:
+        for row in read_csv_rows(groups_path):
+            group_labels[row["conceptUri"]] = row.get("preferredLabel", "")
+    
+    if hierarchy_path:
+        for row in read_csv_rows(hierarchy_path):
+            if "SkillGroup" not in row.get("broaderType", "") or row["conceptUri"] in broader:
+                continue
+            broader[row["conceptUri"]] = row["broaderUri"]
+            if row.get("broaderLabel") and row["broaderUri"] not in group_labels:
+                group_labels[row["broaderUri"]] = row["broaderLabel"]
+    
+    return broader, group_labels
+
+def iter_alt_labels(path: str) -> Iterator[tuple]:
+    current_uri = None
+    labels = []
+    for row in read_csv_rows(path):
+        uri = row["conceptUri"]
+        if uri != current_uri and current_uri is not None:
+            yield current_uri, labels
+            labels = []
+        current_uri = uri
+        labels.extend(split_labels(row.get("altLabel") or row.get("altLabels") or row.get("label")))
+    if current_uri is not None:
+        yield current_uri, labels
+
+def import_esco(skills_path: str, output_dir: str, hierarchy_path: Optional[str] = None,
+                groups_path: Optional[str] = None, alt_labels_path: Optional[str] = None,
+                include_hidden: bool = False) -> TaxonomyWriter:
+    broader, group_labels = load_skill_groups(hierarchy_path, groups_path)
+    names = {}
+    
+    with TaxonomyWriter(output_dir) as writer:
+        for row in read_csv_rows(skills_path):
+            if row.get("status") and row["status"] != "released":
+                continue
+            
+            uri = row["conceptUri"]
+            name = normalize_label(row.get("preferredLabel", ""))
+            if not name or uri in names:
+                continue
+            names[uri] = name
+            
+            labels = split_labels(row.get("altLabels"))
+            if include_hidden:
+                labels.extend(split_labels(row.get("hiddenLabels")))
+            
+            skill_type = "soft" if row.get("reuseLevel", "").strip() == "transversal" else "technical"
+            group_uri = broader.get(uri)
+            category = normalize_category(group_labels.get(group_uri, "")) if group_uri else "uncategorized"
+            
+            writer.write_skill(
+                {"id": concept_id(uri), "name": name, "type": skill_type, "category": category},
+                dedupe_labels(name, labels)
+            )
+        
+        if alt_labels_path:
+            for uri, labels in iter_alt_labels(alt_labels_path):
+                if uri in names:
+                    writer.write_synonyms(concept_id(uri), dedupe_labels(names[uri], labels))
+    return writer
+
+SYLLABLES = ["ka", "lo", "mi", "tra", "ven", "dex", "sor", "pli", "qua", "rin", "zo", "tek", "nar", "vil", "os", "gen", "ux", "por"]
+SYNONYM_SUFFIXES = ["development", "programming", "framework", "engineering", "tooling", "expertise", "platform",
+                    "systems", "administration", "design", "analysis", "operations"]
+SYNTHETIC_CATEGORIES = ["programming", "frontend", "backend", "cloud", "devops", "database", "machine_learning", "tools"]
+
+def generate_synthetic_taxonomy(output_dir: str, skill_count: int, synonyms_per_skill: int = 8,
+                                soft_ratio: float = 0.1, seed: int = 42) -> TaxonomyWriter:
+    rng = random.Random(seed)
+    index_width = len(str(skill_count))
+    
+    with TaxonomyWriter(output_dir) as writer:
+        for i in range(skill_count):
+            words = ["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))) for _ in range(rng.randint(1, 2))]
+            name = " ".join(words) + f" {i:0{index_width}d}"
+            skill_type = "soft" if rng.random() < soft_ratio else "technical"
+            synonyms = [f"{name} {suffix}" for suffix in rng.sample(SYNONYM_SUFFIXES, min(synonyms_per_skill, len(SYNONYM_SUFFIXES)))]
+            writer.write_skill(
+                {"id": f"SYN{i}", "name": name, "type": skill_type, "category": rng.choice(SYNTHETIC_CATEGORIES)},
+                synonyms
+            )
+    return writer
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Write the skill taxonomy consumed by SkillExtractor")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument("--no-artifact", action="store_true", help="Skip compiling taxonomy.bin")
+    subparsers = parser.add_subparsers(dest="source")
+    
+    subparsers.add_parser("sample", help="Built-in starter taxonomy (default)")
+    
+    esco_parser = subparsers.add_parser("esco", help="Import the official ESCO CSV export")
+    esco_parser.add_argument("--skills", required=True, help="skills_<lang>.csv")
+    esco_parser.add_argument("--hierarchy", help="broaderRelationsSkillPillar_<lang>.csv")
+    esco_parser.add_argument("--skill-groups", help="skillGroups_<lang>.csv")
+    esco_parser.add_argument("--alt-labels", help="Extra alternative labels CSV (conceptUri, altLabel)")
+    esco_parser.add_argument("--include-hidden", action="store_true", help="Also import hiddenLabels as synonyms")
+    
+    synthetic_parser = subparsers.add_parser("synthetic", help="Generate a large synthetic taxonomy for load tests")
+    synthetic_parser.add_argument("--skills", type=int, default=13000)
+    synthetic_parser.add_argument("--synonyms", type=int, default=8)
+    synthetic_parser.add_argument("--seed", type=int, default=42)
+    
+    args = parser.parse_args(argv)
+    
+    if args.source == "esco":
+        writer = import_esco(args.skills, args.output_dir, args.hierarchy, args.skill_groups,
+                             args.alt_labels, args.include_hidden)
+    elif args.source == "synthetic":
+        writer = generate_synthetic_taxonomy(args.output_dir, args.skills, args.synonyms, seed=args.seed)
+    else:
+        writer = write_sample_taxonomy(args.output_dir)
+    
+    print(f"ESCO taxonomy files created in {args.output_dir}")
+    print(f"Total skills: {writer.skill_count}")
+    print(f"Total synonyms: {writer.synonym_count}")
+    
+    if not args.no_artifact:
+        from app.services.taxonomy_artifact import build_artifact
+        artifact_path = build_artifact(Path(args.output_dir), force=True)
+        print(f"Compiled taxonomy artifact: {artifact_path}")
 
-print("Enhanced ESCO taxonomy files created")
-print(f"Total skills: {len(skills_data)}")
-print(f"Total synonyms: {len(synonyms_data)}")
\ No newline at end of file
+if __name__ == "__main__":
+    main(sys.argv[1:])
\ No newline at end of file
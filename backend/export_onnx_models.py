@@ -0,0 +1,18 @@
+import argparse
+from app.services.onnx_backend import export_model, model_dir_for, EMBEDDING_TASK, SEQUENCE_CLASSIFICATION_TASK
+
+MODELS = [
+    ("sentence-transformers/all-MiniLM-L6-v2", EMBEDDING_TASK),
+    ("cross-encoder/ms-marco-MiniLM-L-6-v2", SEQUENCE_CLASSIFICATION_TASK),
+    ("cross-encoder/nli-deberta-v3-small", SEQUENCE_CLASSIFICATION_TASK),
+]
+
+parser = argparse.ArgumentParser(description="Export embedding, reranker and NLI models to ONNX with int8 dynamic quantization")
+parser.add_argument("--output-dir", help="Defaults to ONNX_MODEL_DIR")
+parser.add_argument("--no-quantize", action="store_true")
+args = parser.parse_args()
+
+for model_name, task in MODELS:
+    target = model_dir_for(model_name, args.output_dir)
+    export_model(model_name, task, target, quantize=not args.no_quantize)
+    print(f"Exported {model_name} -> {target}")
\ No newline at end of file
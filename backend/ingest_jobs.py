@@ -0,0 +1,49 @@
+import argparse
+import json
+import time
+from pathlib import Path
+from app.services.text_processor import TextProcessor
+from app.services.embedding_service import EmbeddingService
+from app.services.vector_store import VectorStore
+from app.services.matching_engine import MatchingEngine
+from app.services.job_search import JobSearchService
+
+parser = argparse.ArgumentParser(description="Bulk-index job descriptions for /search-jobs")
+parser.add_argument("path", help="JSONL file with one {\"text\", \"title\", \"source_id\"} object per line")
+parser.add_argument("--batch-size", type=int, default=None)
+parser.add_argument("--read-size", type=int, default=5000, help="Number of lines to read per ingestion round")
+args = parser.parse_args()
+
+embedding_service = EmbeddingService()
+job_search_service = JobSearchService(
+    TextProcessor(),
+    embedding_service,
+    VectorStore(),
+    MatchingEngine(None, embedding_service)
+)
+
+def read_jobs(path: Path):
+    with open(path, "r", encoding="utf-8") as f:
+        batch = []
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            batch.append(json.loads(line))
+            if len(batch) >= args.read_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+start = time.perf_counter()
+ingested = 0
+duplicates = 0
+for jobs in read_jobs(Path(args.path)):
+    result = job_search_service.ingest(jobs, batch_size=args.batch_size)
+    ingested += len(result["ingested"])
+    duplicates += len(result["duplicates"])
+    elapsed = time.perf_counter() - start
+    print(f"{ingested} ingested, {duplicates} duplicates, {ingested / elapsed:.1f} JDs/s")
+
+print(f"Done in {time.perf_counter() - start:.1f} s")
\ No newline at end of file
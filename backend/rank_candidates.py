@@ -0,0 +1,73 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from app.services.text_processor import TextProcessor
+from app.services.skill_extractor import SkillExtractor
+from app.services.embedding_service import EmbeddingService
+from app.services.matching_engine import MatchingEngine
+from app.services.candidate_ranker import CandidateRanker
+
+def read_resumes(resume_dir: Path):
+    for path in sorted(resume_dir.glob("*.pdf")):
+        yield path.name, path.read_bytes()
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank a folder of candidate PDFs against one job description")
+    parser.add_argument("jd", help="Path to a text file with the job description")
+    parser.add_argument("resume_dir", help="Directory containing candidate PDFs")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (0 scores in-process)")
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--top", type=int, default=20, help="Number of ranked candidates to print")
+    parser.add_argument("--output", help="Write every event as NDJSON to this file")
+    parser.add_argument("--suggestions", action="store_true", help="Generate LLM suggestions for the top candidates")
+    parser.add_argument("--suggestions-top-n", type=int, default=3)
+    args = parser.parse_args()
+    
+    rewrite_agent = None
+    if args.suggestions:
+        from app.services.llm_service import LLMService
+        from app.services.contradiction_checker import ContradictionChecker
+        from app.services.rewrite_agent import RewriteAgent
+        rewrite_agent = RewriteAgent(LLMService(), ContradictionChecker())
+    
+    embedding_service = EmbeddingService()
+    ranker = CandidateRanker(
+        TextProcessor(),
+        MatchingEngine(SkillExtractor(), embedding_service),
+        rewrite_agent=rewrite_agent,
+        workers=args.workers,
+        batch_size=args.batch_size
+    )
+    
+    jd_text = Path(args.jd).read_text(encoding="utf-8")
+    output = open(args.output, "w", encoding="utf-8") if args.output else None
+    
+    start = time.perf_counter()
+    scored = 0
+    ranking = None
+    for event in ranker.rank(jd_text, read_resumes(Path(args.resume_dir)), args.suggestions, args.suggestions_top_n):
+        if output:
+            output.write(json.dumps(event) + "\n")
+        if event["type"] == "scored":
+            scored += 1
+            print(f"\r{scored} scored ({scored / (time.perf_counter() - start):.1f}/s)", end="", file=sys.stderr)
+        elif event["type"] == "error":
+            print(f"\n{event['name']}: {event['error']}", file=sys.stderr)
+        elif event["type"] == "ranking":
+            ranking = event["ranking"]
+    
+    ranker.close()
+    if output:
+        output.close()
+    print(file=sys.stderr)
+    
+    print(f"{'rank':>4} {'score':>7} {'skills':>7} {'semantic':>9}  candidate")
+    for entry in (ranking or [])[:args.top]:
+        scores = entry["scores"]
+        print(f"{entry['rank']:>4} {entry['match_score']:>7.2f} {scores['skills_exact']:>7.2f} {scores['semantic_fit']:>9.2f}  {entry['name']}")
+    print(f"Ranked {len(ranking or [])} candidates in {time.perf_counter() - start:.1f} s")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,37 @@
+import numpy as np
+from app.services.analysis_store import FEATURE_COLUMNS, AnalysisStore
+
+def match_results(value):
+    return {
+        "features": {name: value for name in FEATURE_COLUMNS},
+        "skill_overlap": {"matched": [], "missing": [{"name": "python"}]}
+    }
+
+def section_state():
+    return {"abc": {"skills": [], "chunks": ["built apis"], "embeddings": np.ones((1, 4), dtype=np.float32)}}
+
+def test_retention_cap_drops_oldest_analyses_and_their_section_states(tmp_path):
+    store = AnalysisStore(str(tmp_path), max_entries=3, max_section_states=10)
+    ids = [store.save(match_results(i / 10), jd_id="jd", section_state=section_state(), model="m") for i in range(5)]
+    
+    assert store.stats()["stored"] == 3
+    assert store.stats()["section_states"] == 3
+    assert store.get(ids[0]) is None
+    assert store.section_state(ids[1], "m") is None
+    assert store.features(ids)[2] == ids[:2]
+    
+    reopened = AnalysisStore(str(tmp_path), max_entries=2, max_section_states=10)
+    assert reopened.stats()["stored"] == 2
+    assert reopened.get(ids[2]) is None
+    assert reopened.get(ids[4]) is not None
+
+def test_all_features_pages_newest_first(tmp_path):
+    store = AnalysisStore(str(tmp_path))
+    ids = [store.save(match_results(i / 10), jd_id="jd" if i % 2 else "other") for i in range(6)]
+    
+    first, _ = store.all_features(jd_id="jd", limit=2)
+    second, matrix = store.all_features(jd_id="jd", limit=2, offset=2)
+    
+    assert first == [ids[5], ids[3]]
+    assert second == [ids[1]]
+    np.testing.assert_allclose(matrix, [[0.1] * len(FEATURE_COLUMNS)])
\ No newline at end of file
@@ -0,0 +1,33 @@
+import asyncio
+from app.utils.loop_local import LoopLocal
+
+def test_values_are_per_loop_and_closed_loops_are_dropped():
+    semaphores = LoopLocal(lambda: asyncio.Semaphore(1))
+    
+    async def use():
+        semaphore = semaphores.get()
+        assert semaphores.get() is semaphore
+        
+        async def hold():
+            async with semaphore:
+                await asyncio.sleep(0.001)
+        
+        await asyncio.gather(hold(), hold())
+        return semaphore
+    
+    first = asyncio.run(use())
+    second = asyncio.run(use())
+    
+    assert first is not second
+    assert len(semaphores) == 1
+
+def test_pop_removes_current_loop_value():
+    values = LoopLocal(object)
+    
+    async def use():
+        value = values.get()
+        assert values.pop() is value
+        assert values.pop() is None
+        return values.get() is not value
+    
+    assert asyncio.run(use())
\ No newline at end of file
@@ -0,0 +1,48 @@
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pytest
+from app.core.config import settings
+
+pytest.importorskip("transformers")
+
+from app.services import contradiction_checker as contradiction_module
+from app.services.onnx_backend import OnnxTextClassifier
+
+class CountingClassifier(OnnxTextClassifier):
+    def __init__(self):
+        self.config = type("Config", (), {"id2label": {0: "contradiction", 1: "entailment", 2: "neutral"}})()
+        self.forwards = []
+    
+    def _run(self, texts, text_pairs=None):
+        self.forwards.append(len(texts))
+        return {"outputs": np.tile(np.array([[0.1, 2.0, 0.3]], dtype=np.float32), (len(texts), 1))}
+
+@pytest.fixture
+def checker(monkeypatch):
+    model = CountingClassifier()
+    monkeypatch.setattr(settings, "INFERENCE_BACKEND", "onnx")
+    monkeypatch.setattr(settings, "MICRO_BATCHING_ENABLED", True)
+    monkeypatch.setattr(settings, "MICRO_BATCH_MAX_SIZE", 64)
+    monkeypatch.setattr(settings, "MICRO_BATCH_MAX_WAIT_MS", 200.0)
+    monkeypatch.setattr(OnnxTextClassifier, "from_pretrained", classmethod(lambda cls, *args, **kwargs: model))
+    checker = contradiction_module.ContradictionChecker()
+    yield checker, model
+    checker.close()
+
+def test_merged_batch_runs_one_forward(checker):
+    checker, model = checker
+    pairs = [(f"premise {i}", f"hypothesis {i}") for i in range(6)]
+    
+    with ThreadPoolExecutor(max_workers=len(pairs)) as pool:
+        results = list(pool.map(lambda pair: checker.check_contradiction(*pair), pairs))
+    
+    assert all(result["label"] == "entailment" for result in results)
+    assert checker.batching_stats()["batches"] == 1
+    assert model.forwards == [len(pairs)]
+
+def test_large_request_runs_one_forward_per_micro_batch(checker):
+    checker, model = checker
+    results = checker.check_contradictions_batch([(f"premise {i}", "hypothesis") for i in range(40)])
+    
+    assert len(results) == 40
+    assert model.forwards == [40]
\ No newline at end of file
@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from app.services.onnx_backend import OnnxCrossEncoder
+
+LOGITS = np.array([[2.5], [-1.0], [0.0]], dtype=np.float32)
+
+def cross_encoder(config):
+    encoder = OnnxCrossEncoder.__new__(OnnxCrossEncoder)
+    encoder.config = config
+    encoder.apply_sigmoid = OnnxCrossEncoder._uses_sigmoid(config)
+    encoder._run = lambda texts, text_pairs=None: {"outputs": LOGITS[:len(texts)]}
+    return encoder
+
+def predict(config):
+    return cross_encoder(config).predict([["query", "doc"]] * len(LOGITS))
+
+def test_identity_head_returns_raw_logits():
+    config = SimpleNamespace(num_labels=1, sbert_ce_default_activation_function="torch.nn.modules.linear.Identity")
+    np.testing.assert_allclose(predict(config), LOGITS[:, 0])
+
+def test_single_label_head_without_activation_uses_sigmoid():
+    config = SimpleNamespace(num_labels=1)
+    np.testing.assert_allclose(predict(config), 1.0 / (1.0 + np.exp(-LOGITS[:, 0])), rtol=1e-6)
+
+def test_sentence_transformers_activation_overrides_legacy_key():
+    config = SimpleNamespace(
+        num_labels=1,
+        sbert_ce_default_activation_function="torch.nn.modules.activation.Sigmoid",
+        sentence_transformers={"activation_fn": "torch.nn.modules.linear.Identity"}
+    )
+    np.testing.assert_allclose(predict(config), LOGITS[:, 0])
+
+def test_matches_torch_cross_encoder(tmp_path, monkeypatch):
+    pytest.importorskip("sentence_transformers")
+    pytest.importorskip("transformers")
+    from sentence_transformers import CrossEncoder
+    from app.core.config import settings
+    
+    monkeypatch.setattr(settings, "ONNX_MODEL_DIR", str(tmp_path))
+    model_name = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    pairs = [["python developer", "built apis in python"], ["python developer", "managed a bakery"]]
+    try:
+        torch_scores = np.asarray(CrossEncoder(model_name).predict(pairs))
+        onnx_scores = OnnxCrossEncoder.from_pretrained(model_name, quantized=False).predict(pairs)
+    except OSError as e:
+        pytest.skip(f"model not available: {e}")
+    np.testing.assert_allclose(onnx_scores, torch_scores, atol=1e-3)
\ No newline at end of file
@@ -0,0 +1,82 @@
+import random
+import string
+import pytest
+from fuzzywuzzy import fuzz
+from app.services.skill_index import SkillIndex
+from app.services.taxonomy_artifact import read_taxonomy_csv
+from benchmarks.bench_skill_matcher import build_taxonomy
+from tests.conftest import TAXONOMY_DIR
+
+MIN_CONFIDENCE = 0.8
+
+def brute_force(skills_db, phrase, min_confidence):
+    return [
+        skill_id for skill_id, skill_data in skills_db.items()
+        if fuzz.ratio(phrase, skill_data["name"]) / 100.0 >= min_confidence
+    ]
+
+def indexed(index, skills_db, phrase, min_confidence):
+    return [
+        candidate["skill_id"] for candidate in index.candidates(phrase, min_similarity=min_confidence)
+        if fuzz.ratio(phrase, skills_db[candidate["skill_id"]]["name"]) / 100.0 >= min_confidence
+    ]
+
+def typos(names, count, seed=0):
+    rng = random.Random(seed)
+    alphabet = string.ascii_lowercase + " .+#"
+    phrases = []
+    for _ in range(count):
+        chars = list(rng.choice(names))
+        for _ in range(rng.randint(1, 2)):
+            op = rng.randrange(4)
+            pos = rng.randrange(len(chars) + 1)
+            if op == 0:
+                chars.insert(pos, rng.choice(alphabet))
+            elif chars and op == 1:
+                del chars[min(pos, len(chars) - 1)]
+            elif chars and op == 2:
+                chars[min(pos, len(chars) - 1)] = rng.choice(alphabet)
+            elif len(chars) > 1:
+                pos = min(pos, len(chars) - 2)
+                chars[pos], chars[pos + 1] = chars[pos + 1], chars[pos]
+        phrases.append("".join(chars))
+    return phrases
+
+@pytest.fixture(scope="module")
+def taxonomy():
+    return read_taxonomy_csv(TAXONOMY_DIR)
+
+@pytest.mark.parametrize("phrase", ["sqil", "awms", "gt", "cs", "pyhton", "kubernets", "dockr", "c+"])
+def test_short_typos_are_not_dropped(taxonomy, phrase):
+    skills_db, skill_synonyms = taxonomy
+    index = SkillIndex.from_taxonomy(skills_db, skill_synonyms)
+    expected = brute_force(skills_db, phrase, MIN_CONFIDENCE)
+    
+    assert expected
+    assert indexed(index, skills_db, phrase, MIN_CONFIDENCE) == expected
+
+@pytest.mark.parametrize("min_confidence", [0.6, 0.8, 0.9])
+def test_candidates_match_brute_force_on_sample_taxonomy(taxonomy, min_confidence):
+    skills_db, skill_synonyms = taxonomy
+    index = SkillIndex.from_taxonomy(skills_db, skill_synonyms)
+    names = [skill["name"] for skill in skills_db.values()]
+    
+    for phrase in typos(names, 2000) + names:
+        assert indexed(index, skills_db, phrase, min_confidence) == brute_force(skills_db, phrase, min_confidence), phrase
+
+def test_candidates_match_brute_force_on_synthetic_taxonomy():
+    skills_db, skill_synonyms = build_taxonomy(500, 8)
+    index = SkillIndex.from_taxonomy(skills_db, skill_synonyms)
+    names = [skill["name"] for skill in skills_db.values()]
+    
+    for phrase in typos(names, 1000, seed=1):
+        assert indexed(index, skills_db, phrase, MIN_CONFIDENCE) == brute_force(skills_db, phrase, MIN_CONFIDENCE), phrase
+
+def test_find_contained_matches_substring_scan(taxonomy):
+    skills_db, skill_synonyms = taxonomy
+    index = SkillIndex.from_taxonomy(skills_db, skill_synonyms)
+    terms = [(skill_id, term) for skill_id in skills_db for term in [skills_db[skill_id]["name"]] + skill_synonyms.get(skill_id, [])]
+    
+    for text in ["python", "c", "advanced react.js", "k8s", "ms sql and go", "typescript/ts", "nothing here"]:
+        expected = [{"skill_id": skill_id, "term": term} for skill_id, term in terms if term in text]
+        assert index.find_contained(text) == expected
\ No newline at end of file
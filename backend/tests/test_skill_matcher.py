@@ -0,0 +1,58 @@
+import re
+import pytest
+from app.services.skill_matcher import SkillMatcher
+from app.services.taxonomy_artifact import read_taxonomy_csv
+from benchmarks.bench_skill_matcher import build_document, build_taxonomy
+from tests.conftest import TAXONOMY_DIR
+
+def regex_baseline(skills_db, skill_synonyms, text):
+    found = []
+    for skill_id, skill_data in skills_db.items():
+        terms = [skill_data["name"]] + skill_synonyms.get(skill_id, [])
+        for term in terms:
+            matches = re.compile(r'\b' + re.escape(term) + r'\b', re.IGNORECASE).findall(text)
+            if matches:
+                found.append((skill_id, matches[0]))
+                break
+    return found
+
+def matcher_result(matcher, text):
+    return [(match["skill_id"], match["term"]) for match in matcher.match_skills(text)]
+
+RESUME_TEXTS = [
+    "Senior Python developer with C++, Node.js and React.js experience. Built ML pipelines on AWS Cloud with K8s.",
+    "Skills: go, golang, javascript programming, js, typescript; docker containers and docker; scikit-learn, tf",
+    "Led agile development in a scrum team; strong communication, leadership and problem solving.",
+    "No matching terms here: pythonic gopher javas cripted reactor dockerized",
+    "structured query language (SQL), postgresql/mysql, mongodb, redis; linux + bash + git + gitlab + jenkins",
+    ""
+]
+
+@pytest.fixture(scope="module")
+def taxonomy():
+    return read_taxonomy_csv(TAXONOMY_DIR)
+
+@pytest.mark.parametrize("text", RESUME_TEXTS)
+def test_matches_regex_baseline_on_sample_taxonomy(taxonomy, text):
+    skills_db, skill_synonyms = taxonomy
+    matcher = SkillMatcher.from_taxonomy(skills_db, skill_synonyms)
+    
+    assert matcher_result(matcher, text.lower()) == regex_baseline(skills_db, skill_synonyms, text.lower())
+
+@pytest.mark.parametrize("size", [40, 1000])
+def test_matches_regex_baseline_on_synthetic_taxonomy(size):
+    skills_db, skill_synonyms = build_taxonomy(size, 8)
+    matcher = SkillMatcher.from_taxonomy(skills_db, skill_synonyms)
+    text = build_document(skills_db, skill_mentions=60).lower()
+    
+    expected = regex_baseline(skills_db, skill_synonyms, text)
+    assert expected
+    assert matcher_result(matcher, text) == expected
+
+def test_match_spans_point_at_matched_term(taxonomy):
+    skills_db, skill_synonyms = taxonomy
+    matcher = SkillMatcher.from_taxonomy(skills_db, skill_synonyms)
+    text = RESUME_TEXTS[0].lower()
+    
+    for match in matcher.match_skills(text):
+        assert text[match["start"]:match["end"]] == match["term"]
\ No newline at end of file
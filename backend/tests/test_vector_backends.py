@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+from app.services.vector_backends import FlatBackend, FlatCollection
+
+DIM = 16
+
+def random_vectors(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.normal(size=(count, DIM)).astype(np.float32)
+
+def populate(collection, count=200):
+    vectors = random_vectors(count)
+    collection.upsert(
+        [f"doc{i}" for i in range(count)],
+        vectors.tolist(),
+        [f"text {i}" for i in range(count)],
+        [{"group": i % 4} for i in range(count)]
+    )
+    return vectors
+
+def brute_force(vectors, ids, query, k):
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = normalized @ (query / np.linalg.norm(query))
+    order = np.argsort(-scores, kind="stable")[:k]
+    return [ids[i] for i in order]
+
+def test_query_matches_brute_force_with_filter(tmp_path):
+    collection = FlatCollection(tmp_path)
+    vectors = populate(collection)
+    queries = random_vectors(5, seed=1)
+    
+    results = collection.query(queries.tolist(), 5, where={"group": 2})
+    keep = [i for i in range(len(vectors)) if i % 4 == 2]
+    for query, ids in zip(queries, results["ids"]):
+        assert ids == brute_force(vectors[keep], [f"doc{i}" for i in keep], query, 5)
+    assert all(metadata["group"] == 2 for row in results["metadatas"] for metadata in row)
+
+def test_upsert_replaces_existing_id(tmp_path):
+    collection = FlatCollection(tmp_path)
+    populate(collection, 10)
+    replacement = random_vectors(1, seed=3)
+    collection.upsert(["doc3"], replacement.tolist(), ["replaced"], [{"group": 9}])
+    
+    assert collection.count() == 10
+    result = collection.query(replacement.tolist(), 1)
+    assert result["ids"] == [["doc3"]]
+    assert result["documents"] == [["replaced"]]
+    assert result["distances"][0][0] == pytest.approx(0.0, abs=1e-5)
+    assert collection.query(replacement.tolist(), 10, where={"group": 3})["ids"][0].count("doc3") == 0
+
+def test_delete_compaction_and_reopen(tmp_path):
+    collection = FlatCollection(tmp_path, compact_ratio=0.25)
+    vectors = populate(collection, 40)
+    queries = random_vectors(3, seed=2)
+    
+    collection.delete({"group": 1})
+    assert collection.count() == 30
+    assert collection.generation == 0
+    
+    collection.delete({"group": 3})
+    assert collection.count() == 20
+    assert collection.generation == 1
+    assert collection.tombstones == 0
+    
+    keep = [i for i in range(40) if i % 4 in (0, 2)]
+    expected = [brute_force(vectors[keep], [f"doc{i}" for i in keep], query, 5) for query in queries]
+    assert collection.query(queries.tolist(), 5)["ids"] == expected
+    
+    reopened = FlatCollection(tmp_path, compact_ratio=0.25)
+    assert reopened.count() == 20
+    assert reopened.generation == 1
+    assert reopened.query(queries.tolist(), 5)["ids"] == expected
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["header.json", "rows.1.jsonl", "vectors.1.bin"]
+
+def test_reopen_ignores_torn_tail(tmp_path):
+    collection = FlatCollection(tmp_path)
+    populate(collection, 8)
+    with open(collection.rows_path, "a", encoding="utf-8") as f:
+        f.write('{"id": "partial", "docu')
+    with open(collection.vectors_path, "ab") as f:
+        f.write(b"\x00" * 10)
+    
+    reopened = FlatCollection(tmp_path)
+    assert reopened.count() == 8
+    assert reopened.vectors_path.stat().st_size == 8 * DIM * 4
+
+def test_flat_backend_matches_chroma(tmp_path):
+    pytest.importorskip("chromadb")
+    from app.services.vector_backends import ChromaBackend
+    
+    count = 300
+    vectors = random_vectors(count)
+    ids = [f"doc{i}" for i in range(count)]
+    documents = [f"text {i}" for i in range(count)]
+    metadatas = [{"group": i % 3} for i in range(count)]
+    queries = random_vectors(8, seed=5).tolist()
+    
+    flat = FlatBackend(str(tmp_path / "flat"), ["jobs"])
+    chroma = ChromaBackend(str(tmp_path / "chroma"), ["jobs"])
+    for backend in (flat, chroma):
+        backend.upsert("jobs", ids, vectors.tolist(), documents, metadatas)
+        backend.delete("jobs", {"group": 0})
+    
+    assert flat.count("jobs") == chroma.count("jobs") == 200
+    for where in (None, {"group": 1}):
+        expected = chroma.query("jobs", queries, 5, where=where)
+        actual = flat.query("jobs", queries, 5, where=where)
+        assert actual["ids"] == expected["ids"]
+        assert actual["documents"] == expected["documents"]
+        np.testing.assert_allclose(actual["distances"], expected["distances"], atol=1e-4)
\ No newline at end of file
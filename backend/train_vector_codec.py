@@ -0,0 +1,81 @@
+import argparse
+import time
+from pathlib import Path
+import numpy as np
+from app.core.config import settings
+from app.services.vector_backends import FlatCollection
+from app.services.vector_compression import VectorCodec, search
+
+parser = argparse.ArgumentParser(description="Fit a PCA/product-quantization codec for the flat vector backend and report recall@k vs memory")
+source = parser.add_mutually_exclusive_group()
+source.add_argument("--collection", default="jd_requirements", help="Flat index collection to sample from")
+source.add_argument("--npy", help="Load vectors from a .npy file instead of the flat index")
+source.add_argument("--synthetic", type=int, help="Generate N clustered synthetic 384-dim vectors")
+parser.add_argument("--index-dir", default=settings.FLAT_INDEX_DIR)
+parser.add_argument("--sample-size", type=int, default=50000)
+parser.add_argument("--pca-dim", type=int, default=None)
+parser.add_argument("--subspaces", type=int, default=48, help="PQ subspaces (0 disables PQ)")
+parser.add_argument("--centroids", type=int, default=256)
+parser.add_argument("--iterations", type=int, default=20)
+parser.add_argument("--queries", type=int, default=200)
+parser.add_argument("--k", type=int, default=10)
+parser.add_argument("--rescore-factor", type=int, default=settings.VECTOR_RESCORE_FACTOR)
+parser.add_argument("--output", default=settings.VECTOR_CODEC_PATH or "vector_codec.npz")
+args = parser.parse_args()
+
+rng = np.random.default_rng(0)
+
+if args.synthetic:
+    centers = rng.standard_normal((256, 384)).astype(np.float32)
+    vectors = centers[rng.integers(0, len(centers), args.synthetic)] + 0.6 * rng.standard_normal((args.synthetic, 384)).astype(np.float32)
+elif args.npy:
+    vectors = np.load(args.npy, mmap_mode="r")
+else:
+    collection = FlatCollection(Path(args.index_dir) / args.collection)
+    alive = np.flatnonzero(collection._alive_mask())
+    vectors = collection._matrix_view()[alive]
+
+vectors = np.asarray(vectors, dtype=np.float32)
+vectors /= np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+if len(vectors) <= args.queries:
+    raise SystemExit(f"Need more than {args.queries} vectors, found {len(vectors)}")
+
+order = rng.permutation(len(vectors))
+queries = vectors[order[:args.queries]]
+base = vectors[order[args.queries:]]
+sample = base[rng.choice(len(base), size=min(args.sample_size, len(base)), replace=False)]
+
+start = time.perf_counter()
+codec = VectorCodec.fit(
+    sample,
+    pca_dim=args.pca_dim,
+    pq_subspaces=args.subspaces or None,
+    pq_centroids=args.centroids,
+    iterations=args.iterations
+)
+fit_s = time.perf_counter() - start
+codec.save(args.output)
+print(f"Fitted {codec.describe()} on {len(sample)} vectors in {fit_s:.1f} s -> {args.output} (codec id {codec.codec_id})")
+
+exact, _ = search(queries, base, args.k)
+
+def recall(found: np.ndarray) -> float:
+    return float(np.mean([len(set(f) & set(e)) / len(e) for f, e in zip(found, exact)]))
+
+def report(name: str, bytes_per_vector: int, found: np.ndarray):
+    mib = bytes_per_vector * len(base) / 2 ** 20
+    print(f"{name:>28} {bytes_per_vector:>10} {mib:>10.1f} {recall(found):>10.3f}")
+
+print(f"\n{len(base)} base vectors, {len(queries)} queries, k={args.k}")
+print(f"{'configuration':>28} {'bytes/vec':>10} {'MiB':>10} {'recall@k':>10}")
+report("float32 exact", base.shape[1] * 4, exact)
+report("float16 exact", base.shape[1] * 2, search(queries, base.astype(np.float16), args.k)[0])
+
+codes = codec.encode(base)
+report(f"{codec.describe()} ADC only", codec.bytes_per_vector, search(queries, base, args.k, codec, codes, rescore_factor=1)[0])
+for factor in sorted({2, args.rescore_factor}):
+    found = search(queries, base, args.k, codec, codes, rescore_factor=factor)[0]
+    report(f"{codec.describe()} + rescore x{factor}", codec.bytes_per_vector, found)
+
+print("\nWith rescoring, full vectors stay on disk (memory-mapped); only codes are scanned in RAM.")
+print(f"Enable with VECTOR_BACKEND=flat VECTOR_CODEC_PATH={args.output}")
\ No newline at end of file